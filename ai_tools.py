@@ -0,0 +1,115 @@
+# ai_tools.py
+# AI 상담소 '빠른 검색' 모드용 타입 있는 도구들
+# 데이터프레임 전체를 모델에 넘기고 코드를 실행시키는 대신,
+# 추천 탭과 같은 필터 로직으로 후보를 미리 추려서 짧은 표로 돌려준다.
+from datetime import datetime
+import numpy as np
+from typing import List, Literal
+from pydantic import BaseModel, Field
+from langchain_core.tools import StructuredTool
+
+import config as cfg
+import recommender
+import utils
+from geo_index import GeoIndex
+
+class SearchArgs(BaseModel):
+    mode: Literal["식사", "카페", "전체"] = Field("식사", description="식당을 찾을지 카페를 찾을지")
+    category: str = Field("전체", description=f"카테고리. '전체' 또는 {cfg.OPT_CATEGORY_FOOD + cfg.OPT_CATEGORY_CAFE} 중 하나")
+    max_distance: Literal["도보 5분 이내", "도보 10분 이내", "차량 이동(전체)"] = Field("차량 이동(전체)", description="최대 이동 거리")
+    price: str = Field("", description=f"가격대. 비우면 전체, 또는 {cfg.OPT_PRICE} 중 하나")
+    menus: List[str] = Field(default_factory=list, description="메뉴 키워드 (예: 국밥, 라떼)")
+    vibes: List[str] = Field(default_factory=list, description=f"분위기 키워드 (예: {', '.join(cfg.COMMON_VIBES[:5])})")
+    match: Literal["any", "all"] = Field("any", description="키워드를 하나라도(any) / 모두(all) 포함")
+    open_today: bool = Field(True, description="오늘 휴무인 곳 제외")
+    limit: int = Field(cfg.AI_TOOL_RESULT_LIMIT, description="돌려받을 최대 개수")
+
+class KeywordArgs(BaseModel):
+    keywords: List[str] = Field(description="메뉴 또는 분위기 키워드, 또는 식당명")
+    limit: int = Field(cfg.AI_TOOL_RESULT_LIMIT, description="돌려받을 최대 개수")
+
+class NearArgs(BaseModel):
+    place: str = Field(description="출발할 식당명 (예: 점심 먹은 곳)")
+    limit: int = Field(cfg.AI_TOOL_RESULT_LIMIT, description="돌려받을 최대 개수")
+
+class RecentArgs(BaseModel):
+    days: int = Field(7, description="최근 며칠 동안의 식사 기록을 볼지")
+
+def format_candidates(df, walk_minutes=None):
+    # walk_minutes: 행마다 도보 시간(분). 주면 '거리' 라벨 대신 표시
+    if df.empty: return "조건에 맞는 곳이 없습니다."
+    where = [f"도보 약 {m:.0f}분" for m in walk_minutes] if walk_minutes is not None else df['거리'].tolist()
+    lines = [
+        f"{r['식당명']} | {r['카테고리']} | {w} | {r['가격대']} | ⭐{r['평점']}({len(r['한줄평'])}) "
+        f"| 메뉴: {r['메뉴키워드']} | 분위기: {r['분위기키워드']}" + (f" | 휴무: {r['휴무일']}" if r['휴무일'] else "")
+        for r, w in zip(df.to_dict("records"), where)
+    ]
+    return "\n".join(lines)
+
+def make_tools(df, kw_index, version=None):
+    # version이 있으면 추천 탭과 같은 공간 색인/순위 특징을 쓴다 (데이터 버전당 1회 생성)
+    if version is not None:
+        geo = utils.get_geo_index(df, version)
+        features = recommender.get_rank_features(df, version)
+    else:
+        geo = GeoIndex.from_frame(df)
+        features = recommender.RankFeatures(df, geo)
+
+    def visit_index():
+        return utils.get_visit_index(*utils.load_history(with_version=True))
+
+    def ranked(mask, menus=(), vibes=(), limit=cfg.AI_TOOL_RESULT_LIMIT):
+        visit_days = visit_index().days_since_array(df['식당명'])
+        return recommender.rank(df, features, mask, kw_index, menus, vibes, visit_days, k=limit)
+
+    def search_restaurants(mode="식사", category="전체", max_distance="차량 이동(전체)", price="",
+                           menus=(), vibes=(), match="any", open_today=True, limit=cfg.AI_TOOL_RESULT_LIMIT):
+        mask = recommender.filter_mask(
+            df, kw_index, recommender.MODE_CATEGORIES.get(mode, recommender.MODE_CATEGORIES["전체"]),
+            category=category, max_distance=max_distance, price=price or None,
+            menus=menus, vibes=vibes, match=match, features=features,
+            weekday=datetime.now().weekday() if open_today else None
+        )
+        return format_candidates(ranked(mask, menus, vibes, limit))
+
+    def find_by_keyword(keywords, limit=cfg.AI_TOOL_RESULT_LIMIT):
+        # 키워드로 찾은 곳은 오늘 휴무면 빼고, 식당명을 직접 물어본 곳은 그대로 보여준다
+        mask = kw_index.mask('메뉴키워드', keywords) | kw_index.mask('분위기키워드', keywords)
+        mask &= (features.closed & (1 << datetime.now().weekday())) == 0
+        mask |= df['식당명'].isin(keywords).to_numpy()
+        return format_candidates(ranked(mask, limit=limit))
+
+    def cafes_near(place, limit=cfg.AI_TOOL_RESULT_LIMIT):
+        # 식당 좌표에서 걸어갈 만한 카페를 가까운 순으로 (오늘 휴무인 곳 제외)
+        row = np.flatnonzero(df['식당명'].to_numpy() == place)
+        if not len(row): return f"'{place}'은(는) 등록된 곳이 아닙니다."
+        if not geo.has_location(row[0]): return f"'{place}'의 좌표가 없어서 거리를 계산할 수 없습니다."
+        mask = recommender.filter_mask(df, kw_index, recommender.MODE_CATEGORIES["카페"], features=features,
+                                       weekday=datetime.now().weekday())
+        rows, minutes = recommender.walk_from(geo, row[0], mask, k=limit)
+        if not len(rows): return f"'{place}'에서 도보 {cfg.CAFE_WALK_MAX_MIN}분 안에 등록된 카페가 없습니다."
+        return format_candidates(df.iloc[rows], minutes)
+
+    def recent_meals(days=7):
+        recent = visit_index().recent(days)
+        if not recent: return f"최근 {days}일 동안 기록된 식사가 없습니다."
+        return "\n".join(f"- {date}: {name} ({menu})" for date, name, menu in recent)
+
+    return [
+        StructuredTool.from_function(
+            func=search_restaurants, name="search_restaurants", args_schema=SearchArgs,
+            description="조건(식사/카페, 카테고리, 거리, 가격대, 메뉴/분위기 키워드)으로 우리 팀 맛집 후보를 추천점수순으로 찾는다. 최근 간 곳은 뒤로 밀리고, 오늘 휴무인 곳은 기본으로 빠진다."
+        ),
+        StructuredTool.from_function(
+            func=find_by_keyword, name="find_by_keyword", args_schema=KeywordArgs,
+            description="메뉴/분위기 키워드나 식당명으로 맛집을 찾는다. 키워드로 찾을 때 오늘 휴무인 곳은 빠진다."
+        ),
+        StructuredTool.from_function(
+            func=cafes_near, name="cafes_near", args_schema=NearArgs,
+            description="식당(좌표가 등록된 곳)에서 걸어서 가까운 카페를 도보 시간순으로 찾는다. 점심 먹고 갈 카페를 물어볼 때 사용."
+        ),
+        StructuredTool.from_function(
+            func=recent_meals, name="recent_meals", args_schema=RecentArgs,
+            description="우리 팀이 최근에 먹은 식사 기록을 본다. 최근에 간 곳을 피할 때 사용."
+        ),
+    ]
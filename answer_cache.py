@@ -0,0 +1,87 @@
+# answer_cache.py
+# AI 상담소 답변 캐시
+# - 문맥 키: 맛집 데이터 버전 + 식사 기록 창(history_text) 해시 + 날짜 + 에이전트 모드
+#   (날씨 질문은 시간 구간까지 포함) -> 데이터가 바뀌면 이전 답변은 자동으로 무효
+# - 같은 문맥 안에서 정규화된 질문이 같으면 바로 재사용, 옵션으로 비슷한 질문도 재사용
+#   (비슷한 질문도 숫자와 부정 표현은 같아야 함: "2명이서" != "3명이서", "한식 말고" != "한식")
+import hashlib
+import re
+import threading
+from datetime import datetime
+
+import config as cfg
+import search_cache
+from ttl_cache import TTLCache
+
+_store = TTLCache(maxsize=cfg.ANSWER_CACHE_MAXSIZE, ttl=cfg.ANSWER_CACHE_TTL)
+_lock = threading.Lock()
+_stats = {"exact": 0, "near": 0, "miss": 0, "saved_sec": 0.0}
+_current_data_key = {"value": None}
+
+def _bigrams(text):
+    text = text.replace(" ", "")
+    return {text[i:i + 2] for i in range(len(text) - 1)} or {text}
+
+def _guard(text):
+    # 글자 몇 개 차이로 뜻이 달라지는 부분: 숫자, 부정 표현
+    return tuple(re.findall(r"\d+", text)), tuple(t for t in cfg.ANSWER_CACHE_EXACT_TOKENS if t in text)
+
+def _similarity(a, b):
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+def make_context(data_version, history_text, mode, prompt, now=None):
+    now = now or datetime.now()
+    normalized = search_cache.normalize_query(prompt)
+    context = (
+        data_version,
+        hashlib.sha1(history_text.encode("utf-8")).hexdigest()[:12],
+        now.strftime("%Y-%m-%d"),
+        mode,
+    )
+    # 날씨처럼 시간에 따라 답이 바뀌는 질문은 검색 캐시와 같은 시간 구간으로 나눈다
+    bucket = search_cache.bucket_seconds(normalized)
+    if bucket < cfg.SEARCH_CACHE_BUCKET:
+        context += (int(now.timestamp() // bucket),)
+    return context, normalized
+
+def _drop_stale(data_version):
+    # 데이터 버전이 바뀌면 이전 버전 답변은 다시 쓰일 일이 없으므로 비운다
+    with _lock:
+        if _current_data_key["value"] == data_version: return
+        _current_data_key["value"] = data_version
+    _store.clear()
+
+def lookup(context, normalized):
+    """(답변, 일치 종류) 또는 None. 일치 종류는 'exact' / 'near'."""
+    _drop_stale(context[0])
+    entry = _store.get((context, normalized))
+    kind = "exact"
+    if entry is None and cfg.ANSWER_CACHE_FUZZY:
+        grams, guard = _bigrams(normalized), _guard(normalized)
+        best, best_score = None, cfg.ANSWER_CACHE_SIMILARITY
+        for (ctx, _), candidate in _store.items():
+            if ctx != context or candidate["guard"] != guard: continue
+            score = _similarity(grams, candidate["grams"])
+            if score >= best_score:
+                best, best_score = candidate, score
+        entry, kind = best, "near"
+
+    with _lock:
+        if entry is None:
+            _stats["miss"] += 1
+            return None
+        _stats[kind] += 1
+        _stats["saved_sec"] += entry["latency"]
+    return entry["answer"], kind
+
+def store(context, normalized, answer, latency):
+    _store.set((context, normalized), {"answer": answer, "latency": latency,
+                                      "grams": _bigrams(normalized), "guard": _guard(normalized)})
+
+def get_stats():
+    with _lock:
+        stats = dict(_stats)
+    total = stats["exact"] + stats["near"] + stats["miss"]
+    stats["hit_rate"] = (stats["exact"] + stats["near"]) / total if total else 0.0
+    stats["size"] = len(_store)
+    return stats
@@ -1,13 +1,20 @@
 # app.py
 import streamlit as st
 import pandas as pd
+import numpy as np
+import time
 from datetime import datetime, timedelta
-from streamlit_tags import st_tags
 
 # 모듈 임포트
 import config as cfg
 import utils
-import llm_agent
+import recommender
+import answer_cache
+import search_cache
+import perf
+import geo_index
+import bulk_import
+# llm_agent(LangChain/OpenAI)와 streamlit_tags는 무거워서 실제로 쓰는 곳에서 import 한다
 
 # -----------------------------------------------------------------------------
 # 1. 페이지 설정
@@ -20,6 +27,7 @@ st.set_page_config(page_title="🍱 우리 팀 점심 에이전트", page_icon="
 @st.dialog("맛집/카페 등록하기 📝")
 def popup_register():
     st.caption("필요한 정보만 빠르게 터치해서 등록하세요!")
+    from streamlit_tags import st_tags  # 등록 팝업을 열 때만 로드
     
     # [유형 선택] 식당 vs 카페
     type_selection = st.radio("유형 선택", ["식당 🍚", "카페 ☕"], horizontal=True)
@@ -35,6 +43,15 @@ def popup_register():
     col1, col2 = st.columns(2)
     name = col1.text_input("상호명 (필수)")
     category = col2.selectbox("카테고리", curr_categories)
+    # [신규] 이미 있는 곳을 다른 이름으로 또 등록하지 않도록 비슷한 이름 미리 보여주기
+    if name.strip():
+        list_df, list_version = utils.load_data(with_version=True)
+        name_idx = utils.get_name_index(list_df, list_version)
+        similar = name_idx.similar(name)
+        if name in name_idx.names:
+            st.info(f"'{name}'은(는) 이미 등록된 곳이에요. 등록하면 리뷰가 하나 더 추가돼요.")
+        elif similar:
+            st.warning("비슷한 이름이 이미 있어요: " + ", ".join(f"{n} ({s:.0%})" for n, s in similar))
     
     st.markdown("##### 🏷️ 키워드 (검색하거나, 입력 후 Enter)")
     
@@ -69,6 +86,8 @@ def popup_register():
     waiting = r3.selectbox("평소 웨이팅", cfg.OPT_WAITING)
     off_days = st.multiselect("휴무일", cfg.OPT_DAYS)
     raw_link = st.text_area("네이버 지도 링크", height=70)
+    # [신규] 링크에 좌표가 없을 때 직접 입력 (실제 거리 계산/근처 카페 찾기에 사용)
+    coord_text = st.text_input("좌표 (선택)", placeholder="37.5665, 126.9780", help="위도,경도. 지도 링크에 좌표가 들어 있으면 비워두세요.")
 
     rating = st.slider("별점", 1.0, 5.0, 3.0, 0.5)
     comment = st.text_input("한줄평")
@@ -77,8 +96,11 @@ def popup_register():
     st.markdown("---")
     
     if st.button("등록 완료", type="primary", use_container_width=True):
+        coords = geo_index.parse_latlng(coord_text) if coord_text.strip() else None
         if not name:
             st.error("상호명은 필수입니다!")
+        elif coord_text.strip() and coords is None:
+            st.error("좌표는 '위도, 경도' 형식으로 입력해주세요.")
         else:
             final_link = utils.extract_url(raw_link)
             str_menus = ",".join(menu_tags)
@@ -89,34 +111,106 @@ def popup_register():
                 '가격대': price, '거리': distance, '최대수용인원': capacity, 
                 '전화번호': phone, '네이버지도URL': final_link, 
                 '예약필수여부': reservation, '웨이팅정도': waiting, '휴무일': ",".join(off_days), 
-                '작성자': recommender, '평점': rating, '한줄평': comment
+                '작성자': recommender, '평점': rating, '한줄평': comment,
+                '좌표': geo_index.format_latlng(*coords) if coords else ""
             }
-            df = utils.load_data()
-            new_df = pd.DataFrame([new_row])
-            updated_df = pd.concat([df, new_df], ignore_index=True)
-            utils.save_data(updated_df)
-            st.toast(f"'{name}' 등록 성공!", icon="✅")
+            if utils.add_data_row(new_row):
+                st.toast(f"'{name}' 등록 성공!", icon="✅")
+                st.rerun()
+
+# [신규] 파일 일괄 가져오기 (데이터 관리 탭의 맛집 리스트 / 식사 기록 공용)
+def import_panel(worksheet, save_rows):
+    with st.expander("📥 파일로 한 번에 가져오기 (CSV/XLSX)"):
+        upload = st.file_uploader("파일 선택", type=["csv", "xlsx"], key=f"import_{worksheet}",
+                                  help="첫 행은 헤더. 시트와 같은 컬럼 이름(또는 상호명/별점 같은 별칭)이면 자동으로 맞춰요.")
+        if upload is None: return
+        try:
+            raw = bulk_import.read_file(upload.name, upload.getvalue())
+        except Exception as e:
+            st.error(f"파일을 읽을 수 없습니다: {e}")
+            return
+        if len(raw) > cfg.IMPORT_MAX_ROWS:
+            st.error(f"한 번에 {cfg.IMPORT_MAX_ROWS}행까지 가져올 수 있어요. (파일 {len(raw)}행)")
+            return
+
+        mapped, mapping, ignored = bulk_import.map_columns(raw, worksheet)
+        valid, issues = bulk_import.validate(mapped, worksheet)
+        st.caption("컬럼: " + (", ".join(b if a == b else f"{a}→{b}" for a, b in mapping.items()) or "맞는 컬럼 없음")
+                   + (f" | 무시: {', '.join(map(str, ignored))}" if ignored else ""))
+        if not issues.empty:
+            st.warning(f"{len(raw)}행 중 {len(raw) - len(valid)}행은 문제가 있어서 빼고 저장해요. (행 = 파일 행 번호)")
+            st.dataframe(issues, hide_index=True, use_container_width=True)
+
+        # [신규] 맛집 리스트는 시트/파일 안에 비슷한 식당명이 있는지
+        if worksheet == cfg.WORKSHEET_NAME_LIST and not valid.empty:
+            list_df, list_version = utils.load_data(with_version=True)
+            similar = bulk_import.similar_names(valid['식당명'], utils.get_name_index(list_df, list_version))
+            if not similar.empty:
+                st.warning(f"비슷한 식당명 {len(similar)}건이 있어요. 같은 곳이면 파일에서 이름을 맞춰주세요.")
+                st.dataframe(similar, hide_index=True, use_container_width=True)
+
+        # 같은 파일을 두 번 저장하지 않도록 (저장 후 다시 그려도 업로드는 남아 있음)
+        imported = st.session_state.setdefault("imported_files", set())
+        done = (worksheet, upload.file_id) in imported
+        if st.button(f"✅ {len(valid)}행 저장", type="primary", disabled=done or valid.empty, key=f"btn_import_{worksheet}"):
+            if save_rows(bulk_import.to_rows(valid)):
+                imported.add((worksheet, upload.file_id))
+                st.toast(f"{len(valid)}행 가져오기 완료!", icon="✅")
+                st.rerun()
+        if done: st.caption("이 파일은 이미 가져왔어요.")
+
+# [신규] 편집을 시작한 시점의 데이터 버전 (변경분이 비어 있는 동안만 갱신)
+# 저장 버튼을 누른 실행에서 다시 읽은 버전과 비교하면 늘 같으므로, 편집기를 처음 그린 버전을 세션에 기억해 둔다
+def editor_base_version(key, version):
+    delta = st.session_state.get(key) or {}
+    if not any(delta.get(k) for k in ("edited_rows", "added_rows", "deleted_rows")):
+        st.session_state[f"{key}_base_version"] = version
+    return st.session_state.get(f"{key}_base_version", version)
+
+# [신규] 중복 의심 식당명 묶음 보기 + 병합 (데이터 관리 탭의 맛집 리스트)
+def duplicates_panel(df, list_version):
+    with st.expander("🔁 중복 의심 식당명 찾기"):
+        if not st.checkbox("시트 전체 검사", key="chk_duplicates", help="띄어쓰기/지점 표기/영문 상호가 달라도 같은 곳으로 보이는 이름을 묶어요."):
+            return
+        groups = utils.get_duplicate_groups(df, list_version)
+        if not groups:
+            st.success("중복 의심 이름이 없어요.")
+            return
+        counts = df['식당명'].value_counts()
+        st.caption(f"중복 의심 {len(groups)}묶음 (괄호 = 리뷰 수)")
+        picked = st.selectbox("묶음 선택", range(len(groups)), key="sel_duplicate_group",
+                              format_func=lambda i: " / ".join(f"{n} ({counts.get(n, 0)})" for n in groups[i]))
+        names = st.multiselect("합칠 이름", groups[picked], default=groups[picked], key=f"ms_duplicate_{picked}")
+        target = st.selectbox("남길 이름", names or groups[picked], key=f"sel_duplicate_target_{picked}")
+        if st.button("🔗 병합", disabled=len(names) < 2, key="btn_merge_duplicates",
+                     help="합칠 이름의 리뷰와 식사 기록을 모두 '남길 이름'으로 바꿔요."):
+            merged = utils.merge_restaurants([n for n in names if n != target], target)
+            st.toast(f"{merged}행을 '{target}'(으)로 병합했어요.", icon="🔗")
             st.rerun()
 
 # -----------------------------------------------------------------------------
 # 3. 메인 화면 구성
 # -----------------------------------------------------------------------------
 menu = st.sidebar.radio("메뉴", ["🔍 점심/카페 추천", "💬 AI 상담소 (New)", "📅 식사 기록", "📊 데이터 관리"])
+perf.start_trace(menu)  # [신규] 이번 실행의 구간 시간을 메뉴 이름으로 묶는다 (cfg.PERF_ENABLED 일 때만)
 
 # 3-1. 점심/카페 추천
 # 3-1. 점심/카페 추천
 if menu == "🔍 점심/카페 추천":
     st.title("🤖 오늘 어디 가지?")
-    raw_df = utils.load_data()
+    # [수정] 맛집 리스트와 식사 기록(방문 색인용)을 동시에 읽는다
+    raw_df, list_version, history_df, history_version = utils.load_data_and_history()
     
-    # [수정] 검색 결과 유지를 위한 세션 초기화
-    if 'search_results' not in st.session_state:
-        st.session_state.search_results = None
+    # [수정] 검색 결과 유지를 위한 세션 초기화 (결과 프레임 대신 식당명 목록만 저장)
+    if 'search_ids' not in st.session_state:
+        st.session_state.search_ids = None
+        st.session_state.search_page = 0
 
     if raw_df.empty:
         st.info("데이터가 없습니다. 먼저 데이터를 등록해주세요.")
     else:
-        df = utils.aggregate_reviews(raw_df)
+        df = utils.get_aggregated_reviews(raw_df, list_version)
+        kw_index = utils.get_keyword_index(df, list_version)
         
         with st.container(border=True):
             search_mode = st.radio("검색 모드", ["식사 하기 🍚", "카페 가기 ☕"], horizontal=True)
@@ -127,54 +221,106 @@ if menu == "🔍 점심/카페 추천":
                 target_cats = cfg.OPT_CATEGORY_CAFE
                 target_menus = cfg.COMMON_MENUS_CAFE
 
+            # [신규] 카페는 밥 먹은 식당에서 걸어갈 거리로 찾을 수 있다 (좌표 있는 최근 식사 장소만)
+            geo = utils.get_geo_index(df, list_version)
+            origin_row = None
+            if search_mode != "식사 하기 🍚" and len(geo):
+                visits = utils.get_visit_index(history_df, history_version)
+                recent_names = list(dict.fromkeys(name for _, name, _ in reversed(visits.recent(cfg.HISTORY_PROMPT_DAYS))))
+                recent_rows = pd.Index(df['식당명']).get_indexer(recent_names)
+                origins = {n: int(i) for n, i in zip(recent_names, recent_rows) if i >= 0 and geo.has_location(i)}
+                s_origin = st.selectbox("☕ 어디서 출발?", ["🏢 회사"] + list(origins), index=1 if origins else 0,
+                                        help="최근 식사한 곳 중 좌표가 있는 곳에서 가까운 순으로 찾아요.")
+                origin_row = origins.get(s_origin)
+
             st.subheader("🎯 조건 선택")
             c1, c2, c3 = st.columns(3)
-            available_cats_in_db = utils.get_unique_values(df, '카테고리')
+            available_cats_in_db = utils.get_unique_values(df, '카테고리', index=kw_index)
             filtered_opts = [c for c in available_cats_in_db if c in target_cats]
             if not filtered_opts: filtered_opts = target_cats
 
             s_cat = c1.selectbox("카테고리", ["전체"] + filtered_opts)
-            s_dist = c2.select_slider("최대 이동 거리", options=["도보 5분 이내", "도보 10분 이내", "차량 이동(전체)"], value="도보 10분 이내")
+            s_dist = c2.select_slider("최대 이동 거리", options=["도보 5분 이내", "도보 10분 이내", "차량 이동(전체)"], value="도보 10분 이내",
+                                      disabled=origin_row is not None)
             s_people = c3.selectbox("인원", ["상관없음", "4명 이하", "5~8명", "단체"])
 
-            df_mode_filtered = df[df['카테고리'].isin(target_cats)]
-            all_menu = utils.get_unique_values(df_mode_filtered, '메뉴키워드', target_menus)
-            all_vibe = utils.get_unique_values(df, '분위기키워드', cfg.COMMON_VIBES)
+            # [수정] 모드별 메뉴 목록과 키워드별 식당 수는 색인에서 (데이터 버전당 한 번 계산 후 재사용)
+            mode_filter = ('카테고리', target_cats)
+            all_menu = utils.get_unique_values(df, '메뉴키워드', target_menus, index=kw_index, within=mode_filter)
+            all_vibe = utils.get_unique_values(df, '분위기키워드', cfg.COMMON_VIBES, index=kw_index)
+            menu_counts = kw_index.counts('메뉴키워드', within=mode_filter)
+            vibe_counts = kw_index.counts('분위기키워드')
             
             k1, k2 = st.columns(2)
-            s_menu = k1.multiselect("🥘 메뉴/음료", all_menu)
-            s_vibe = k2.multiselect("✨ 분위기", all_vibe)
+            s_menu = k1.multiselect("🥘 메뉴/음료", all_menu, format_func=lambda k: utils.with_count(k, menu_counts))
+            s_vibe = k2.multiselect("✨ 분위기", all_vibe, format_func=lambda k: utils.with_count(k, vibe_counts))
+            s_match = st.radio("키워드 조건", ["하나라도 포함", "모두 포함"], horizontal=True)
+            match_mode = "all" if s_match == "모두 포함" else "any"
+            s_open = st.checkbox("오늘 휴무인 곳 빼기", value=True)
             
             if st.button("추천 받기 🚀", type="primary", use_container_width=True):
-                result = df.copy()
-                if s_cat == "전체": result = result[result['카테고리'].isin(target_cats)]
-                else: result = result[result['카테고리'] == s_cat]
-                
-                u_lvl = cfg.DISTANCE_MAP.get(s_dist, 3)
-                result['d_lvl'] = result['거리'].map(cfg.DISTANCE_MAP).fillna(3)
-                if "차량" not in s_dist: result = result[result['d_lvl'] <= u_lvl]
-                
-                if s_menu: result = result[result['메뉴키워드'].apply(lambda x: any(k in str(x) for k in s_menu))]
-                if s_vibe: result = result[result['분위기키워드'].apply(lambda x: any(k in str(x) for k in s_vibe))]
+                features = recommender.get_rank_features(df, list_version)
+                mask = recommender.filter_mask(
+                    df, kw_index, target_cats,
+                    category=s_cat, max_distance=s_dist if origin_row is None else "차량 이동(전체)",
+                    menus=s_menu, vibes=s_vibe, match=match_mode,
+                    features=features, weekday=datetime.now().weekday() if s_open else None
+                )
+                if origin_row is None:
+                    # [신규] 평점/리뷰 수/거리/키워드 일치/최근 방문을 합친 점수로 상위 k개만 추림
+                    visits = utils.get_visit_index(history_df, history_version)
+                    result = recommender.rank(
+                        df, features, mask, kw_index, s_menu, s_vibe,
+                        visit_days=visits.days_since_array(df['식당명']), k=cfg.RESULT_MAX_ROWS
+                    )
+                    result_ids, walk = result['식당명'].tolist(), {}
+                    total = int(mask.sum())
+                else:
+                    # [신규] 출발한 식당에서 걸어서 가까운 순 (공간 색인으로 주변 칸만 계산)
+                    rows, minutes = recommender.walk_from(geo, origin_row, mask, k=cfg.RESULT_MAX_ROWS)
+                    result_ids = df['식당명'].iloc[rows].tolist()
+                    walk = dict(zip(result_ids, np.ceil(minutes).astype(int).tolist()))
+                    total = len(result_ids)
                 
-                # 결과 세션 저장
-                st.session_state.search_results = result
+                # 결과 세션 저장 (점수순/도보순 식당명만)
+                st.session_state.search_ids = result_ids
+                st.session_state.search_walk = walk
+                st.session_state.search_total = total
+                st.session_state.search_page = 0
 
             # 저장된 결과가 있으면 출력
-            if st.session_state.search_results is not None:
-                result = st.session_state.search_results
+            if st.session_state.search_ids is not None:
+                result_ids = st.session_state.search_ids
 
-                if result.empty: 
+                if not result_ids: 
                     st.warning("조건에 맞는 곳이 없어요.")
                 else:
-                    st.success(f"{len(result)}곳 발견!")
+                    total = st.session_state.get("search_total", len(result_ids))
+                    st.success(f"{total}곳 발견!" + (f" 추천 점수 상위 {len(result_ids)}곳을 보여드려요." if total > len(result_ids) else ""))
+
+                    # [신규] 현재 페이지의 식당만 그린다 (그리는 양은 결과 수가 아니라 페이지 크기에 비례)
+                    page_size = cfg.RESULT_PAGE_SIZE
+                    n_pages = (len(result_ids) - 1) // page_size + 1
+                    page = min(st.session_state.search_page, n_pages - 1)
+                    if n_pages > 1:
+                        p1, p2, p3 = st.columns([1, 2, 1])
+                        if p1.button("◀ 이전", disabled=page == 0, use_container_width=True):
+                            st.session_state.search_page = page - 1
+                            st.rerun()
+                        p2.caption(f"<div style='text-align:center'>{page + 1} / {n_pages} 페이지</div>", unsafe_allow_html=True)
+                        if p3.button("다음 ▶", disabled=page >= n_pages - 1, use_container_width=True):
+                            st.session_state.search_page = page + 1
+                            st.rerun()
+
+                    page_ids = result_ids[page * page_size:(page + 1) * page_size]
+                    # 그 사이 삭제된 식당은 건너뜀
+                    positions = pd.Index(df['식당명']).get_indexer(page_ids)
+                    page_df = df.iloc[positions[positions >= 0]]
                     
-                    history_df = utils.load_history()
-                    recent_eats = []
-                    if not history_df.empty:
-                        recent_eats = history_df['식당명'].tolist()[-10:]
+                    # [신규] 방문 색인에서 식당별 마지막 방문일을 바로 조회
+                    visits = utils.get_visit_index(history_df, history_version)
 
-                    for i, r in result.iterrows():
+                    for _, r in page_df.iterrows():
                         avg_score = r['평점']
                         
                         # [복구] 리뷰 리스트 가져오기 (aggregate_reviews에서 리스트로 변환됨)
@@ -182,13 +328,19 @@ if menu == "🔍 점심/카페 추천":
                         writer_list = r['작성자']
                         review_count = len(review_list)
                         
-                        visit_badge = " (⚠️최근 방문)" if r['식당명'] in recent_eats else ""
+                        days_ago = visits.days_since(r['식당명'])
+                        visit_badge = ""
+                        if days_ago is not None and 0 <= days_ago < cfg.VISIT_BADGE_DAYS:
+                            when = "오늘" if days_ago == 0 else f"{days_ago}일 전"
+                            visit_badge = f" (⚠️{when} 방문 · 30일 {visits.count(r['식당명'], 30)}회)"
                         
                         with st.expander(f"🍽️ **{r['식당명']}**{visit_badge} ({r['카테고리']}) ⭐{avg_score}"):
                             c1, c2 = st.columns([3, 1])
                             with c1:
                                 st.write(f"**🥘** {r['메뉴키워드']} | **✨** {r['분위기키워드']}")
-                                st.caption(f"📍 {r['거리']} | 💰 {r['가격대']}")
+                                walk_min = st.session_state.get("search_walk", {}).get(r['식당명'])
+                                where = f"🚶 도보 약 {walk_min}분" if walk_min is not None else r['거리']
+                                st.caption(f"📍 {where} | 💰 {r['가격대']}" + (f" | 🚫 휴무 {r['휴무일']}" if r['휴무일'] else ""))
                                 st.divider()
                                 
                                 # [수정] 누락되었던 리뷰 출력 로직 복구
@@ -205,7 +357,7 @@ if menu == "🔍 점심/카페 추천":
                                 # [신규] '오늘 이거 먹음' 버튼
                                 col_btn, col_info = st.columns([1, 2])
                                 with col_btn:
-                                    if st.button(f"😋 오늘 이거 먹음!", key=f"eat_{i}"):
+                                    if st.button(f"😋 오늘 이거 먹음!", key=f"eat_{r['식당명']}"):
                                         today = datetime.now().strftime("%Y-%m-%d")
                                         log_data = {
                                             "날짜": today,
@@ -217,7 +369,6 @@ if menu == "🔍 점심/카페 추천":
                                             "비고": "추천 통해 방문"
                                         }
                                         if utils.add_history_row(log_data):
-                                            st.cache_data.clear()
                                             st.toast(f"📅 [{today}] '{r['식당명']}' 저장 완료!", icon="💾")
                                             st.rerun() # 즉시 반영
                                         else:
@@ -230,27 +381,38 @@ if menu == "🔍 점심/카페 추천":
 elif menu == "💬 AI 상담소 (New)":
     st.title("🧠 AI 점심 상담소")
     st.caption(f"Powered by OpenAI {cfg.MODEL_NAME} + 🔍 검색 기능")
+    # [신규] 답변 방식: 도구로 후보를 추려 받기(빠름, 코드 실행 없음) vs pandas 코드 분석
+    AGENT_MODES = {"⚡ 빠른 검색": "tools", "🐼 데이터 분석": "pandas"}
+    agent_mode_label = st.radio(
+        "답변 방식", list(AGENT_MODES), horizontal=True,
+        index=list(AGENT_MODES.values()).index(cfg.AGENT_MODE)
+    )
     
-    raw_df = utils.load_data()
-    history_df = utils.load_history() # 히스토리 로드
+    raw_df, list_version, history_df, history_version = utils.load_data_and_history()
+    visits = utils.get_visit_index(history_df, history_version) # 방문 색인
 
     if raw_df.empty:
         st.error("데이터가 없어서 상담할 수 없습니다.")
     else:
-        df = utils.aggregate_reviews(raw_df)
+        df = utils.get_aggregated_reviews(raw_df, list_version)
         
         # [신규] 최근 식사 기록 텍스트화
         history_text = "아직 기록된 식사가 없습니다."
-        if not history_df.empty:
-            recent = history_df.tail(7) # 최근 7건
-            history_list = [f"- {row['날짜']}: {row['식당명']} ({row['메뉴']})" for _, row in recent.iterrows()]
-            history_text = "\n".join(history_list)
+        recent = visits.recent(cfg.HISTORY_PROMPT_DAYS, cfg.HISTORY_PROMPT_LIMIT)
+        if recent:
+            history_text = "\n".join(f"- {date}: {name} ({menu})" for date, name, menu in recent)
 
         if "messages" not in st.session_state:
             st.session_state.messages = [
                 {"role": "assistant", "content": "안녕하세요! 날씨 검색도 가능합니다. (예: '오늘 날씨 어때? 메뉴 추천해줘')"}
             ]
 
+        # [신규] 직전 실행에서 중단된 답변이 있으면 받은 데까지 기록에 남긴다
+        if st.session_state.get("ai_pending") is not None:
+            partial = st.session_state.ai_pending or "(답변 전)"
+            st.session_state.messages.append({"role": "assistant", "content": f"{partial}\n\n_(답변이 중단되었습니다)_"})
+            st.session_state.ai_pending = None
+
         for msg in st.session_state.messages:
             with st.chat_message(msg["role"]):
                 st.write(msg["content"])
@@ -260,11 +422,31 @@ elif menu == "💬 AI 상담소 (New)":
             with st.chat_message("user"):
                 st.write(prompt)
 
-            with st.chat_message("assistant"):
-                try:
-                    with st.spinner("생각 중... (날씨 검색 및 기록 확인) ⚡"):
-                        agent = llm_agent.get_agent(df)
-                        
+            agent_mode = AGENT_MODES[agent_mode_label]
+            answer_ctx, answer_key = answer_cache.make_context(list_version, history_text, agent_mode, prompt)
+            cached_answer = answer_cache.lookup(answer_ctx, answer_key)
+
+            # [신규] 같은 조건에서 이미 받은 답변이 있으면 에이전트를 돌리지 않는다
+            if cached_answer is not None:
+                answer_text, match_kind = cached_answer
+                with st.chat_message("assistant"):
+                    st.write(answer_text)
+                    st.caption("💾 저장된 답변" + (" (비슷한 질문)" if match_kind == "near" else ""))
+                st.session_state.messages.append({"role": "assistant", "content": answer_text})
+            else:
+                with st.chat_message("assistant"):
+                    # 누르면 rerun 되면서 진행 중인 답변 생성이 멈춘다
+                    stop_slot = st.empty()
+                    stop_slot.button("⏹️ 답변 중단", key="btn_stop_answer")
+                    status = st.status("생각 중... (날씨 검색 및 기록 확인) ⚡")
+                    answer_box = st.empty()
+                    st.session_state.ai_pending = ""
+                    try:
+                        t0 = time.perf_counter()
+                        import llm_agent  # 첫 질문에서만 LangChain 스택 로드 (이후엔 sys.modules 재사용)
+                        agent = llm_agent.get_agent(df, list_version, agent_mode)
+                        t_build = time.perf_counter() - t0
+                    
                         # [핵심] 시스템 프롬프트에 '오늘 날짜'와 '식사 기록' 주입
                         today_str = datetime.now().strftime("%Y년 %m월 %d일")
                         system_prefix = (
@@ -273,13 +455,27 @@ elif menu == "💬 AI 상담소 (New)":
                             f"[최근 우리 팀 식사 기록]\n{history_text}\n\n"
                             f"위 기록을 참고해서 최근에 먹은 메뉴는 피해서 추천해줘. 한국어로 대답해."
                         )
-                        
-                        response = agent.invoke(f"{system_prefix}\n질문: {prompt}")
+                    
+                        handler = llm_agent.StreamHandler(
+                            answer_box, status,
+                            on_update=lambda text: st.session_state.update(ai_pending=text)
+                        )
+                        t0 = time.perf_counter()
+                        with perf.span("agent.invoke"):
+                            response = agent.invoke(f"{system_prefix}\n질문: {prompt}", config={"callbacks": [handler]})
+                        t_invoke = time.perf_counter() - t0
                         result_text = response["output"]
-                        st.write(result_text)
+                        status.update(label="완료", state="complete", expanded=False)
+                        answer_box.write(result_text)
+                        st.caption(f"⏱️ 에이전트 준비(로드 포함) {t_build * 1000:.0f}ms | 모델 호출 {t_invoke:.1f}s")
                         st.session_state.messages.append({"role": "assistant", "content": result_text})
-                except Exception as e:
-                    st.error(f"오류 발생: {e}")
+                        answer_cache.store(answer_ctx, answer_key, result_text, t_build + t_invoke)
+                    except Exception as e:
+                        status.update(label="오류", state="error")
+                        st.error(f"오류 발생: {e}")
+                    # 중단(rerun)일 때는 여기까지 오지 않으므로 다음 실행에서 부분 답변을 저장한다
+                    st.session_state.ai_pending = None
+                    stop_slot.empty()
 
 # 3-3. 식사 기록 (신규 탭)
 elif menu == "📅 식사 기록":
@@ -325,9 +521,18 @@ elif menu == "📊 데이터 관리":
             if st.button("➕ 맛집/카페 등록", type="primary", key="btn_popup_open"): 
                 popup_register()
         
-        df = utils.load_data()
+        df, list_version = utils.load_data(with_version=True)
         existing_writers = utils.get_unique_values(df, '작성자')
+
+        # [신규] 선택지/숫자가 아닌 값이 들어 있는 칸 (값은 그대로 보존됨)
+        schema_issues = utils.get_schema_issues()
+        if schema_issues is not None and not schema_issues.empty:
+            with st.expander(f"⚠️ 선택지에 없는 값 {len(schema_issues)}칸 (시트 행 번호)"):
+                st.dataframe(schema_issues, hide_index=True, use_container_width=True)
+        import_panel(cfg.WORKSHEET_NAME_LIST, utils.add_data_rows)
+        duplicates_panel(df, list_version)
         ALL_CATS = cfg.OPT_CATEGORY_FOOD + cfg.OPT_CATEGORY_CAFE
+        list_base_version = editor_base_version("editor_list", list_version)
         
         edited_df = st.data_editor(
             df, 
@@ -341,6 +546,7 @@ elif menu == "📊 데이터 관리":
                 "예약필수여부": st.column_config.SelectboxColumn(options=cfg.OPT_RESERVATION),
                 "웨이팅정도": st.column_config.SelectboxColumn(options=cfg.OPT_WAITING),
                 "네이버지도URL": st.column_config.LinkColumn(display_text="링크"),
+                "좌표": st.column_config.TextColumn(label="좌표 (위도,경도)", width="small"),
                 "전화번호": st.column_config.TextColumn(width="medium"),
                 "한줄평": st.column_config.TextColumn(width="large"),
                 "평점": st.column_config.SelectboxColumn(label="평점", width="small", options=cfg.OPT_RATING, required=True),
@@ -351,7 +557,7 @@ elif menu == "📊 데이터 관리":
             }
         )
         if st.button("💾 맛집 리스트 저장", type="primary", key="btn_save_list"):
-            utils.save_data(edited_df)
+            utils.save_data_delta(edited_df, st.session_state.get("editor_list"), list_base_version)
             st.success("맛집 리스트가 저장되었습니다!")
             st.rerun()
 
@@ -360,8 +566,10 @@ elif menu == "📊 데이터 관리":
     # ---------------------------------------------------------
     else:
         st.info("💡 날짜, 식당명 등을 수정하거나 잘못된 기록을 삭제(행 선택 후 Delete)할 수 있습니다.")
+        import_panel(cfg.WORKSHEET_NAME_HISTORY, utils.add_history_rows)
         
-        history_df = utils.load_history()
+        history_df, history_version = utils.load_history(with_version=True)
+        history_base_version = editor_base_version("editor_history", history_version)
         
         # [해결 1] '평점' 컬럼의 float 타입을 string으로 강제 변환하여 TextColumn과 호환되게 함
         if not history_df.empty:
@@ -385,7 +593,58 @@ elif menu == "📊 데이터 관리":
         )
         
         if st.button("💾 식사 기록 저장", type="primary", key="btn_save_history"):
-            utils.save_history(edited_history_df)
+            utils.save_history_delta(edited_history_df, st.session_state.get("editor_history"), history_base_version)
             st.success("식사 기록이 저장되었습니다!")
-            st.cache_data.clear() 
-            st.rerun()
\ No newline at end of file
+            st.rerun()
+
+# -----------------------------------------------------------------------------
+# 4. 사이드바 상태 표시
+# -----------------------------------------------------------------------------
+# [신규] 쓰기 대기열: 저장소에 아직 못 쓴 작업이 오래 밀려 있으면 바로 보이게
+journal_stats = utils.get_journal_stats()
+if journal_stats and journal_stats["depth"] and journal_stats["lag_sec"] > 30:
+    st.sidebar.warning(f"⏳ 저장 대기 {journal_stats['depth']}건 ({journal_stats['lag_sec']:.0f}초째 재시도 중)")
+# [신규] 계속 실패해서 저장을 포기한 작업 (보류 파일에 남아 있는 동안 계속 표시)
+if journal_stats and journal_stats["dead"]:
+    st.sidebar.error(
+        f"❌ 저장하지 못한 작업 {journal_stats['dead']}건을 `{cfg.JOURNAL_DEAD_LETTER_PATH}`에 보관했어요. "
+        f"해당 내용을 다시 입력한 뒤 파일을 지워주세요. (오류: {journal_stats['last_dead_error']})"
+    )
+
+# [신규] 시트 캐시 상태 (TTL 튜닝용, 이번 실행까지 누적)
+with st.sidebar.expander("⚙️ 캐시 상태"):
+    cache_stats = utils.get_cache_stats()
+    st.caption(
+        f"hit {cache_stats['hit']} / miss {cache_stats['miss']} "
+        f"(적중률 {cache_stats['hit_rate']:.0%}) | 무효화 {cache_stats['invalidate']}회 | TTL {cfg.CACHE_TTL}초"
+    )
+    search_stats = search_cache.get_stats()
+    st.caption(
+        f"웹 검색 캐시: hit {search_stats['hit']} / miss {search_stats['miss']} "
+        f"(적중률 {search_stats['hit_rate']:.0%}) | {search_stats['size']}/{search_stats['maxsize']}건"
+    )
+    answer_stats = answer_cache.get_stats()
+    st.caption(
+        f"AI 답변 캐시: 적중률 {answer_stats['hit_rate']:.0%} "
+        f"(정확 {answer_stats['exact']} / 유사 {answer_stats['near']} / miss {answer_stats['miss']}) "
+        f"| 절약 {answer_stats['saved_sec']:.1f}초 | {answer_stats['size']}건"
+    )
+    if journal_stats:
+        st.caption(
+            f"쓰기 대기열: {journal_stats['depth']}건 (지연 {journal_stats['lag_sec']:.1f}초) "
+            f"| 반영 {journal_stats['flushed']} / 실패 {journal_stats['failed']} / 보류 {journal_stats['dead']}"
+            + (f" | 마지막 오류: {journal_stats['last_error']}" if journal_stats["depth"] and journal_stats["last_error"] else "")
+        )
+
+# [신규] 성능 계측 패널: 이번 실행의 구간별 시간 + 전체 세션 누적 p50/p95
+trace = perf.finish_trace()
+if trace is not None:
+    with st.sidebar.expander("⏱️ 성능 계측"):
+        measured = sum(s["ms"] for s in trace["spans"] if s["depth"] == 0)
+        st.caption(f"이번 실행 {trace['total_ms']:.0f}ms (계측 구간 {measured:.0f}ms / 나머지 화면 구성 {trace['total_ms'] - measured:.0f}ms)")
+        st.dataframe(
+            pd.DataFrame([{"구간": "　" * s["depth"] + s["name"], "ms": s["ms"]} for s in trace["spans"]]),
+            hide_index=True, use_container_width=True
+        )
+        st.caption("누적 (모든 세션)")
+        st.dataframe(pd.DataFrame(perf.summary()).round(1), hide_index=True, use_container_width=True)
@@ -0,0 +1,127 @@
+# benchmarks/bench_agent_modes.py
+# AI 상담소 에이전트 모드 비교: "pandas"(데이터프레임 + 코드 실행) vs "tools"(타입 있는 검색 도구)
+# 실제 API 대신 스크립트대로 함수 호출을 내보내는 스텁 모델을 사용한다.
+# 측정: 모델 호출(왕복) 수, 프롬프트 토큰(함수 스키마 포함), 도구 실행 포함 소요 시간
+# pandas 모드 스크립트는 "컬럼 확인 -> 필터 코드 실행 -> 답변"의 전형적인 흐름을 가정한다.
+# 실행: python -m benchmarks.bench_agent_modes
+import json
+import time
+from typing import Any, Dict, List
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, FunctionMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from pydantic import Field
+
+import llm_agent
+from benchmarks.datagen import make_reviews
+from keyword_index import KeywordIndex
+import utils
+
+try:
+    import tiktoken
+    _enc = tiktoken.get_encoding("cl100k_base")
+    def count_tokens(text): return len(_enc.encode(text))
+except Exception:  # tiktoken 미설치 또는 인코딩 파일을 받을 수 없는 환경
+    def count_tokens(text): return len(text) // 2   # 한글 기준 대략치
+
+QUESTIONS = [
+    {
+        "q": "비 오는 날 가기 좋은 국물 요리 추천해줘",
+        "tools": [("search_restaurants", {"menus": ["국밥", "김치찌개", "된장찌개"], "vibes": ["비오는날"]})],
+        "pandas": [
+            "df.columns.tolist()",
+            "df[df['메뉴키워드'].str.contains('국밥|찌개') & df['분위기키워드'].str.contains('비오는날')]"
+            ".sort_values('평점', ascending=False)[['식당명','평점','거리']].head(8)",
+        ],
+    },
+    {
+        "q": "도보 5분 이내 가성비 좋은 곳",
+        "tools": [("search_restaurants", {"max_distance": "도보 5분 이내", "vibes": ["가성비"]})],
+        "pandas": [
+            "df['거리'].unique()",
+            "df[(df['거리']=='도보 5분 이내') & df['분위기키워드'].str.contains('가성비')]"
+            ".sort_values('평점', ascending=False)[['식당명','평점']].head(8)",
+        ],
+    },
+    {
+        "q": "최근에 안 먹은 한식 추천",
+        "tools": [("recent_meals", {"days": 7}), ("search_restaurants", {"category": "한식"})],
+        "pandas": [
+            "df['카테고리'].value_counts()",
+            "df[df['카테고리']=='한식'].sort_values('평점', ascending=False)[['식당명','평점']].head(8)",
+        ],
+    },
+    {
+        "q": "돈가스 파는 곳 있어?",
+        "tools": [("find_by_keyword", {"keywords": ["돈가스"]})],
+        "pandas": [
+            "df[df['메뉴키워드'].str.contains('돈가스')][['식당명','평점','거리']].head(8)",
+        ],
+    },
+]
+
+class StubFunctionModel(BaseChatModel):
+    scripts: Dict[str, List[Any]]
+    log: List[Dict[str, Any]] = Field(default_factory=list)
+
+    @property
+    def _llm_type(self):
+        return "stub-functions"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        prompt = "\n".join(str(m.content) for m in messages)
+        prompt += json.dumps(kwargs.get("functions", []), ensure_ascii=False)
+        self.log.append({"tokens": count_tokens(prompt)})
+
+        question = next(q for q in self.scripts if any(q in str(m.content) for m in messages if isinstance(m, HumanMessage)))
+        step = sum(isinstance(m, FunctionMessage) for m in messages)
+        script = self.scripts[question]
+        if step < len(script):
+            name, args = script[step]
+            msg = AIMessage(content="", additional_kwargs={
+                "function_call": {"name": name, "arguments": json.dumps(args, ensure_ascii=False)}
+            })
+        else:
+            msg = AIMessage(content="추천 결과입니다.")
+        return ChatResult(generations=[ChatGeneration(message=msg)])
+
+def run_mode(mode, df, kw_index):
+    if mode == "tools":
+        scripts = {item["q"]: item["tools"] for item in QUESTIONS}
+        llm = StubFunctionModel(scripts=scripts)
+        agent = llm_agent.build_tool_agent(df, kw_index, llm)
+    else:
+        scripts = {item["q"]: [("python_repl_ast", {"query": code}) for code in item["pandas"]] for item in QUESTIONS}
+        llm = StubFunctionModel(scripts=scripts)
+        agent = llm_agent.build_pandas_agent(df, llm)
+    agent.verbose = False
+
+    rows = []
+    for item in QUESTIONS:
+        start = len(llm.log)
+        t0 = time.perf_counter()
+        agent.invoke(item["q"])
+        elapsed = time.perf_counter() - t0
+        calls = llm.log[start:]
+        rows.append({"calls": len(calls), "tokens": sum(c["tokens"] for c in calls), "ms": elapsed * 1000})
+    return rows
+
+def main(n_reviews=5_000):
+    df = utils.aggregate_reviews(make_reviews(n_reviews))
+    kw_index = KeywordIndex(df)
+    # recent_meals 도구가 시트를 읽지 않도록 빈 기록으로 고정
+    empty = utils.pd.DataFrame(columns=utils.cfg.COLUMNS_HISTORY)
+    utils.load_history = lambda with_version=False: (empty, 0) if with_version else empty
+
+    print(f"{len(df)} places, {len(QUESTIONS)} questions")
+    for mode in ("pandas", "tools"):
+        rows = run_mode(mode, df, kw_index)
+        calls = sum(r["calls"] for r in rows)
+        tokens = sum(r["tokens"] for r in rows)
+        ms = sum(r["ms"] for r in rows)
+        print(f"{mode:>6} | LLM calls {calls:3d} ({calls / len(rows):.1f}/q) | prompt tokens {tokens:7d} "
+              f"({tokens / len(rows):7.0f}/q) | local time {ms:7.1f} ms")
+
+if __name__ == "__main__":
+    main()
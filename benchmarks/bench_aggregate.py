@@ -0,0 +1,52 @@
+# benchmarks/bench_aggregate.py
+# aggregate_reviews: 기존 groupby+lambda 구현 vs 벡터화 구현 비교
+# 실행: python -m benchmarks.bench_aggregate
+import time
+import pandas as pd
+
+import utils
+from benchmarks.datagen import make_reviews
+
+def legacy_aggregate_reviews(df):
+    if df.empty: return df
+    grouped = df.groupby('식당명').agg({
+        '카테고리': 'first', '메뉴키워드': 'first', '분위기키워드': 'first',
+        '가격대': 'first', '거리': 'first', '최대수용인원': 'first',
+        '전화번호': 'first', '네이버지도URL': 'first', '휴무일': 'first', '좌표': 'first',
+        '평점': 'mean', '한줄평': lambda x: list(x), '작성자': lambda x: list(x)
+    }).reset_index()
+    grouped['평점'] = grouped['평점'].round(1)
+    return grouped
+
+def best_of(fn, repeat=5):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+def main():
+    for n in (10_000, 100_000):
+        df = make_reviews(n)
+        pd.testing.assert_frame_equal(utils.aggregate_reviews(df), legacy_aggregate_reviews(df))
+
+        # 증분: 마지막 1행을 뺀 집계에 1행을 fold 한 결과도 동일해야 함
+        base = utils.ReviewAggregate(df.iloc[:-1])
+        pd.testing.assert_frame_equal(base.fold(df.iloc[-1:]).frame, legacy_aggregate_reviews(df))
+        # 파일 가져오기처럼 여러 행을 한 번에: 절반은 처음 보는 식당
+        batch = make_reviews(1000, seed=7)
+        batch['식당명'] = [f"가져온식당{i:04d}" if i % 2 else name for i, name in enumerate(df['식당명'].head(1000))]
+        pd.testing.assert_frame_equal(utils.ReviewAggregate(df).fold(batch).frame,
+                                      legacy_aggregate_reviews(pd.concat([df, batch], ignore_index=True)))
+
+        t_old = best_of(lambda: legacy_aggregate_reviews(df))
+        t_new = best_of(lambda: utils.aggregate_reviews(df))
+        t_fold = best_of(lambda: base.fold(df.iloc[-1:]))
+        full = utils.ReviewAggregate(df)
+        t_batch = best_of(lambda: full.fold(batch))
+        print(f"{n:>7} rows | groupby {t_old * 1000:8.1f} ms | vectorized {t_new * 1000:7.1f} ms "
+              f"(x{t_old / t_new:4.1f}) | fold 1 row {t_fold * 1000:6.2f} ms | fold 1000 rows {t_batch * 1000:6.1f} ms")
+
+if __name__ == "__main__":
+    main()
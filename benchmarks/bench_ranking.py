@@ -0,0 +1,45 @@
+# benchmarks/bench_ranking.py
+# 추천 받기: 필터 + 점수 계산 + 상위 k 선택 시간 (목표: 10만 후보 50ms 미만)
+# 실행: python -m benchmarks.bench_ranking
+import time
+import numpy as np
+import pandas as pd
+
+import config as cfg
+import recommender
+import utils
+from benchmarks.datagen import make_reviews
+from keyword_index import KeywordIndex
+from visit_index import VisitIndex
+
+def main(n_places=100_000, repeat=20):
+    # 식당당 리뷰 1개 -> 집계 후 n_places 행
+    df = utils.aggregate_reviews(make_reviews(n_places * 5).drop_duplicates('식당명'))
+    kw_index = KeywordIndex(df)
+    features = recommender.RankFeatures(df)
+    history = pd.DataFrame({
+        '날짜': pd.Timestamp.now().normalize() - pd.to_timedelta(np.arange(300) % 30, unit="D"),
+        '식당명': df['식당명'].sample(300, random_state=0).to_numpy(),
+    })
+    history['날짜'] = history['날짜'].dt.strftime("%Y-%m-%d")
+    history['메뉴'] = ""
+    visit_days = VisitIndex(history).days_since_array(df['식당명'])
+    cats = recommender.MODE_CATEGORIES["전체"]
+
+    cases = {
+        "all candidates": dict(max_distance="차량 이동(전체)"),
+        "menu+vibe": dict(max_distance="도보 10분 이내", menus=["국밥", "돈가스"], vibes=["가성비"]),
+    }
+    print(f"{len(df)} places")
+    for name, cond in cases.items():
+        times = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            mask = recommender.filter_mask(df, kw_index, cats, features=features, **cond)
+            result = recommender.rank(df, features, mask, kw_index, cond.get("menus", ()), cond.get("vibes", ()), visit_days)
+            times.append(time.perf_counter() - t0)
+        print(f"{name:>15} | {int(mask.sum()):>6} candidates -> top {len(result)} | "
+              f"p50 {np.median(times) * 1000:6.1f} ms | max {max(times) * 1000:6.1f} ms")
+
+if __name__ == "__main__":
+    main()
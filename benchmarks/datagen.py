@@ -0,0 +1,102 @@
+# benchmarks/datagen.py
+# 벤치마크용 가짜 데이터 생성기
+# - 맛집 리스트 시트(cfg.COLUMNS): 한 행 = 리뷰 1개. 같은 식당의 리뷰는 식당 정보가 같다.
+# - 식사 기록 시트(cfg.COLUMNS_HISTORY): 최근 날짜에 몰리도록 생성
+# 모든 값은 시트에서 읽은 것처럼 정규화(_normalize_list_frame)까지 거친다.
+import numpy as np
+import pandas as pd
+
+import config as cfg
+import utils
+
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+WRITERS = ["민수", "지영", "현우", "서연", "팀원"]
+BASE_LATLNG = (37.5665, 126.9780)   # 가짜 식당들이 모여 있는 중심 (회사 위치로도 사용)
+
+def _pick_pairs(rng, options, n):
+    # 서로 다른 키워드 2개를 쉼표로 (행마다 rng.choice를 부르지 않도록 인덱스로 한 번에)
+    options = np.asarray(options, dtype=object)
+    first = rng.integers(0, len(options), n)
+    second = (first + rng.integers(1, len(options), n)) % len(options)
+    return pd.Series(options[first]) + "," + pd.Series(options[second])
+
+def _places(n_places, rng):
+    is_cafe = rng.random(n_places) < 0.3
+    places = pd.DataFrame({
+        '식당명': [f"식당{i:06d}" for i in range(n_places)],
+        '카테고리': np.where(is_cafe, rng.choice(cfg.OPT_CATEGORY_CAFE, n_places),
+                         rng.choice(cfg.OPT_CATEGORY_FOOD, n_places)),
+        '메뉴키워드': np.where(is_cafe, _pick_pairs(rng, cfg.COMMON_MENUS_CAFE, n_places),
+                          _pick_pairs(rng, cfg.COMMON_MENUS_FOOD, n_places)),
+        '분위기키워드': _pick_pairs(rng, cfg.COMMON_VIBES, n_places),
+        '가격대': rng.choice(cfg.OPT_PRICE, n_places),
+        '거리': rng.choice(cfg.OPT_DISTANCE, n_places, p=[0.4, 0.4, 0.2]),
+        '최대수용인원': rng.choice(cfg.OPT_CAPACITY, n_places),
+        '전화번호': [f"02-{rng.integers(100, 999)}-{i % 10000:04d}" for i in range(n_places)],
+        '예약필수여부': rng.choice(cfg.OPT_RESERVATION, n_places),
+        '웨이팅정도': rng.choice(cfg.OPT_WAITING, n_places),
+        '휴무일': rng.choice(["일", "토,일", "월", "연중무휴", ""], n_places),
+    })
+    places['네이버지도URL'] = "https://map.naver.com/p/search/" + places['식당명']
+
+    # 좌표: 식당 수에 비례하는 원 안에 고르게 (밀도 일정). 60%는 '좌표' 직접 입력,
+    # 20%는 지도 링크의 c=(웹 메르카토르) 파라미터에만, 나머지는 위치 없음
+    radius = np.sqrt(rng.random(n_places)) * np.sqrt(n_places) * 30
+    angle = rng.random(n_places) * 2 * np.pi
+    lat = BASE_LATLNG[0] + radius * np.sin(angle) / 111_195
+    lng = BASE_LATLNG[1] + radius * np.cos(angle) / (111_195 * np.cos(np.radians(BASE_LATLNG[0])))
+    kind = rng.random(n_places)
+    places['좌표'] = np.where(kind < 0.6, [f"{a:.6f},{b:.6f}" for a, b in zip(lat, lng)], "")
+    in_url = (kind >= 0.6) & (kind < 0.8)
+    merc_x = np.radians(lng) * 6378137.0
+    merc_y = np.log(np.tan(np.pi / 4 + np.radians(lat) / 2)) * 6378137.0
+    places.loc[in_url, '네이버지도URL'] = [f"{u}?c={x:.7f},{y:.7f},15,0,0,0,dh" for u, x, y
+                                        in zip(places['네이버지도URL'][in_url], merc_x[in_url], merc_y[in_url])]
+    return places
+
+def make_reviews(n_rows, seed=0, reviews_per_place=5):
+    """맛집 리스트 시트 n_rows행 (식당 수는 n_rows / reviews_per_place)."""
+    rng = np.random.default_rng(seed)
+    n_places = max(n_rows // reviews_per_place, 1)
+    places = _places(n_places, rng)
+    df = places.iloc[rng.integers(0, n_places, n_rows)].reset_index(drop=True)
+    df['작성자'] = rng.choice(WRITERS, n_rows)
+    df['평점'] = rng.choice(cfg.OPT_RATING, n_rows)
+    df['한줄평'] = [f"리뷰{i}" for i in range(n_rows)]
+    return utils._normalize_list_frame(df[cfg.COLUMNS])
+
+def make_history(n_rows, list_df, seed=0, days=365, today=None):
+    """식사 기록 시트 n_rows행. list_df의 식당 중에서 고르고, 최근일수록 기록이 많다."""
+    rng = np.random.default_rng(seed)
+    today = pd.Timestamp(today or pd.Timestamp.now().normalize())
+    places = list_df.drop_duplicates('식당명')
+    picked = places.iloc[rng.integers(0, len(places), n_rows)]
+    ago = np.minimum(rng.exponential(days / 4, n_rows).astype(int), days)
+    df = pd.DataFrame({
+        '날짜': (today - pd.to_timedelta(np.sort(ago)[::-1], unit="D")).strftime("%Y-%m-%d"),
+        '식당명': picked['식당명'].to_numpy(),
+        '카테고리': picked['카테고리'].to_numpy(),
+        '메뉴': rng.choice(cfg.COMMON_MENUS_FOOD, n_rows),
+        '작성자': rng.choice(WRITERS, n_rows),
+        '평점': rng.choice(cfg.OPT_RATING, n_rows).astype(str),
+        '비고': "",
+    })
+    return utils._normalize_history_frame(df)
+
+_SYLLABLES = list("가나다라마바사아자차카타파하고노도로모보소오조초코토포호구누두루무부수우주추쿠투푸후미리시지기니디비피히한솥김밥천국순대할매엄마집원조맛")
+_KINDS = ["식당", "국밥", "카페", "분식", "반점", "커피", "베이커리", "치킨", "포차", ""]
+_STATIONS = ["역삼", "강남", "선릉", "삼성", "교대", "서초", "양재", "논현", "신사", "잠실"]
+
+def make_names(n, seed=0, dup_rate=0.02):
+    """중복 찾기 벤치마크용 식당명 n개. dup_rate만큼은 기존 이름을 띄어쓰기/지점 표기만 바꾼 중복."""
+    rng = np.random.default_rng(seed)
+    syl = np.asarray(_SYLLABLES, dtype=object)
+    lengths = rng.integers(2, 5, n)
+    base = ["".join(syl[rng.integers(0, len(syl), k)]) for k in lengths]
+    kinds = rng.choice(_KINDS, n)
+    branches = np.where(rng.random(n) < 0.3, rng.choice(_STATIONS, n), "")
+    names = [f"{b}{k}" + (f" {s}점" if s else "") for b, k, s in zip(base, kinds, branches)]
+    for i in rng.choice(n, int(n * dup_rate), replace=False):
+        j = int(rng.integers(0, n))
+        names[i] = names[j].replace(" ", "") if " " in names[j] else names[j][:2] + " " + names[j][2:]
+    return names
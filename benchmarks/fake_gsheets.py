@@ -0,0 +1,119 @@
+# benchmarks/fake_gsheets.py
+# 구글 시트 없이 utils의 읽기/쓰기 경로를 돌려보기 위한 메모리 커넥션
+# st.connection("gsheets", ...)이 돌려주는 GSheetsConnection과
+# conn.client._select_worksheet()가 돌려주는 gspread Worksheet 중 utils가 쓰는 메서드만 흉내낸다.
+# 호출마다 latency초(+ 행당 per_row초)를 기다려서 네트워크 왕복을 흉내낸다.
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+import config as cfg
+import storage
+import utils
+
+class FakeSpreadsheet:
+    def __init__(self, conn):
+        self._conn = conn
+
+    def batch_update(self, body):
+        for req in body["requests"]:
+            rng = req["deleteDimension"]["range"]
+            ws = self._conn._by_id[rng["sheetId"]]
+            # 시트 행 인덱스(0 = 헤더) -> 프레임 위치
+            ws._conn._drop_rows(ws.name, rng["startIndex"] - 1, rng["endIndex"] - 1)
+        self._conn._wait("batch_update", len(body["requests"]))
+
+class FakeWorksheet:
+    def __init__(self, conn, name, sheet_id):
+        self._conn = conn
+        self.name = name
+        self.id = sheet_id
+        self.spreadsheet = FakeSpreadsheet(conn)
+
+    def row_values(self, row):
+        self._conn._wait("row_values")
+        return list(self._conn.frames[self.name].columns) if row == 1 else []
+
+    def append_rows(self, values, value_input_option=None):
+        df = self._conn.frames[self.name]
+        header = list(df.columns)
+        if values and list(values[0]) == header:
+            values = values[1:]
+        new = pd.DataFrame([list(row) for row in values], columns=header)
+        with self._conn._lock:
+            self._conn.frames[self.name] = pd.concat([df, new], ignore_index=True)
+        self._conn._wait("append_rows", len(values))
+
+    def batch_update(self, updates, value_input_option=None):
+        df = self._conn.frames[self.name]
+        for u in updates:
+            col, row = _parse_cell(u["range"])
+            if row == 1:   # 헤더 칸: 오른쪽에 새 컬럼 추가
+                df = df.assign(**{str(u["values"][0][0]): ""}) if col > len(df.columns) else df
+                self._conn.frames[self.name] = df
+                continue
+            df.iat[row - 2, col - 1] = str(u["values"][0][0])
+        self._conn._wait("batch_update", len(updates))
+
+def _parse_cell(a1):
+    letters = "".join(ch for ch in a1 if ch.isalpha())
+    col = 0
+    for ch in letters: col = col * 26 + ord(ch) - 64
+    return col, int(a1[len(letters):])
+
+class FakeClient:
+    def __init__(self, conn):
+        self._conn = conn
+
+    def _select_worksheet(self, spreadsheet=None, worksheet=0):
+        return self._conn._worksheets[worksheet]
+
+class FakeGSheetsConnection:
+    """frames: {worksheet: DataFrame}. 모든 값은 시트처럼 문자열/숫자로 보관된다."""
+
+    def __init__(self, frames, latency=0.0, per_row=0.0):
+        self.frames = {ws: df.copy() for ws, df in frames.items()}
+        self.latency = latency
+        self.per_row = per_row
+        self.calls = {}
+        self.client = FakeClient(self)
+        self._lock = threading.Lock()
+        self._worksheets = {ws: FakeWorksheet(self, ws, i + 1) for i, ws in enumerate(self.frames)}
+        self._by_id = {w.id: w for w in self._worksheets.values()}
+
+    def _wait(self, call, n_rows=0):
+        with self._lock:
+            self.calls[call] = self.calls.get(call, 0) + 1
+        delay = self.latency + self.per_row * n_rows
+        if delay > 0: time.sleep(delay)
+
+    def _drop_rows(self, worksheet, start, end):
+        df = self.frames[worksheet]
+        self.frames[worksheet] = df.drop(df.index[start:end]).reset_index(drop=True)
+
+    def read(self, spreadsheet=None, worksheet=0, ttl=None, **kwargs):
+        df = self.frames[worksheet]
+        self._wait("read", len(df))
+        return df.copy()
+
+    def update(self, spreadsheet=None, worksheet=0, data=None, **kwargs):
+        self._wait("update", len(data))
+        with self._lock:
+            self.frames[worksheet] = data.copy()
+
+@contextmanager
+def installed(conn):
+    """구글 시트 백엔드가 st.connection 대신 conn을 쓰도록 잠시 바꿔 끼운다 (캐시도 비운 상태로 시작)."""
+    original, backend = storage.st.connection, cfg.STORAGE_BACKEND
+    storage.st.connection = lambda *args, **kwargs: conn
+    cfg.STORAGE_BACKEND = "gsheets"
+    storage.reset_backend()
+    utils.invalidate_cache()
+    try:
+        yield conn
+    finally:
+        storage.st.connection, cfg.STORAGE_BACKEND = original, backend
+        storage.reset_backend()
+        utils.invalidate_cache()
@@ -0,0 +1,96 @@
+# benchmarks/import_report.py
+# 콜드 스타트 import 비용 리포트 (python -X importtime 사용)
+# 세션 종류별로 새 프로세스에서 모듈을 import 하고, 누적 import 시간 상위 모듈과 메모리(RSS)를 보여준다.
+# 실행: python -m benchmarks.import_report [--top 15] [--json import_report.json]
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def app_imports():
+    """app.py가 시작할 때 import 하는 모듈 (파일 최상단 import 문 기준, 탭/함수 안의 지연 import는 제외)."""
+    with open(os.path.join(ROOT, "app.py"), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            names.append(node.module)
+    return list(dict.fromkeys(names))
+
+# app.py가 바뀌어도 실제로 시작할 때 불러오는 모듈을 그대로 잰다 (utils를 거치는 storage/journal 등은 하위 항목으로 잡힘)
+BASE = app_imports()
+PROFILES = {
+    # 추천 / 식사 기록 / 데이터 관리 탭만 여는 세션
+    "non_ai": BASE,
+    # 등록 팝업을 연 세션
+    "register": BASE + ["streamlit_tags"],
+    # AI 상담소에서 질문한 세션 (예전 app.py는 항상 이만큼 import 했음)
+    "ai": BASE + ["streamlit_tags", "llm_agent"],
+}
+
+_RSS_SNIPPET = """
+try:
+    import resource
+    print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+except ImportError:  # Windows
+    print(-1)
+"""
+
+def run_profile(modules):
+    code = "".join(f"import {m}\n" for m in modules) + _RSS_SNIPPET
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, encoding="utf-8", errors="replace",
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    entries = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line: continue
+        # "import time:  self [us] | cumulative | imported package" (들여쓰기 = 중첩 깊이)
+        self_us, cum_us, raw_name = line.split(":", 1)[1].split("|", 2)
+        self_us, cum_us = int(self_us), int(cum_us)
+        raw_name = raw_name[1:]
+        depth = (len(raw_name) - len(raw_name.lstrip())) // 2
+        entries.append({"module": raw_name.strip(), "self_ms": self_us / 1000, "cum_ms": cum_us / 1000, "depth": depth})
+
+    top_level = [e for e in entries if e["depth"] == 0]
+    rss_kb = int(proc.stdout.strip().splitlines()[-1])
+    return {
+        "total_ms": sum(e["cum_ms"] for e in top_level),
+        "rss_mb": rss_kb / 1024 if rss_kb > 0 else None,
+        "requested": {e["module"]: e["cum_ms"] for e in top_level if e["module"] in modules},
+        "entries": entries,
+    }
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--json", default=None, help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    report = {}
+    for name, modules in PROFILES.items():
+        result = run_profile(modules)
+        report[name] = result
+        rss = f"{result['rss_mb']:.0f} MB" if result["rss_mb"] else "n/a"
+        print(f"\n[{name}] total import {result['total_ms']:.0f} ms | max RSS {rss}")
+        for module, ms in sorted(result["requested"].items(), key=lambda x: -x[1]):
+            print(f"  {module:<28} {ms:8.1f} ms")
+        print(f"  -- top {args.top} (cumulative) --")
+        for e in sorted(result["entries"], key=lambda e: -e["cum_ms"])[:args.top]:
+            print(f"  {'  ' * e['depth']}{e['module']:<40} {e['cum_ms']:8.1f} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+if __name__ == "__main__":
+    main()
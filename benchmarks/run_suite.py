@@ -0,0 +1,260 @@
+# benchmarks/run_suite.py
+# 구글 시트 없이 주요 경로 시간 측정 (가짜 데이터 + 메모리 GSheets 커넥션)
+# load_data / load_data_and_history / aggregate_reviews / get_unique_values / 추천 탭 필터+랭킹 / add_history_row / 저장 경로
+# 결과를 JSON으로 남겨서 커밋 사이 회귀를 비교한다.
+# 실행: python -m benchmarks.run_suite [--sizes 1k,10k,100k] [--backend gsheets|sqlite] [--latency 0.2]
+#                                      [--write-behind] [--json out.json] [--compare base.json]
+# --backend gsheets 는 메모리 가짜 시트(지연 흉내), sqlite 는 임시 파일 DB를 쓴다.
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import bulk_import
+import config as cfg
+import recommender
+import storage
+import utils
+from benchmarks.datagen import BASE_LATLNG, SIZES, make_history, make_names, make_reviews
+from benchmarks.fake_gsheets import FakeGSheetsConnection, installed
+from geo_index import GeoIndex, walk_radius
+from keyword_index import KeywordIndex
+from name_index import NameIndex
+from visit_index import VisitIndex
+
+REGRESSION_RATIO = 1.2   # --compare 시 이 배수 이상 느려지면 표시
+
+def timed(fn, repeat, setup=None):
+    times = []
+    for _ in range(repeat):
+        if setup: setup()
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return {"median_ms": float(np.median(times)) * 1000, "min_ms": min(times) * 1000, "repeat": repeat}
+
+@contextmanager
+def sqlite_installed(frames):
+    """임시 SQLite 파일에 frames를 넣고 그 동안 SQLite 백엔드를 쓰게 한다."""
+    backend, path = cfg.STORAGE_BACKEND, cfg.SQLITE_PATH
+    with tempfile.TemporaryDirectory() as tmp:
+        cfg.STORAGE_BACKEND, cfg.SQLITE_PATH = "sqlite", os.path.join(tmp, "bench.db")
+        storage.reset_backend()
+        for worksheet, df in frames.items():
+            storage.get_backend().replace(worksheet, df)
+        utils.invalidate_cache()
+        try:
+            yield
+        finally:
+            cfg.STORAGE_BACKEND, cfg.SQLITE_PATH = backend, path
+            storage.reset_backend()
+            utils.invalidate_cache()
+
+@contextmanager
+def write_mode(write_behind):
+    """쓰기 경로 선택: 저널(임시 파일) 또는 저장소에 바로 쓰기."""
+    saved = cfg.WRITE_BEHIND, cfg.JOURNAL_PATH
+    with tempfile.TemporaryDirectory() as tmp:
+        cfg.WRITE_BEHIND, cfg.JOURNAL_PATH = write_behind, os.path.join(tmp, "journal.jsonl")
+        utils._journal["value"] = None
+        try:
+            yield
+        finally:
+            if write_behind: utils.get_journal().flush()
+            cfg.WRITE_BEHIND, cfg.JOURNAL_PATH = saved
+            utils._journal["value"] = None
+
+def run_size(n_rows, backend, latency, per_row, repeat, write_behind=False):
+    raw = make_reviews(n_rows)
+    history = make_history(max(n_rows // 10, 100), raw)
+    frames = {cfg.WORKSHEET_NAME_LIST: raw, cfg.WORKSHEET_NAME_HISTORY: history}
+    conn = FakeGSheetsConnection(frames, latency, per_row)
+    ops = {}
+
+    with installed(conn) if backend == "gsheets" else sqlite_installed(frames), write_mode(write_behind):
+        invalidate_list = lambda: utils.invalidate_cache(cfg.WORKSHEET_NAME_LIST)
+        ops["load_data (cold)"] = timed(utils.load_data, repeat, setup=invalidate_list)
+        ops["load_data (cached)"] = timed(utils.load_data, repeat)
+        ops["load_history (cold)"] = timed(utils.load_history, repeat,
+                                           setup=lambda: utils.invalidate_cache(cfg.WORKSHEET_NAME_HISTORY))
+        # 추천/AI 탭: 두 시트를 차례로 읽기 vs 동시에 읽기
+        invalidate_both = lambda: (utils.invalidate_cache(cfg.WORKSHEET_NAME_LIST),
+                                   utils.invalidate_cache(cfg.WORKSHEET_NAME_HISTORY))
+        ops["load list+history (serial)"] = timed(lambda: (utils.load_data(), utils.load_history()), repeat,
+                                                  setup=invalidate_both)
+        ops["load_data_and_history"] = timed(utils.load_data_and_history, repeat, setup=invalidate_both)
+
+        raw_df, version = utils.load_data(with_version=True)
+        ops["aggregate_reviews"] = timed(lambda: utils.aggregate_reviews(raw_df), repeat)
+        df = utils.get_aggregated_reviews(raw_df, version)
+
+        ops["keyword index build"] = timed(lambda: KeywordIndex(df), repeat)
+        kw_index = utils.get_keyword_index(df, version)
+        menu_defaults = cfg.COMMON_MENUS_FOOD
+        ops["get_unique_values (scan)"] = timed(lambda: utils.get_unique_values(df, '메뉴키워드', menu_defaults), repeat)
+        ops["get_unique_values (index)"] = timed(
+            lambda: utils.get_unique_values(df, '메뉴키워드', menu_defaults, index=kw_index), repeat)
+        # 추천 탭 조건 선택 영역: 카테고리/모드별 메뉴/분위기 옵션 + 키워드별 식당 수
+        def option_phase(index):
+            mode_filter = ('카테고리', recommender.MODE_CATEGORIES["식사"])
+            utils.get_unique_values(df, '카테고리', index=index)
+            utils.get_unique_values(df, '메뉴키워드', menu_defaults, index=index, within=mode_filter)
+            utils.get_unique_values(df, '분위기키워드', cfg.COMMON_VIBES, index=index)
+            index.counts('메뉴키워드', within=mode_filter), index.counts('분위기키워드')
+        ops["option phase (new version)"] = timed(lambda: option_phase(KeywordIndex(df)), repeat)
+        ops["option phase (cached)"] = timed(lambda: option_phase(kw_index), repeat)
+
+        # 추천 탭 '추천 받기' 버튼과 같은 순서: 필터 -> 방문 색인 -> 점수/상위 k
+        features = recommender.get_rank_features(df, version)
+        history_df, history_version = utils.load_history(with_version=True)
+        target_cats = recommender.MODE_CATEGORIES["식사"]
+        def recommend():
+            mask = recommender.filter_mask(df, kw_index, target_cats, max_distance="도보 10분 이내",
+                                           menus=["국밥", "돈가스"], vibes=["가성비"], features=features)
+            visits = utils.get_visit_index(history_df, history_version)
+            return recommender.rank(df, features, mask, kw_index, ["국밥", "돈가스"], ["가성비"],
+                                    visit_days=visits.days_since_array(df['식당명']), k=cfg.RESULT_MAX_ROWS)
+        ops["recommend (filter+rank)"] = timed(recommend, repeat)
+        ops["filter_mask"] = timed(lambda: recommender.filter_mask(
+            df, kw_index, target_cats, max_distance="도보 10분 이내", price=cfg.OPT_PRICE[0], features=features), repeat)
+        ops["filter_mask (+closed today)"] = timed(lambda: recommender.filter_mask(
+            df, kw_index, target_cats, max_distance="도보 10분 이내", price=cfg.OPT_PRICE[0], features=features,
+            weekday=datetime.now().weekday()), repeat)
+        ops["closed-day mask build"] = timed(lambda: recommender.closed_days(df), repeat)
+        ops["mode filter (app)"] = timed(lambda: recommender.category_mask(df['카테고리'], target_cats), repeat)
+        ops["visit index build"] = timed(lambda: VisitIndex(history_df), repeat)
+
+        # 좌표: 색인 생성 / 회사 기준 도보 10분 반경 / 식당 기준 가까운 카페 (격자 vs 전체 거리 계산)
+        ops["geo index build"] = timed(lambda: GeoIndex.from_frame(df), repeat)
+        geo = utils.get_geo_index(df, version)
+        ops["radius query (office)"] = timed(lambda: geo.within(*BASE_LATLNG, walk_radius(10)), repeat)
+        cafes = recommender.category_mask(df['카테고리'], recommender.MODE_CATEGORIES["카페"])
+        origin = geo.rows[0]
+        ops["nearest cafes (k=10)"] = timed(lambda: recommender.walk_from(geo, origin, cafes, k=10), repeat)
+        def nearest_brute():
+            rows = np.flatnonzero(cafes & ~np.isnan(geo.lat))
+            dist = np.hypot(geo.x[rows] - geo.x[origin], geo.y[rows] - geo.y[origin])
+            return rows[np.argsort(dist)[:10]]
+        ops["nearest cafes (brute force)"] = timed(nearest_brute, repeat)
+
+        # 식당명 중복 찾기: n_rows개 이름 색인 생성 / 등록 팝업 조회 1회 (이름을 바꿔 가며 200번) / 시트 전체 묶음
+        names = make_names(n_rows)
+        ops["name index build"] = timed(lambda: NameIndex(names), repeat)
+        name_idx, queries = NameIndex(names), iter(names)
+        ops["similar name lookup"] = timed(lambda: name_idx.similar(next(queries)), 200)
+        ops["duplicate groups"] = timed(name_idx.duplicate_groups, repeat)
+
+        # 쓰기: 묶음 대기 시간은 빼고 쓰기 자체 + 캐시 증분 반영만 잰다
+        window, utils._history_batcher.window = utils._history_batcher.window, 0
+        try:
+            row = {"날짜": datetime.now().strftime("%Y-%m-%d"), "식당명": df['식당명'].iloc[0],
+                   "카테고리": df['카테고리'].iloc[0], "메뉴": "국밥", "작성자": "팀원", "평점": "4.0", "비고": ""}
+            ops["add_history_row"] = timed(lambda: utils.add_history_row(row), repeat,
+                                           setup=lambda: utils.load_history(with_version=True))
+        finally:
+            utils._history_batcher.window = window
+
+        ops["save_data (full)"] = timed(lambda: utils.save_data(raw_df), repeat)
+        ops["save_history (full)"] = timed(lambda: utils.save_history(history_df), repeat)
+
+        edit = {"edited_rows": {0: {"한줄평": "수정된 리뷰"}}, "added_rows": [], "deleted_rows": []}
+        base = {}
+        def load_for_editor():
+            base["df"], base["version"] = utils.load_data(with_version=True)
+        ops["save_data_delta (1 cell)"] = timed(
+            lambda: utils.save_data_delta(base["df"], edit, base["version"]), repeat, setup=load_for_editor)
+
+        # 파일 가져오기 (최대 1만 행): CSV 읽기 + 컬럼 맞추기 + 검사 / 통과한 행 append 한 번 (+ 캐시 반영)
+        import_csv = raw_df.head(10_000).astype(str).to_csv(index=False).encode()
+        def parse_import():
+            mapped = bulk_import.map_columns(bulk_import.read_file("import.csv", import_csv), cfg.WORKSHEET_NAME_LIST)[0]
+            return bulk_import.validate(mapped, cfg.WORKSHEET_NAME_LIST)[0]
+        ops["import parse+validate"] = timed(parse_import, repeat)
+        import_rows = bulk_import.to_rows(parse_import())
+        batch = {"n": 0, "rows": []}
+        def load_with_aggregate():
+            # 집계가 캐시된 상태에서 매번 처음 보는 식당명으로 가져온다 (집계 fold의 새 식당 경로까지 잰다)
+            raw, version = utils.load_data(with_version=True)
+            utils.get_aggregated_reviews(raw, version)
+            batch["n"] += 1
+            batch["rows"] = [{**r, '식당명': f"가져온식당{batch['n']}-{i}"} for i, r in enumerate(import_rows)]
+        window, utils._list_batcher.window = utils._list_batcher.window, 0
+        try:
+            ops["import write"] = timed(lambda: utils.add_data_rows(batch["rows"]), repeat, setup=load_with_aggregate)
+        finally:
+            utils._list_batcher.window = window
+
+    memory = {"raw_mb": _frame_mb(raw_df), "aggregated_mb": _frame_mb(df)}
+    return {"rows": n_rows, "places": len(df), "history_rows": len(history), "ops": ops, "memory": memory,
+            "calls": conn.calls}
+
+def _frame_mb(df):
+    # 리뷰 목록(list) 컬럼은 리스트 객체 크기만 잡힌다 (안의 문자열은 원본 프레임과 공유)
+    return round(df.memory_usage(deep=True).sum() / 2**20, 2)
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return None
+
+def compare(report, base):
+    for size, result in report["results"].items():
+        old = base.get("results", {}).get(size)
+        if old is None: continue
+        print(f"\n[{size}] vs {base['meta'].get('commit')}")
+        for op, stat in result["ops"].items():
+            if op not in old["ops"]: continue
+            ratio = stat["median_ms"] / max(old["ops"][op]["median_ms"], 1e-6)
+            flag = "  <- 느려짐" if ratio >= REGRESSION_RATIO else ""
+            print(f"  {op:<28} {old['ops'][op]['median_ms']:9.2f} -> {stat['median_ms']:9.2f} ms (x{ratio:4.2f}){flag}")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="1k,10k,100k", help=f"쉼표로 구분 ({', '.join(SIZES)})")
+    parser.add_argument("--backend", default="gsheets", choices=list(storage.BACKENDS))
+    parser.add_argument("--latency", type=float, default=0.0, help="시트 호출당 지연(초, gsheets만)")
+    parser.add_argument("--per-row", type=float, default=0.0, help="읽기/쓰기 행당 추가 지연(초)")
+    parser.add_argument("--write-behind", action="store_true", help="저장을 저널 경유로 측정 (기본: 저장소에 바로 쓰기)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", default=None, help="결과를 JSON 파일로 저장")
+    parser.add_argument("--compare", default=None, help="이전 결과 JSON과 비교")
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "commit": _git_commit(), "time": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(), "pandas": pd.__version__, "numpy": np.__version__,
+            "backend": args.backend, "write_behind": args.write_behind, "latency": args.latency, "per_row": args.per_row,
+        },
+        "results": {},
+    }
+    for size in args.sizes.split(","):
+        size = size.strip().lower()
+        n_rows = SIZES.get(size) or int(size)
+        # 100만 행은 한 번 돌리는 데도 오래 걸리므로 반복 횟수를 줄인다
+        repeat = min(args.repeat, 2) if n_rows >= 1_000_000 else args.repeat
+        result = run_size(n_rows, args.backend, args.latency, args.per_row, repeat, args.write_behind)
+        report["results"][size] = result
+        print(f"\n[{size}] {result['rows']} rows / {result['places']} places / {result['history_rows']} history rows")
+        for op, stat in result["ops"].items():
+            print(f"  {op:<28} median {stat['median_ms']:9.2f} ms | min {stat['min_ms']:9.2f} ms")
+        print(f"  memory: raw {result['memory']['raw_mb']} MB / aggregated {result['memory']['aggregated_mb']} MB")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(report, json.load(f))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+if __name__ == "__main__":
+    main()
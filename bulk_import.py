@@ -0,0 +1,127 @@
+# bulk_import.py
+# [신규] CSV/엑셀 파일로 맛집 리스트 / 식사 기록 한 번에 가져오기
+# - 파일 헤더를 시트 컬럼에 맞춘다 (공백/대소문자 무시, cfg.IMPORT_ALIASES 별칭)
+# - 선택지/필수값/평점/날짜/좌표/휴무일 검사는 컬럼마다 배열 연산 한 번 (같은 값은 고유 값만 해석)
+# - 문제 있는 칸은 (행, 컬럼, 값, 문제) 목록으로, 통과한 행만 저장용 프레임으로 돌려준다
+#   저장은 utils.add_data_rows / add_history_rows (append 한 번)
+# - 식당명은 시트/파일 안의 비슷한 이름(name_index)을 중복 의심으로 보여준다
+import io
+import re
+
+import numpy as np
+import pandas as pd
+
+import config as cfg
+from geo_index import latlng_from_text
+from name_index import NameIndex
+
+SCHEMAS = {
+    cfg.WORKSHEET_NAME_LIST: cfg.COLUMNS,
+    cfg.WORKSHEET_NAME_HISTORY: cfg.COLUMNS_HISTORY,
+}
+_DAY_SEP = re.compile(r"[,/·\s]+")
+_DAY_TOKENS = set(cfg.OPT_DAYS) | {"주말"} | {d + "요일" for d in cfg.OPT_DAYS[:7]}
+_ALL_CATEGORIES = cfg.OPT_CATEGORY_FOOD + cfg.OPT_CATEGORY_CAFE
+
+def read_file(name, data):
+    """업로드한 파일(이름, 바이트) -> 모든 칸이 문자열인 프레임. 엑셀은 openpyxl 필요."""
+    if name.lower().endswith((".xlsx", ".xls")):
+        return pd.read_excel(io.BytesIO(data), dtype=str).fillna("")
+    # 엑셀에서 저장한 한글 CSV는 CP949인 경우가 많다
+    for encoding in ("utf-8-sig", "cp949"):
+        try:
+            return pd.read_csv(io.BytesIO(data), dtype=str, keep_default_na=False, encoding=encoding)
+        except UnicodeDecodeError:
+            continue
+    raise ValueError("CSV 인코딩을 읽을 수 없습니다. UTF-8 또는 CP949로 저장해주세요.")
+
+def _key(name):
+    return re.sub(r"\s+", "", str(name)).lower()
+
+def map_columns(df, worksheet):
+    """(시트 컬럼 순서로 맞춘 프레임, {파일 컬럼: 시트 컬럼}, 버린 파일 컬럼). 없는 컬럼은 빈 값."""
+    columns = SCHEMAS[worksheet]
+    targets = {_key(c): c for c in columns}
+    aliases = {_key(a): c for a, c in cfg.IMPORT_ALIASES.items() if c in columns}
+    mapping = {}
+    for col in df.columns:
+        target = targets.get(_key(col)) or aliases.get(_key(col))
+        if target and target not in mapping.values(): mapping[col] = target
+    ignored = [c for c in df.columns if c not in mapping]
+    mapped = df[list(mapping)].rename(columns=mapping).reindex(columns=columns, fill_value="")
+    mapped = mapped.fillna("").astype(str).apply(lambda s: s.str.strip())
+    return mapped, mapping, ignored
+
+def _by_unique(values, check):
+    # 고유 값마다 check 한 번, 행 전체는 코드로 펼친다 (빈 값 = 통과)
+    codes, cells = pd.factorize(values)
+    ok = np.array([not c or check(c) for c in cells] + [True], dtype=bool)
+    return ok[codes]
+
+def _check_list(df):
+    checks = [(df['식당명'] == "", '식당명', "필수"), (df['카테고리'] == "", '카테고리', "필수")]
+    for col, opts in cfg.LIST_CATEGORIES.items():
+        checks.append((~df[col].isin([""] + opts), col, "선택지에 없음"))
+    rating = pd.to_numeric(df['평점'], errors='coerce')
+    checks.append(((df['평점'] != "") & ~rating.between(0, 5), '평점', "0~5 숫자가 아님"))
+    checks.append(((df['좌표'] != "") & np.isnan(latlng_from_text(df['좌표'].to_numpy(dtype=object))[0]),
+                   '좌표', "위도,경도 형식이 아님"))
+    checks.append((~_by_unique(df['휴무일'], lambda c: all(t in _DAY_TOKENS for t in _DAY_SEP.split(c) if t)),
+                   '휴무일', "요일이 아님"))
+    df = df.assign(평점=rating.where(df['평점'] != "", ""))
+    return df, checks
+
+def _check_history(df):
+    dates = pd.Series(pd.NaT, index=df.index)
+    codes, cells = pd.factorize(df['날짜'])
+    if len(cells):
+        # 2026-10-01 / 2026.10.01 / 엑셀 날짜("2026-10-01 00:00:00") 모두 YYYY-MM-DD로
+        parsed = pd.to_datetime(pd.Series(cells).str.replace(".", "-", regex=False).str.rstrip("-"),
+                                errors="coerce", format="mixed")
+        dates = pd.Series(np.append(parsed.to_numpy(), np.datetime64("NaT"))[codes], index=df.index)
+    checks = [(dates.isna().to_numpy(), '날짜', "날짜 형식이 아님 (YYYY-MM-DD)"),
+              (df['식당명'] == "", '식당명', "필수"),
+              (~df['카테고리'].isin([""] + _ALL_CATEGORIES), '카테고리', "선택지에 없음")]
+    rating = pd.to_numeric(df['평점'], errors='coerce')
+    checks.append(((df['평점'] != "") & ~rating.between(0, 5), '평점', "0~5 숫자가 아님"))
+    df = df.assign(날짜=dates.dt.strftime("%Y-%m-%d").fillna(df['날짜']))
+    return df, checks
+
+_CHECKS = {
+    cfg.WORKSHEET_NAME_LIST: _check_list,
+    cfg.WORKSHEET_NAME_HISTORY: _check_history,
+}
+
+def validate(df, worksheet):
+    """map_columns 결과 -> (저장할 행 프레임, 문제 목록[행, 컬럼, 값, 문제]). 행 = 파일 행 번호 (1행은 헤더)."""
+    df = df.reset_index(drop=True)
+    cleaned, checks = _CHECKS[worksheet](df)
+    bad_rows = np.zeros(len(df), dtype=bool)
+    issues = []
+    for bad, column, reason in checks:
+        bad = np.asarray(bad, dtype=bool)
+        if not bad.any(): continue
+        bad_rows |= bad
+        pos = np.flatnonzero(bad)
+        issues.append(pd.DataFrame({"행": pos + 2, "컬럼": column, "값": df[column].to_numpy()[pos], "문제": reason}))
+    issues = (pd.concat(issues, ignore_index=True).sort_values("행", kind="stable", ignore_index=True)
+              if issues else pd.DataFrame(columns=["행", "컬럼", "값", "문제"]))
+    return cleaned[~bad_rows], issues
+
+def to_rows(df):
+    """저장용 행 dict 목록. 문자열 컬럼을 칸마다 꺼내는 to_dict('records')보다 컬럼 단위 tolist가 훨씬 빠르다."""
+    columns = list(df.columns)
+    return [dict(zip(columns, values)) for values in zip(*(df[c].tolist() for c in columns))]
+
+def similar_names(names, index):
+    """가져올 식당명 중 중복 의심 [가져올 이름, 비슷한 이름, 위치(시트/파일), 유사도] 프레임.
+    시트에 똑같은 이름이 있으면 리뷰 추가로 보고 뺀다. index = 시트 식당명 색인."""
+    existing = set(index.names)
+    names = [n for n in dict.fromkeys(map(str, names)) if n.strip() and n not in existing]
+    rows = [(name, other, "시트", score) for name in names for other, score in index.similar(name, k=1)]
+    in_file = NameIndex(names)
+    a, b, scores = in_file.duplicate_pairs()
+    rows += [(in_file.names[i], in_file.names[j], "파일", s) for i, j, s in zip(a.tolist(), b.tolist(), scores.tolist())]
+    report = pd.DataFrame(rows, columns=["가져올 이름", "비슷한 이름", "위치", "유사도"])
+    report["유사도"] = report["유사도"].astype(float).round(2)
+    return report
@@ -4,6 +4,85 @@ import streamlit as st
 # 기본 설정
 SHEET_URL = "https://docs.google.com/spreadsheets/d/1_WvbJhPTbxU5c4hMwv9ak-G78jajBD-ZIrzvqxvgDTI/edit?usp=sharing"
 MODEL_NAME = "gpt-4o"
+AGENT_CACHE_ENTRIES = 2  # 데이터 버전별로 보관할 에이전트 수
+LLM_BACKEND = "openai"   # "fake": API 키 없이 오프라인으로 스트리밍 UI를 확인하는 가짜 모델
+FAKE_LLM_REPLY = "오늘은 가까운 국밥집 어떠세요? 최근에 안 가본 곳이라 좋을 것 같아요."
+
+# 웹 검색(날씨 등) 결과 캐시: 같은 시간 구간 안의 같은 검색어는 재사용
+SEARCH_CACHE_MAXSIZE = 256
+SEARCH_CACHE_BUCKET = 6 * 3600          # 일반 검색 (초)
+SEARCH_CACHE_WEATHER_BUCKET = 3600      # 날씨 검색 (초)
+SEARCH_WEATHER_KEYWORDS = ["날씨", "기온", "강수", "미세먼지", "weather"]
+
+# AI 상담소 답변 캐시 (같은 데이터/기록/날짜에서 같은 질문이면 재사용)
+ANSWER_CACHE_MAXSIZE = 200
+ANSWER_CACHE_TTL = 6 * 3600
+ANSWER_CACHE_FUZZY = False         # 켜면 비슷한 질문(글자 2-gram 자카드 유사도)도 재사용
+ANSWER_CACHE_SIMILARITY = 0.8
+ANSWER_CACHE_EXACT_TOKENS = ["안", "말고", "빼고", "제외"]   # 비슷한 질문이라도 숫자와 이 부정 표현은 똑같아야 재사용
+
+# AI 상담소 에이전트 방식
+# - "tools": 타입 있는 검색 도구로 미리 추린 후보만 모델에 전달 (코드 실행 없음)
+# - "pandas": 데이터프레임 전체를 넘기고 모델이 pandas 코드를 실행
+AGENT_MODE = "tools"
+AI_TOOL_RESULT_LIMIT = 8   # 도구 한 번에 돌려주는 최대 후보 수
+TOOL_AGENT_MAX_STEPS = 4
+TOOL_AGENT_SYSTEM_PROMPT = (
+    "너는 우리 팀 점심 추천 봇이야. 맛집 정보는 반드시 도구(search_restaurants, find_by_keyword, cafes_near, recent_meals)로 찾아. "
+    "조건이 여러 개면 search_restaurants 한 번에 같이 넘겨. "
+    "밥 먹은 곳(또는 특정 식당) 근처 카페를 물으면 cafes_near에 그 식당명을 넘겨서 걸어갈 만한 카페를 찾아. "
+    "도구 결과에 없는 식당은 지어내지 마. 한국어로 짧게 대답해."
+)
+
+# 저장소: "gsheets" (구글 시트) / "sqlite" (로컬 파일, 오프라인 실행/테스트용)
+# 옮길 때: python -m storage migrate gsheets sqlite
+STORAGE_BACKEND = "gsheets"
+SQLITE_PATH = "lunch.db"
+
+# 쓰기 지연 저장: 저장 요청은 로컬 저널 파일에 먼저 기록하고 바로 돌아감.
+# 백그라운드 스레드가 시트별로 묶어서 저장소에 쓰고, 실패하면 백오프 후 재시도
+WRITE_BEHIND = True
+JOURNAL_PATH = "write_journal.jsonl"
+JOURNAL_FLUSH_INTERVAL = 0.5   # 이 시간(초) 동안 쌓인 작업을 한 번에 씀
+JOURNAL_RETRY_BASE = 1.0       # 첫 재시도 대기(초), 실패할 때마다 2배
+JOURNAL_RETRY_MAX = 60.0
+JOURNAL_MAX_ATTEMPTS = 10      # 이만큼 실패한 작업은 보류 파일로 옮기고 다음 작업을 계속 씀 (백오프 합계 약 4분)
+JOURNAL_DEAD_LETTER_PATH = "write_journal_failed.jsonl"
+
+# 시트 데이터 캐시 (프로세스 공용). 저장 시에는 TTL과 무관하게 즉시 무효화됨
+CACHE_TTL = 60  # 초
+# 맛집 리스트 + 식사 기록을 동시에 읽을 때 시트별 최대 대기(초). 넘으면 그 시트만 빈 프레임으로 처리
+LOAD_TIMEOUT = 20
+# 행 추가(append) 시 이 시간(초) 안에 들어온 요청은 한 번의 쓰기로 묶음 (WRITE_BEHIND 끈 경우)
+APPEND_BATCH_WINDOW = 0.3
+# 데이터 관리 편집기 저장 방식: "delta" (바뀐 칸만) / "full" (시트 전체 덮어쓰기)
+EDITOR_SAVE_MODE = "delta"
+# 파일(CSV/XLSX) 일괄 가져오기: 한 번에 받을 최대 행 수, 시트 컬럼 대신 쓸 수 있는 헤더 이름
+IMPORT_MAX_ROWS = 20000
+IMPORT_ALIASES = {
+    '상호명': '식당명', '가게': '식당명', '이름': '식당명',
+    '메뉴': '메뉴키워드', '분위기': '분위기키워드',
+    '지도': '네이버지도URL', '링크': '네이버지도URL', 'URL': '네이버지도URL',
+    '별점': '평점', '리뷰': '한줄평', '위도,경도': '좌표',
+}
+
+# 식당명 중복 찾기 (등록/가져오기 때 비슷한 이름 안내, 데이터 관리의 중복 묶음 보고)
+DUP_MIN_SIMILARITY = 0.8   # 정규화한 이름의 2-gram 가중 Dice 유사도가 이 이상이면 중복 의심
+DUP_SUGGEST_LIMIT = 5      # 등록 팝업에 보여줄 최대 개수
+DUP_BLOCK_MAX = 200        # 이보다 많은 이름에 나오는 흔한 2-gram('카페' 등)으로는 후보를 만들지 않음 (점수 계산에는 포함)
+# 영문 상호 -> 한글 표기 (공백/기호는 무시하고 비교)
+NAME_VARIANTS = {
+    "starbucks": "스타벅스", "twosome place": "투썸플레이스", "ediya": "이디야", "hollys": "할리스",
+    "mega coffee": "메가커피", "compose coffee": "컴포즈커피", "paik's coffee": "빽다방", "paul bassett": "폴바셋",
+    "paris baguette": "파리바게뜨", "tous les jours": "뚜레쥬르", "baskin robbins": "배스킨라빈스",
+    "mcdonald's": "맥도날드", "burger king": "버거킹", "lotteria": "롯데리아", "subway": "써브웨이",
+    "coffee": "커피", "cafe": "카페", "bakery": "베이커리", "pizza": "피자", "burger": "버거", "chicken": "치킨",
+}
+
+# 성능 계측 (사이드바 디버그 패널). 끄면 계측 코드는 플래그 확인만 한다
+PERF_ENABLED = False
+PERF_LOG_PATH = ""       # 예: "perf_trace.jsonl" (실행마다 trace를 JSON 한 줄로 덧붙임)
+PERF_HISTORY = 500       # 구간별로 p50/p95 계산에 쓰는 최근 측정 수
 
 # 데이터 컬럼 정의
 COLUMNS = [
@@ -11,8 +90,10 @@ COLUMNS = [
     '가격대', '거리', '최대수용인원', 
     '전화번호', '네이버지도URL', 
     '예약필수여부', '웨이팅정도', '휴무일', 
-    '작성자', '평점', '한줄평'
+    '작성자', '평점', '한줄평', '좌표'
 ]
+# 나중에 추가된 컬럼: 예전 시트/DB에 없어도 빈 값으로 읽고, 쓸 때 헤더(테이블)에 덧붙인다
+COLUMNS_ADDED = ['좌표']
 
 # 식사 관련 상수
 OPT_CATEGORY_FOOD = ["한식", "중식", "일식", "양식", "아시안", "분식/기타"]
@@ -34,6 +115,43 @@ OPT_RATING = [x * 0.5 for x in range(1, 11)]
 COMMON_VIBES = ["조용한", "깔끔한", "시끌벅적한", "노포감성", "빨리나옴", "혼밥가능", "회식추천", "손님접대", "가성비", "비오는날", "해장", "감성적인"]
 DISTANCE_MAP = {"도보 5분 이내": 1, "도보 10분 이내": 2, "차량 이동": 3}
 
+# 맛집 리스트 컬럼 타입 (utils._normalize_list_frame 에서 한 번에 변환/검증)
+# - 아래 컬럼은 범주가 고정된 pandas Categorical: 범주 = [""] + 선택지 (코드 = 그 순서)
+# - 선택지에 없는 값은 잘못된 값으로 보고하고, 저장할 때 지워지지 않도록 범주 뒤에 덧붙여 보존
+LIST_CATEGORIES = {
+    '카테고리': OPT_CATEGORY_FOOD + OPT_CATEGORY_CAFE,
+    '가격대': OPT_PRICE,
+    '거리': OPT_DISTANCE,
+    '최대수용인원': OPT_CAPACITY,
+    '예약필수여부': OPT_RESERVATION,
+    '웨이팅정도': OPT_WAITING,
+}
+LIST_RATING_DTYPE = "float64"   # 저장되는 값이라 시트 값 그대로 (float32면 4.2가 4.199999809...로 바뀜). 순위 계산 배열만 float32
+
+# 좌표('좌표' 컬럼 "위도,경도" 또는 지도 링크 안의 좌표) 기반 실제 거리
+OFFICE_LOCATION = None        # (위도, 경도). 정하면 좌표가 있는 곳은 '거리' 라벨 대신 회사에서의 실제 거리로 단계를 정함
+GEO_CELL_M = 200              # 공간 색인 격자 한 칸 크기 (m)
+WALK_M_PER_MIN = 67           # 걷는 속도 (약 4km/h)
+WALK_DETOUR = 1.3             # 직선거리 대비 실제로 걷는 거리 배수
+WALK_LEVEL_MINUTES = {1: 5, 2: 10}   # 거리 단계 1(도보 5분 이내)/2(도보 10분 이내)의 기준 시간
+CAFE_WALK_MAX_MIN = 15        # '카페 가기'에서 식당 기준으로 찾을 최대 도보 시간 (분)
+
+# 추천 점수 가중치 (각 항목은 0~1로 정규화된 뒤 가중합)
+RANK_WEIGHTS = {
+    "rating": 1.0,     # 평균 평점
+    "reviews": 0.3,    # 리뷰 수 (log 스케일)
+    "distance": 0.5,   # 가까울수록 높음
+    "keyword": 0.8,    # 고른 메뉴/분위기 키워드 일치 비율
+    "recency": 1.0,    # 최근 방문 페널티
+}
+RANK_TOP_K = 30             # 추천 결과로 보여줄 최대 개수 (AI 도구 기본값)
+RESULT_MAX_ROWS = 300       # 추천 탭에서 페이지로 넘겨볼 수 있는 최대 개수
+RESULT_PAGE_SIZE = 10       # 추천 탭 한 페이지에 그리는 식당 수
+RECENCY_WINDOW_DAYS = 14    # 이 기간이 지나면 방문 페널티 없음
+VISIT_BADGE_DAYS = 7        # 이 기간 안에 간 곳은 '최근 방문' 표시
+HISTORY_PROMPT_DAYS = 14    # AI 상담소에 넘길 식사 기록 기간
+HISTORY_PROMPT_LIMIT = 7    # AI 상담소에 넘길 식사 기록 최대 건수
+
 WORKSHEET_NAME_LIST = 0       # 첫 번째 시트: 맛집 리스트 (인덱스 0)
 WORKSHEET_NAME_HISTORY = 1    # 두 번째 시트: 식사 기록 (이름으로 지정)
 
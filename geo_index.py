@@ -0,0 +1,185 @@
+# geo_index.py
+# 좌표 기반 공간 색인 (격자): 회사 기준 반경 검색, 식당 기준 가까운 카페 찾기
+# - 좌표는 '좌표' 컬럼("위도,경도" 직접 입력)이 우선이고, 없으면 네이버 지도 링크 안의 좌표를 쓴다
+#   (링크를 열어보지 않으므로 오프라인에서도 동작, 좌표 없는 링크는 위치 없음)
+# - 동네 규모 거리라서 위경도를 기준점 중심의 평면(m)으로 펴서 계산한다 (등장방형 근사)
+# - 격자 한 칸(cfg.GEO_CELL_M)마다 행 번호 배열을 두고, 질의 지점 주변 칸만 거리 계산한다
+import math
+import re
+
+import numpy as np
+import pandas as pd
+
+import config as cfg
+
+EARTH_RADIUS_M = 6371000.0
+_MERCATOR_R = 6378137.0
+_KEY = 1 << 21   # 격자 (x칸, y칸) -> 정수 키
+_NUM = r"(-?\d+(?:\.\d+)?)"
+_LATLNG = re.compile(rf"^\s*\(?\s*{_NUM}\s*[,\s]\s*{_NUM}\s*\)?\s*$")
+_URL_LAT, _URL_LNG = re.compile(rf"[?&](?:lat|y)={_NUM}"), re.compile(rf"[?&](?:lng|lon|x)={_NUM}")
+_URL_CENTER = re.compile(rf"[?&]c={_NUM},{_NUM}")
+
+# 고유 문자열마다 정규식 검색 한 번, 숫자 변환/검증은 배열 연산으로 (URL 파싱 X)
+def _extract(values, pattern):
+    search, miss = pattern.search, ("nan",) * pattern.groups
+    found = [m.groups() if (m := search(v)) else miss for v in values]
+    return list(np.array(found, dtype=float).reshape(-1, pattern.groups).T)
+
+def _checked(lat, lng):
+    ok = (np.abs(lat) <= 90) & (np.abs(lng) <= 180) & (lat != 0) & (lng != 0)
+    return np.where(ok, lat, np.nan), np.where(ok, lng, np.nan)
+
+def latlng_from_text(values):
+    """'37.5665, 126.9780' 형식 문자열 배열 -> (위도, 경도) 배열. 경도,위도 순이어도 받아주고, 못 읽으면 NaN."""
+    a, b = _extract(values, _LATLNG)
+    lat, lng = _checked(a, b)
+    swapped = np.isnan(lat) & ~np.isnan(_checked(b, a)[0])
+    return np.where(swapped, b, lat), np.where(swapped, a, lng)
+
+def latlng_from_url(values):
+    """지도 링크 배열 -> 링크 안의 (위도, 경도). lat/lng(y/x) 파라미터 또는 c=경도,위도(웹 메르카토르 m도 가능)."""
+    # 검색/단축 링크처럼 쿼리 문자열이 없는 링크는 정규식 검색 없이 건너뛴다
+    values = np.asarray(values, dtype=object)
+    has_query = pd.Series(values, dtype="str").str.contains("?", regex=False).to_numpy()
+    if not has_query.all():
+        lat, lng = np.full(len(values), np.nan), np.full(len(values), np.nan)
+        if has_query.any(): lat[has_query], lng[has_query] = latlng_from_url(values[has_query])
+        return lat, lng
+    lat, lng = _extract(values, _URL_LAT)[0], _extract(values, _URL_LNG)[0]
+    x, y = _extract(values, _URL_CENTER)
+    mercator = (np.abs(x) > 180) | (np.abs(y) > 90)
+    with np.errstate(over="ignore", invalid="ignore"):
+        c_lng = np.where(mercator, np.degrees(x / _MERCATOR_R), x)
+        c_lat = np.where(mercator, np.degrees(2 * np.arctan(np.exp(y / _MERCATOR_R)) - np.pi / 2), y)
+    use_c = np.isnan(lat) | np.isnan(lng)
+    return _checked(np.where(use_c, c_lat, lat), np.where(use_c, c_lng, lng))
+
+def _single(parse, value):
+    lat, lng = parse([str(value)])
+    return None if np.isnan(lat[0]) else (float(lat[0]), float(lng[0]))
+
+def parse_latlng(text):
+    """'37.5665, 126.9780' -> (37.5665, 126.978). 해석할 수 없으면 None."""
+    return _single(latlng_from_text, text)
+
+def coords_from_url(url):
+    return _single(latlng_from_url, url)
+
+def format_latlng(lat, lng):
+    return f"{lat:.6f},{lng:.6f}"
+
+def locate(df):
+    """행마다 (위도 배열, 경도 배열), 위치 없으면 NaN. 같은 값이 반복되므로 고유 값만 해석한다."""
+    lat, lng = np.full(len(df), np.nan), np.full(len(df), np.nan)
+    # 지도 링크 먼저, 직접 입력한 좌표가 있으면 덮어쓴다
+    for column, parse in (('네이버지도URL', latlng_from_url), ('좌표', latlng_from_text)):
+        if column not in df.columns: continue
+        codes, cells = pd.factorize(df[column])
+        cell_lat, cell_lng = (np.append(v, np.nan) for v in parse(np.asarray(cells, dtype=object)))   # 마지막 칸 = 결측(-1)
+        found_lat, found_lng = cell_lat[codes], cell_lng[codes]
+        has = ~np.isnan(found_lat)
+        lat[has], lng[has] = found_lat[has], found_lng[has]
+    return lat, lng
+
+def walk_minutes(meters):
+    # 직선거리 -> 걷는 시간 (길이 돌아가는 만큼 cfg.WALK_DETOUR 배)
+    return meters * cfg.WALK_DETOUR / cfg.WALK_M_PER_MIN
+
+def walk_radius(minutes):
+    """minutes 분 안에 걸어갈 수 있는 직선거리(m)."""
+    return minutes * cfg.WALK_M_PER_MIN / cfg.WALK_DETOUR
+
+class GeoIndex:
+    def __init__(self, lat, lng, cell_m=None):
+        self.cell_m = cell_m or cfg.GEO_CELL_M
+        self.n_rows = len(lat)
+        self.lat, self.lng = np.asarray(lat, dtype=float), np.asarray(lng, dtype=float)
+        self.rows = np.flatnonzero(~np.isnan(self.lat))          # 위치가 있는 행
+        located = len(self.rows) > 0
+        self.lat0 = float(self.lat[self.rows].mean()) if located else 0.0
+        self.lng0 = float(self.lng[self.rows].mean()) if located else 0.0
+        self._ky = EARTH_RADIUS_M * math.pi / 180
+        self._kx = self._ky * math.cos(math.radians(self.lat0))
+        self.x, self.y = self._project(self.lat, self.lng)
+
+        cx, cy = self._cell(self.x[self.rows], self.y[self.rows])
+        keys = cx * _KEY + cy
+        order = np.argsort(keys, kind="stable")
+        uniq, starts = np.unique(keys[order], return_index=True)
+        bounds = np.append(starts, len(order))
+        sorted_rows = self.rows[order]
+        self._cells = {int(k): sorted_rows[bounds[i]:bounds[i + 1]] for i, k in enumerate(uniq)}
+        # 격자가 차지하는 범위 (가까운 곳 찾기에서 더 넓힐 필요가 없는 한계)
+        self._extent = (cx.min(), cx.max(), cy.min(), cy.max()) if located else (0, 0, 0, 0)
+
+    @classmethod
+    def from_frame(cls, df):
+        return cls(*locate(df))
+
+    def __len__(self):
+        return len(self.rows)
+
+    def has_location(self, row):
+        return not np.isnan(self.lat[row])
+
+    def _project(self, lat, lng):
+        return (lng - self.lng0) * self._kx, (lat - self.lat0) * self._ky
+
+    def _cell(self, x, y):
+        return np.floor_divide(x, self.cell_m).astype(np.int64), np.floor_divide(y, self.cell_m).astype(np.int64)
+
+    def _query(self, lat, lng):
+        qx, qy = self._project(lat, lng)
+        return qx, qy, int(qx // self.cell_m), int(qy // self.cell_m)
+
+    def _gather(self, cells, mask):
+        arrays = [self._cells[k] for k in cells if k in self._cells]
+        rows = np.concatenate(arrays) if arrays else self.rows[:0]
+        return rows[mask[rows]] if mask is not None and len(rows) else rows
+
+    def _distances(self, rows, qx, qy):
+        return np.hypot(self.x[rows] - qx, self.y[rows] - qy)
+
+    def within(self, lat, lng, radius_m, mask=None):
+        """(lat, lng)에서 radius_m 안의 (행 번호, 거리 m), 가까운 순. mask가 있으면 그 행들만."""
+        qx, qy, cx, cy = self._query(lat, lng)
+        r = int(math.ceil(radius_m / self.cell_m))
+        cells = [(cx + i) * _KEY + cy + j for i in range(-r, r + 1) for j in range(-r, r + 1)]
+        rows = self._gather(cells, mask)
+        dist = self._distances(rows, qx, qy)
+        keep = dist <= radius_m
+        order = np.argsort(dist[keep], kind="stable")
+        return rows[keep][order], dist[keep][order]
+
+    def nearest(self, lat, lng, k, mask=None, max_m=None):
+        """(lat, lng)에서 가까운 k곳의 (행 번호, 거리 m). 주변 칸부터 한 겹씩 넓혀 가며 찾는다."""
+        if not len(self.rows): return self.rows, np.empty(0)
+        qx, qy, cx, cy = self._query(lat, lng)
+        x0, x1, y0, y1 = self._extent
+        last = int(max(abs(cx - x0), abs(x1 - cx), abs(cy - y0), abs(y1 - cy)))
+        if max_m is not None: last = min(last, int(math.ceil(max_m / self.cell_m)))
+
+        rows, dist = self.rows[:0], np.empty(0)
+        for ring in range(last + 1):
+            if (2 * ring + 1) ** 2 > 4 * len(self._cells):
+                # 멀리서 찾는 경우: 빈 칸을 도느니 남은 점 전체와 거리 계산
+                rows = self.rows if mask is None else self.rows[mask[self.rows]]
+                dist = self._distances(rows, qx, qy)
+                break
+            if ring == 0:
+                cells = [cx * _KEY + cy]
+            else:
+                cells = [(cx + i) * _KEY + cy + j for i in range(-ring, ring + 1) for j in (-ring, ring)]
+                cells += [(cx + i) * _KEY + cy + j for i in (-ring, ring) for j in range(-ring + 1, ring)]
+            found = self._gather(cells, mask)
+            if len(found):
+                rows = np.concatenate([rows, found])
+                dist = np.concatenate([dist, self._distances(found, qx, qy)])
+            # 아직 안 본 칸의 점은 모두 ring * 칸 크기보다 멀다
+            if len(rows) >= k and np.partition(dist, k - 1)[k - 1] <= ring * self.cell_m:
+                break
+        if max_m is not None:
+            rows, dist = rows[dist <= max_m], dist[dist <= max_m]
+        order = np.argsort(dist, kind="stable")[:k]
+        return rows[order], dist[order]
@@ -0,0 +1,252 @@
+# journal.py
+# 쓰기 지연 저장(write-behind) 저널
+# - 저장 요청은 먼저 로컬 파일(JSON 한 줄씩 append + fsync)에 기록하고 바로 돌아간다
+# - 백그라운드 스레드가 시트별로 대기 중인 작업을 묶어서 저장소에 쓰고, 성공하면 ack 줄을 남긴다
+#   (연속된 append는 한 번에, replace가 있으면 그 전 작업은 건너뜀)
+# - 실패하면 시트별로 지수 백오프 후 재시도 (순서가 중요하므로 그 시트의 뒤 작업도 같이 기다림)
+#   cfg.JOURNAL_MAX_ATTEMPTS번 실패한 작업(잘못된 데이터, 권한 없음 등)은 보류 파일로 옮기고 뒤 작업을 계속 쓴다
+# - 읽을 때 아직 안 쓴 작업을 덮어씌워(overlay) 본인이 저장한 내용이 바로 보이게 한다
+# - 프로세스가 죽어도 다음 시작 때 ack 안 된 작업을 파일에서 다시 읽어 이어서 쓴다
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+
+import config as cfg
+
+def apply_op(backend, worksheet, op, data):
+    if op == "append":
+        backend.append(worksheet, data["rows"])
+    elif op == "replace":
+        backend.replace(worksheet, pd.DataFrame(data["values"], columns=data["columns"]))
+    elif op == "delta":
+        edited = {int(k): v for k, v in data["edited"].items()}
+        backend.apply_delta(worksheet, edited, data["added"], set(data["deleted"]))
+    elif op == "upsert":
+        backend.upsert(worksheet, data["key"], data["row"])
+    else:
+        raise ValueError(f"알 수 없는 작업: {op}")
+
+def overlay_op(df, op, data):
+    """아직 저장소에 안 쓴 작업 하나를 읽어온 프레임에 반영한 새 프레임."""
+    if op == "replace":
+        return pd.DataFrame(data["values"], columns=data["columns"])
+    if op == "append":
+        new = pd.DataFrame(data["rows"])
+        return pd.concat([df, new.reindex(columns=df.columns) if len(df.columns) else new], ignore_index=True)
+
+    df = df.astype(object)   # 문자열/숫자가 섞여 들어와도 그대로 담기 (정규화는 utils에서)
+    if op == "delta":
+        deleted = {int(p) for p in data["deleted"]}
+        for pos, changes in data["edited"].items():
+            pos = int(pos)
+            if pos in deleted or pos >= len(df): continue
+            for col, value in changes.items():
+                if col in df.columns: df.iat[pos, df.columns.get_loc(col)] = value
+        if data["added"]:
+            df = pd.concat([df, pd.DataFrame(data["added"]).reindex(columns=df.columns)], ignore_index=True)
+        if deleted:
+            df = df.drop(df.index[[p for p in sorted(deleted) if p < len(df)]]).reset_index(drop=True)
+        return df
+    if op == "upsert":
+        key, row = data["key"], data["row"]
+        match = (df[key].astype(str) == str(row[key])).to_numpy() if key in df.columns else []
+        if not len(match) or not match.any():
+            return pd.concat([df, pd.DataFrame([row]).reindex(columns=df.columns)], ignore_index=True)
+        for col, value in row.items():
+            if col != key and col in df.columns: df.loc[match, col] = value
+        return df
+    raise ValueError(f"알 수 없는 작업: {op}")
+
+def _coalesce(ops):
+    # [(ids, op, data)] : replace 앞의 작업은 버리고, 연속된 append는 하나로 합친다
+    batches = []
+    for entry in ops:
+        ids, op, data = [entry["id"]], entry["op"], entry["data"]
+        if op == "replace":
+            ids = [i for batch in batches for i in batch[0]] + ids
+            batches = []
+        elif op == "append" and batches and batches[-1][1] == "append":
+            prev_ids, _, prev = batches.pop()
+            ids, data = prev_ids + ids, {"rows": prev["rows"] + data["rows"]}
+        batches.append((ids, op, data))
+    return batches
+
+class Journal:
+    def __init__(self, path, get_backend, on_race=None, dead_letter_path=None):
+        self.path = path
+        self.dead_letter_path = dead_letter_path or os.path.splitext(path)[0] + "_failed.jsonl"
+        self._get_backend = get_backend
+        self._on_race = on_race          # 쓰는 도중 같은 시트를 읽은 적이 있으면 호출 (캐시 무효화용)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._file_lock = threading.Lock()
+        self._flush_lock = threading.Lock()   # 같은 작업을 두 번 쓰지 않도록 한 번에 하나만 반영
+        self._pending = []               # 아직 ack 안 된 작업 (들어온 순서)
+        self._next_id = 1
+        self._reads = {}                 # worksheet -> overlay 호출 횟수
+        self._retry = {}                 # worksheet -> (다시 시도할 monotonic 시각, 대기 초)
+        self._attempts = {}              # 작업 id -> 실패 횟수
+        self._stats = {"submitted": 0, "flushed": 0, "failed": 0, "last_error": None, "last_flush": None,
+                       "dead": 0, "last_dead_error": None}
+        self._load_dead_letters()
+        self._worker = None
+        self._replay()
+
+    # --- 파일 -------------------------------------------------------------
+    def _write_line(self, record, truncate=False):
+        with self._file_lock:
+            with open(self.path, "w" if truncate else "a", encoding="utf-8") as f:
+                if record is not None:
+                    f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _replay(self):
+        if not os.path.exists(self.path): return
+        ops, acked = [], set()
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try: record = json.loads(line)
+                except ValueError: continue   # 쓰다 만 마지막 줄
+                if "ack" in record: acked.update(record["ack"])
+                else: ops.append(record)
+        self._pending = [o for o in ops if o["id"] not in acked]
+        self._next_id = max((o["id"] for o in ops), default=0) + 1
+        if self._pending:
+            self._start_worker()
+        else:
+            self._write_line(None, truncate=True)
+
+    def _load_dead_letters(self):
+        # 보류 파일이 남아 있는 동안은 재시작해도 계속 알린다
+        if not os.path.exists(self.dead_letter_path): return
+        with open(self.dead_letter_path, encoding="utf-8") as f:
+            for line in f:
+                try: record = json.loads(line)
+                except ValueError: continue
+                self._stats["dead"] += 1
+                self._stats["last_dead_error"] = record.get("error")
+
+    def _dead_letter(self, worksheet, ids, error):
+        """계속 실패하는 작업을 보류 파일로 옮기고 대기열에서 뺀다 (뒤 작업이 막히지 않도록)."""
+        done, message = set(ids), f"{type(error).__name__}: {error}"
+        with self._lock:
+            entries = [o for o in self._pending if o["id"] in done]
+        with self._file_lock:
+            with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+                for o in entries:
+                    f.write(json.dumps(dict(o, error=message, failed_at=time.time()), ensure_ascii=False, default=str) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+        with self._lock:
+            self._stats["dead"] += len(entries)
+            self._stats["last_dead_error"] = message
+            self._retry.pop(worksheet, None)
+        self._ack(ids, flushed=False)
+        # overlay에서 빠졌으므로 캐시된 프레임도 저장소 기준으로 다시 읽게 한다
+        if self._on_race: self._on_race(worksheet)
+
+    # --- 쓰기 요청 ---------------------------------------------------------
+    def submit(self, worksheet, op, **data):
+        """작업을 저널에 기록하고 바로 돌아간다 (로컬 파일 쓰기 실패 시에만 예외)."""
+        with self._lock:
+            entry = {"id": self._next_id, "ts": time.time(), "ws": worksheet, "op": op, "data": data}
+            self._write_line(entry)
+            self._next_id += 1
+            self._pending.append(entry)
+            self._stats["submitted"] += 1
+            self._wakeup.notify()
+        self._start_worker()
+        return entry["id"]
+
+    def overlay(self, worksheet, df):
+        with self._lock:
+            self._reads[worksheet] = self._reads.get(worksheet, 0) + 1
+            ops = [o for o in self._pending if o["ws"] == worksheet]
+        for o in ops:
+            df = overlay_op(df, o["op"], o["data"])
+        return df
+
+    # --- 백그라운드 반영 -----------------------------------------------------
+    def _start_worker(self):
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive(): return
+            self._worker = threading.Thread(target=self._run, name="journal-flush", daemon=True)
+            self._worker.start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._pending:
+                    self._wakeup.wait()
+            # 짧게 기다렸다가 그동안 쌓인 작업을 한 번에 쓴다
+            time.sleep(cfg.JOURNAL_FLUSH_INTERVAL)
+            self.flush()
+            with self._lock:
+                if self._pending and self._retry:
+                    wait = min(at for at, _ in self._retry.values()) - time.monotonic()
+                    if wait > 0: self._wakeup.wait(timeout=wait)
+
+    def flush(self):
+        """재시도 대기 중이 아닌 시트의 작업을 모두 쓴다. 남은 작업 수를 돌려준다."""
+        with self._flush_lock:
+            with self._lock:
+                worksheets = list(dict.fromkeys(o["ws"] for o in self._pending))
+            now = time.monotonic()
+            for ws in worksheets:
+                if self._retry.get(ws, (0, 0))[0] > now: continue
+                self._flush_worksheet(ws)
+        with self._lock:
+            return len(self._pending)
+
+    def _flush_worksheet(self, worksheet):
+        with self._lock:
+            ops = [o for o in self._pending if o["ws"] == worksheet]
+            reads_before = self._reads.get(worksheet, 0)
+        for ids, op, data in _coalesce(ops):
+            try:
+                apply_op(self._get_backend(), worksheet, op, data)
+            except Exception as e:
+                with self._lock:
+                    self._stats["failed"] += 1
+                    self._stats["last_error"] = f"{type(e).__name__}: {e}"
+                    for i in ids: self._attempts[i] = self._attempts.get(i, 0) + 1
+                    attempts = max(self._attempts[i] for i in ids)
+                if attempts >= cfg.JOURNAL_MAX_ATTEMPTS:
+                    self._dead_letter(worksheet, ids, e)
+                    continue
+                delay = min(max(self._retry.get(worksheet, (0, 0))[1] * 2, cfg.JOURNAL_RETRY_BASE), cfg.JOURNAL_RETRY_MAX)
+                with self._lock:
+                    self._retry[worksheet] = (time.monotonic() + delay, delay)
+                break
+            self._ack(ids)
+            with self._lock:
+                self._retry.pop(worksheet, None)
+        with self._lock:
+            raced = self._reads.get(worksheet, 0) != reads_before
+        if raced and self._on_race:
+            self._on_race(worksheet)
+
+    def _ack(self, ids, flushed=True):
+        done = set(ids)
+        with self._lock:
+            self._pending = [o for o in self._pending if o["id"] not in done]
+            for i in ids: self._attempts.pop(i, None)
+            if flushed:
+                self._stats["flushed"] += len(ids)
+                self._stats["last_flush"] = time.time()
+            empty = not self._pending
+            # 다 썼으면 파일을 비운다 (ack 줄이 무한히 쌓이지 않도록)
+            self._write_line(None if empty else {"ack": ids}, truncate=empty)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["depth"] = len(self._pending)
+            stats["lag_sec"] = time.time() - self._pending[0]["ts"] if self._pending else 0.0
+            retry_at = [at for at, _ in self._retry.values()]
+        stats["retry_in_sec"] = max(min(retry_at) - time.monotonic(), 0.0) if retry_at else None
+        return stats
@@ -0,0 +1,144 @@
+# keyword_index.py
+# 키워드 역색인: 정규화된 키워드 토큰 -> 식당 행 번호(정수 배열)
+# 데이터 버전마다 한 번만 만들고, 필터링은 정수 배열의 합집합/교집합으로 처리한다.
+import re
+import unicodedata
+import numpy as np
+import pandas as pd
+
+# 쉼표로 구분된 값을 가진 컬럼 (카테고리는 단일 값이지만 옵션 목록을 위해 같이 색인)
+INDEX_COLUMNS = ['카테고리', '메뉴키워드', '분위기키워드', '휴무일']
+
+_EMPTY = np.array([], dtype=np.int32)
+_SPACES = re.compile(r"\s+")
+
+def normalize_token(text):
+    # 전각/반각 통일(NFKC) + 앞뒤 공백 제거 + 내부 공백 하나로 + 영문 대소문자 무시
+    text = unicodedata.normalize("NFKC", str(text))
+    return _SPACES.sub(" ", text).strip().casefold()
+
+class KeywordIndex:
+    def __init__(self, df, columns=INDEX_COLUMNS):
+        self.n_rows = len(df)
+        self.row_labels = df.index
+        self._postings = {}   # column -> {norm: int32 배열 (정렬됨)}
+        self._labels = {}     # column -> {norm: 화면에 보여줄 원래 표기}
+        self._pairs = {}      # column -> (토큰 코드 배열, 행 번호 배열) = 식당-토큰 펼친 표
+        self._memo = {}       # 옵션 목록/개수 (색인은 데이터 버전마다 새로 만드므로 버전별 메모)
+        for col in columns:
+            if col in df.columns:
+                self._build(col, df[col])
+
+    def _build(self, col, series):
+        # 같은 문자열 칸이 반복되므로 고유한 칸만 쪼개고, 행 전체는 정수 배열 연산으로 펼친다
+        cell_codes, cells = pd.factorize(series)
+        cell_codes = np.asarray(cell_codes)
+        vocab, labels, cell_tokens, cell_len = {}, [], [], []
+        for cell in cells:
+            tokens = []
+            for raw in str(cell).split(","):
+                raw = raw.strip()
+                if not raw: continue
+                code = vocab.setdefault(normalize_token(raw), len(vocab))
+                # 같은 토큰의 여러 표기 중 처음 나온 것을 대표 표기로 사용 (factorize는 등장 순서)
+                if code == len(labels): labels.append(raw)
+                if code not in tokens: tokens.append(code)
+            cell_tokens.extend(tokens)
+            cell_len.append(len(tokens))
+
+        cell_len = np.array(cell_len + [0], dtype=np.int64)           # 마지막 칸 = 결측(-1)
+        cell_off = np.concatenate(([0], np.cumsum(cell_len)))
+        cell_tokens = np.array(cell_tokens, dtype=np.int32)
+        lengths = cell_len[cell_codes]
+        rows = np.repeat(np.arange(self.n_rows, dtype=np.int32), lengths)
+        # 쌍 j의 토큰 = 그 행 칸의 토큰 목록 시작 + (j - 그 행의 첫 쌍 번호)
+        shift = np.repeat(cell_off[cell_codes] - (np.cumsum(lengths) - lengths), lengths)
+        codes = cell_tokens[shift + np.arange(len(rows))] if len(rows) else _EMPTY
+
+        # 토큰별 행 배열: 안정 정렬이라 행 번호는 이미 오름차순, 한 칸 안의 중복은 위에서 제거
+        order = np.argsort(codes, kind="stable")
+        bounds = np.concatenate(([0], np.cumsum(np.bincount(codes, minlength=len(vocab)))))
+        sorted_rows = rows[order]
+        norms = list(vocab)
+        self._postings[col] = {norm: sorted_rows[bounds[i]:bounds[i + 1]] for i, norm in enumerate(norms)}
+        self._labels[col] = dict(zip(norms, labels))
+        self._pairs[col] = (codes, rows)
+
+    def __contains__(self, column):
+        return column in self._postings
+
+    def rows(self, column, keywords, match="any"):
+        """키워드에 해당하는 행 번호 배열. match='any'(하나라도) / 'all'(모두)."""
+        postings = self._postings.get(column, {})
+        arrays = [postings.get(normalize_token(k), _EMPTY) for k in keywords]
+        if not arrays: return np.arange(self.n_rows, dtype=np.int32)
+        if len(arrays) == 1: return arrays[0]
+        if match == "all":
+            result = arrays[0]
+            for arr in arrays[1:]:
+                result = np.intersect1d(result, arr, assume_unique=True)
+            return result
+        return np.unique(np.concatenate(arrays))
+
+    def mask(self, column, keywords, match="any"):
+        # 합집합/교집합 정렬 없이 바로 불리언 배열로 표시 (행 배열 길이에 비례)
+        postings = self._postings.get(column, {})
+        arrays = [postings.get(normalize_token(k), _EMPTY) for k in keywords]
+        if not arrays: return np.ones(self.n_rows, dtype=bool)
+        if match == "all":
+            hits = np.zeros(self.n_rows, dtype=np.int16)
+            for arr in arrays: hits[arr] += 1
+            return hits == len(arrays)
+        mask = np.zeros(self.n_rows, dtype=bool)
+        for arr in arrays: mask[arr] = True
+        return mask
+
+    def _selected(self, row_labels=None, within=None):
+        # 대상 행 불리언 배열 (None = 전체). within=(컬럼, 값들): 예) 식사/카페 모드의 카테고리
+        selected = None
+        if row_labels is not None:
+            positions = self.row_labels.get_indexer(row_labels)
+            selected = np.zeros(self.n_rows, dtype=bool)
+            selected[positions[positions >= 0]] = True
+        if within is not None:
+            in_mode = self.mask(within[0], within[1])
+            selected = in_mode if selected is None else selected & in_mode
+        return selected
+
+    def _token_counts(self, column, row_labels=None, within=None):
+        # 토큰 코드별 식당 수 (펼친 표에서 bincount 한 번)
+        codes, rows = self._pairs[column]
+        selected = self._selected(row_labels, within)
+        if selected is not None: codes = codes[selected[rows]]
+        return np.bincount(codes, minlength=len(self._labels[column]))
+
+    def tokens(self, column, row_labels=None, within=None):
+        """컬럼에 등장하는 토큰(대표 표기) 목록. row_labels/within이 있으면 해당 행들만."""
+        labels = self._labels.get(column, {})
+        if row_labels is None and within is None:
+            return list(labels.values())
+        vocab = list(labels.values())
+        return [vocab[c] for c in np.flatnonzero(self._token_counts(column, row_labels, within))]
+
+    def counts(self, column, within=None):
+        """{정규화 토큰: 식당 수} (within 조건의 행만)."""
+        key = ("counts", column, _within_key(within))
+        if key not in self._memo:
+            counts = self._token_counts(column, within=within) if column in self else []
+            self._memo[key] = {norm: int(n) for norm, n in zip(self._labels.get(column, {}), counts) if n}
+        return self._memo[key]
+
+    def options(self, column, defaults=(), row_labels=None, within=None):
+        # 기본 추천 키워드와 합친 정렬된 옵션 목록 (정규화 기준 중복 제거)
+        # 행을 고르지 않은 호출은 색인에 메모해 두고 재사용 (rerun마다 다시 만들지 않음)
+        key = ("options", column, tuple(defaults), _within_key(within)) if row_labels is None else None
+        if key in self._memo: return list(self._memo[key])
+        merged = {normalize_token(d): d for d in defaults}
+        for label in self.tokens(column, row_labels, within):
+            merged.setdefault(normalize_token(label), label)
+        result = sorted(merged.values())
+        if key is not None: self._memo[key] = result
+        return list(result)
+
+def _within_key(within):
+    return None if within is None else (within[0], tuple(within[1]))
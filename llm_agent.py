@@ -4,31 +4,123 @@ from langchain_openai import ChatOpenAI
 from langchain_experimental.agents import create_pandas_dataframe_agent
 from langchain_community.tools import DuckDuckGoSearchRun # 검색 도구 임포트
 from langchain_core.tools import Tool
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+import itertools
 import config as cfg
+import perf
+import ai_tools
+import search_cache
+import utils
+from keyword_index import KeywordIndex
 
-def get_agent(df):
-    llm = ChatOpenAI(
-        model=cfg.MODEL_NAME, 
-        temperature=0, 
+try:
+    from langchain.agents import AgentExecutor, create_openai_functions_agent
+    from langchain.agents.agent import RunnableAgent
+except ImportError:  # langchain 1.x 에서는 langchain_classic 으로 이동
+    from langchain_classic.agents import AgentExecutor, create_openai_functions_agent
+    from langchain_classic.agents.agent import RunnableAgent
+
+# 모델 클라이언트(HTTP 커넥션 포함)는 프로세스당 하나만 만들어 재사용
+@st.cache_resource
+def get_llm():
+    if cfg.LLM_BACKEND == "fake":
+        # 오프라인 테스트용: 고정 답변을 단어 단위로 스트리밍하는 가짜 모델
+        return GenericFakeChatModel(messages=itertools.cycle([AIMessage(content=cfg.FAKE_LLM_REPLY)]))
+    return ChatOpenAI(
+        model=cfg.MODEL_NAME,
+        temperature=0,
+        streaming=True,
         api_key=st.secrets["openai"]["api_key"]
     )
-    
+
+@st.cache_resource
+def get_tools():
     # 1. 검색 도구 생성
     search = DuckDuckGoSearchRun()
-    tools = [
+    return [
         Tool(
             name="Search",
-            func=search.run,
+            func=search_cache.make_cached_run(search.run),  # 같은 시간대 같은 검색은 캐시에서
             description="현재 날씨, 실시간 정보 등이 필요할 때 유용합니다."
         )
     ]
 
+def build_pandas_agent(df, llm, extra_tools=()):
     # 2. 에이전트 생성 (extra_tools 추가)
     return create_pandas_dataframe_agent(
-        llm, 
-        df, 
-        verbose=True, 
+        llm,
+        df.copy(),  # 캐시된 공용 프레임을 에이전트 코드가 건드리지 않도록 복사본 전달
+        verbose=True,
         agent_type="openai-functions",
         allow_dangerous_code=True,
-        extra_tools=tools  # 도구 장착!
-    )
\ No newline at end of file
+        extra_tools=list(extra_tools)  # 도구 장착!
+    )
+
+# [신규] 빠른 검색 모드: 코드 실행 없이 타입 있는 도구로 미리 추린 후보만 받는다
+def build_tool_agent(df, kw_index, llm, extra_tools=(), version=None):
+    tools = ai_tools.make_tools(df, kw_index, version) + list(extra_tools)
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", cfg.TOOL_AGENT_SYSTEM_PROMPT),
+        ("human", "{input}"),
+        MessagesPlaceholder("agent_scratchpad"),
+    ])
+    agent = RunnableAgent(
+        runnable=create_openai_functions_agent(llm, tools, prompt),
+        input_keys_arg=["input"], return_keys_arg=["output"],
+    )
+    return AgentExecutor(agent=agent, tools=tools, verbose=True, max_iterations=cfg.TOOL_AGENT_MAX_STEPS)
+
+def _make_agent(df, version, mode):
+    if mode == "tools":
+        kw_index = utils.get_keyword_index(df, version) if version is not None else KeywordIndex(df)
+        return build_tool_agent(df, kw_index, get_llm(), get_tools(), version)
+    return build_pandas_agent(df, get_llm(), get_tools())
+
+# _df 는 해시하지 않고 version 으로만 캐시 키를 만든다 (데이터가 바뀔 때만 재생성)
+@st.cache_resource(max_entries=cfg.AGENT_CACHE_ENTRIES)
+def _build_agent(_df, version, mode):
+    return _make_agent(_df, version, mode)
+
+@perf.timed()
+def get_agent(df, version=None, mode=None):
+    mode = mode or cfg.AGENT_MODE
+    # version 이 없으면 캐시할 수 없으므로 매번 새로 만든다
+    if version is None:
+        return _make_agent(df, version, mode)
+    return _build_agent(df, version, mode)
+
+# [신규] 답변 스트리밍: 토큰과 도구 호출을 받는 즉시 채팅 말풍선에 그린다
+class StreamHandler(BaseCallbackHandler):
+    # 중단 버튼으로 rerun 되면 st 호출에서 나는 예외가 에이전트 실행까지 멈추도록 전파
+    raise_error = True
+
+    def __init__(self, container, status=None, on_update=None):
+        self.container = container
+        self.status = status
+        self.on_update = on_update
+        self.text = ""
+
+    def _reset(self):
+        # 모델 호출마다 새로 시작 (도구 호출 전 중간 문장과 최종 답변이 섞이지 않게)
+        self.text = ""
+
+    def on_llm_start(self, serialized, prompts, **kwargs):
+        self._reset()
+
+    def on_chat_model_start(self, serialized, messages, **kwargs):
+        self._reset()
+
+    def on_llm_new_token(self, token, **kwargs):
+        if not token: return
+        self.text += token
+        self.container.markdown(self.text + "▌")
+        if self.on_update: self.on_update(self.text)
+
+    def on_agent_action(self, action, **kwargs):
+        if self.status: self.status.write(f"🔧 {action.tool}: `{action.tool_input}`")
+
+    def on_tool_end(self, output, **kwargs):
+        if self.status: self.status.caption(str(output)[:200])
@@ -0,0 +1,175 @@
+# name_index.py
+# 식당명 중복 찾기: 정규화한 이름의 글자 2-gram 역색인
+# - 정규화: NFKC + 소문자 + 공백/기호 제거 + 영문 상호는 한글 표기로(cfg.NAME_VARIANTS) + 끝의 '점' 제거
+#   "스타벅스 역삼점" / "스타벅스역삼점" / "Starbucks 역삼" -> "스타벅스역삼"
+# - 띄어 쓴 마지막 단어가 '~점'이면 지점으로 따로 기억해서, 지점이 둘 다 있고 다르면 중복이 아니다
+# - 유사도 = 가중 Dice (공유 2-gram 가중치 * 2 / 양쪽 가중치 합), 흔한 2-gram('베이커')일수록 가볍게
+# - 후보 = 드문 2-gram을 공유하는 이름만 (전체 비교 X)
+import re
+import unicodedata
+import numpy as np
+import pandas as pd
+
+import config as cfg
+
+_NOT_WORD = re.compile(r"[\W_]+")
+_BRANCH = re.compile(r"\s\(?([^\s()]+?)점\)?$")
+_SUFFIX = re.compile(r"본?점$")
+_LATIN = re.compile(r"[a-z]")
+_VARIANTS = {_NOT_WORD.sub("", k.casefold()): v for k, v in cfg.NAME_VARIANTS.items()}
+_VARIANT_RE = re.compile("|".join(sorted(map(re.escape, _VARIANTS), key=len, reverse=True)))
+
+def split_name(name):
+    """식당명 -> (비교용 키, 지점). '스타벅스 역삼점' -> ('스타벅스역삼', '역삼')."""
+    text = unicodedata.normalize("NFKC", str(name)).casefold().strip()
+    m = _BRANCH.search(text) if "점" in text else None
+    branch = m.group(1) if m and m.group(1) != "본" else ""
+    key = _NOT_WORD.sub("", text)
+    if _LATIN.search(key): key = _VARIANT_RE.sub(lambda v: _VARIANTS[v.group(0)], key)
+    if len(key) > 2: key = _SUFFIX.sub("", key)
+    return key, branch
+
+def _gram_codes(keys):
+    """키 목록 -> (키 번호, 2-gram 코드) 펼친 표. 2-gram 코드 = 앞 글자 << 21 | 뒤 글자 (한 글자 키는 그 글자만).
+    글자를 UTF-32 정수 배열로 이어 붙여 한 번에 계산한다."""
+    lengths = np.fromiter(map(len, keys), dtype=np.int64, count=len(keys))
+    chars = np.frombuffer("".join(keys).encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+    owner = np.repeat(np.arange(len(keys)), lengths)
+    is_last = np.zeros(len(chars), dtype=bool)
+    is_last[(np.cumsum(lengths) - 1)[lengths > 0]] = True
+    following = np.where(is_last, 0, np.append(chars[1:], 0))
+    starts = ~is_last | (lengths[owner] == 1)
+    return owner[starts], ((chars << 21) | following)[starts]
+
+class NameIndex:
+    """식당명 2-gram 역색인. 2-gram 가중치 = log(1 + 이름 수 / 그 2-gram이 나오는 이름 수) (흔한 '베이커리' 등은 가볍게)."""
+
+    def __init__(self, names):
+        self.names = list(dict.fromkeys(str(n) for n in names if str(n).strip()))
+        self.keys, branches = zip(*map(split_name, self.names)) if self.names else ((), ())
+        self._branch = np.array(branches, dtype=object)
+        n = len(self.names)
+
+        owner, codes = _gram_codes(self.keys)
+        gram_ids, vocab = pd.factorize(codes)
+        n_vocab = max(len(vocab), 1)
+        # 이름 안의 중복 2-gram 제거 + (이름, 2-gram) 순 정렬
+        pairs = np.sort(owner * n_vocab + gram_ids)
+        pairs = pairs[np.r_[True, pairs[1:] != pairs[:-1]]] if len(pairs) else pairs
+        owner, gram_ids = pairs // n_vocab, pairs % n_vocab
+        self._n_vocab, self._name_gram_keys = n_vocab, pairs   # 이름 번호 * n_vocab + 2-gram, 정렬됨
+        self._vocab = dict(zip(vocab.tolist(), range(len(vocab))))
+        self._df = np.bincount(gram_ids, minlength=len(vocab))
+        self._weight = np.log1p(max(n, 1) / np.maximum(self._df, 1))
+        self._unseen = float(np.log1p(max(n, 1)))           # 색인에 없는 2-gram의 가중치
+        self._name_weight = np.bincount(owner, weights=self._weight[gram_ids], minlength=n)
+        # 이름별 2-gram (정렬됨) / 2-gram별 이름 번호 (정렬됨)
+        self._name_grams, self._name_bounds = gram_ids, np.concatenate(([0], np.cumsum(np.bincount(owner, minlength=n))))
+        order = np.argsort(gram_ids, kind="stable")
+        self._ids = owner[order]
+        self._bounds = np.concatenate(([0], np.cumsum(self._df)))
+
+    def __len__(self):
+        return len(self.names)
+
+    def _postings(self, gram):
+        return self._ids[self._bounds[gram]:self._bounds[gram + 1]]
+
+    def _grams_of(self, i):
+        return self._name_grams[self._name_bounds[i]:self._name_bounds[i + 1]]
+
+    def _score(self, name, min_score):
+        key, branch = split_name(name)
+        if not key or not len(self.names): return np.empty(0, dtype=np.int64), np.empty(0)
+        codes = np.unique(_gram_codes([key])[1]).tolist()
+        grams = np.array([self._vocab[c] for c in codes if c in self._vocab], dtype=np.int64)
+        q_weight = self._weight[grams].sum() + self._unseen * (len(codes) - len(grams))
+        if not len(grams): return np.empty(0, dtype=np.int64), np.empty(0)
+
+        # 후보 = 드문 2-gram(cfg.DUP_BLOCK_MAX곳 이하)을 공유하는 이름, 없으면 가장 드문 2-gram 하나
+        rare = self._df[grams] <= cfg.DUP_BLOCK_MAX
+        if not rare.any(): rare = self._df[grams] == self._df[grams].min()
+        postings = [self._postings(g) for g in grams[rare]]
+        cand, inverse = np.unique(np.concatenate(postings), return_inverse=True)
+        shared = np.bincount(inverse, weights=np.repeat(self._weight[grams[rare]], [len(p) for p in postings]))
+        # 흔한 2-gram은 후보에 들어 있는지만 이진 탐색으로 확인
+        for g in grams[~rare]:
+            post = self._postings(g)
+            pos = np.minimum(np.searchsorted(post, cand), len(post) - 1)
+            shared += (post[pos] == cand) * self._weight[g]
+        score = 2 * shared / (q_weight + self._name_weight[cand])
+        keep = score >= min_score
+        if branch:
+            keep &= (self._branch[cand] == "") | (self._branch[cand] == branch)
+        return cand[keep], score[keep]
+
+    def similar(self, name, k=None, min_score=None):
+        """name과 비슷한 기존 이름 [(이름, 유사도)] 유사도 높은 순. 완전히 같은 이름은 뺀다."""
+        cand, score = self._score(name, cfg.DUP_MIN_SIMILARITY if min_score is None else min_score)
+        order = np.argsort(-score, kind="stable")
+        result = [(self.names[i], float(s)) for i, s in zip(cand[order], score[order]) if self.names[i] != name]
+        return result[:k or cfg.DUP_SUGGEST_LIMIT]
+
+    def duplicate_pairs(self, min_score=None):
+        """중복 의심 (이름 번호 a 배열, b 배열, 유사도 배열), a < b.
+
+        Dice >= t 이면 두 이름은 각자 가중치의 t/(2-t) 이상을 공유한다. 2-gram을 드문 순(전체 공통 순서)으로 늘어놓으면
+        공유하는 첫 2-gram은 양쪽의 '앞부분'(뒤에 남은 가중치가 t/(2-t) 이상인 구간)에 들어 있으므로,
+        앞부분 2-gram끼리만 짝지어 후보를 만들고 정확한 유사도는 후보에만 계산한다.
+        """
+        min_score = cfg.DUP_MIN_SIMILARITY if min_score is None else min_score
+        n = len(self.names)
+        alpha = min_score / (2 - min_score)
+        owner = np.repeat(np.arange(n), np.diff(self._name_bounds))
+        grams = self._name_grams
+        order = np.lexsort((grams, self._df[grams], owner))
+        owner, grams = owner[order], grams[order]
+        weight = self._weight[grams]
+        # 이름 안에서 이 2-gram부터 끝까지의 가중치
+        rest = self._name_weight[owner] - (np.cumsum(weight) - weight - np.repeat(np.cumsum(self._name_weight) - self._name_weight, np.diff(self._name_bounds)))
+        in_prefix = (rest >= alpha * self._name_weight[owner] - 1e-6) & (self._df[grams] <= cfg.DUP_BLOCK_MAX)
+        owner, grams = owner[in_prefix], grams[in_prefix]
+
+        # 같은 앞부분 2-gram을 가진 이름끼리 (x < y) 쌍
+        order = np.lexsort((owner, grams))
+        owner, grams = owner[order], grams[order]
+        group_end = np.searchsorted(grams, grams, side="right")
+        sizes = group_end - np.arange(len(grams)) - 1
+        a = np.repeat(owner, sizes)
+        b = owner[np.repeat(np.arange(len(grams)) + 1 - (np.cumsum(sizes) - sizes), sizes) + np.arange(len(a))]
+        pairs = np.sort(a * n + b)
+        pairs = pairs[np.r_[True, pairs[1:] != pairs[:-1]]] if len(pairs) else pairs
+        a, b = pairs // n, pairs % n
+
+        # 정확한 공유 가중치: a의 2-gram마다 (b, 2-gram)이 색인에 있는지 이진 탐색
+        sizes = np.diff(self._name_bounds)[a]
+        pair_of = np.repeat(np.arange(len(a)), sizes)
+        grams = self._name_grams[np.repeat(self._name_bounds[a] - (np.cumsum(sizes) - sizes), sizes) + np.arange(len(pair_of))]
+        wanted = b[pair_of] * self._n_vocab + grams
+        keys = self._name_gram_keys
+        found = keys[np.minimum(np.searchsorted(keys, wanted), len(keys) - 1)] == wanted if len(keys) else wanted < 0
+        shared = np.bincount(pair_of, weights=self._weight[grams] * found, minlength=len(a))
+        score = 2 * shared / np.maximum(self._name_weight[a] + self._name_weight[b], 1e-9)
+        keep = score >= min_score
+        branch_a, branch_b = self._branch[a], self._branch[b]
+        keep &= (branch_a == "") | (branch_b == "") | (branch_a == branch_b)
+        return a[keep], b[keep], score[keep]
+
+    def duplicate_groups(self, min_score=None):
+        """중복 의심 이름 묶음 [[이름, ...], ...] (유사한 쌍을 이어서 묶음, 큰 묶음부터)."""
+        a, b, _ = self.duplicate_pairs(min_score)
+        parent = list(range(len(self.names)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for i, j in zip(a.tolist(), b.tolist()):
+            ri, rj = find(i), find(j)
+            if ri != rj: parent[max(ri, rj)] = min(ri, rj)
+        groups = {}
+        for i in sorted(set(a.tolist()) | set(b.tolist())):
+            groups.setdefault(find(i), []).append(self.names[i])
+        return sorted(groups.values(), key=len, reverse=True)
@@ -0,0 +1,114 @@
+# perf.py
+# 실행(rerun) 단위 성능 계측 (cfg.PERF_ENABLED 로 켜고 끈다)
+# - span(name): 구간 시간 측정 context manager, timed(name): 함수 데코레이터
+# - bind(fn): 스레드 풀에서 돌리는 함수의 구간도 호출한 실행의 trace에 넣는다
+# - 한 번의 스크립트 실행 동안 잰 구간은 trace 하나로 묶인다 (start_trace ~ finish_trace)
+# - 구간별 시간은 프로세스 전체(모든 세션)에 누적해서 p50/p95를 계산한다
+# - cfg.PERF_LOG_PATH 가 있으면 trace를 JSON 한 줄씩 파일에 덧붙인다
+# 꺼져 있으면 함수 호출 한 번 + 플래그 확인만 한다.
+import functools
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+
+import config as cfg
+
+_local = threading.local()     # 스레드(= Streamlit 세션 실행)별 현재 trace와 구간 스택
+_lock = threading.Lock()
+_samples = {}                  # 구간 이름 -> 최근 소요 시간(ms) deque
+_file_lock = threading.Lock()
+
+def _record(name, t0, ms, depth):
+    trace = getattr(_local, "trace", None)
+    if trace is not None:
+        trace["spans"].append({"name": name, "start_ms": round((t0 - trace["t0"]) * 1000, 3),
+                               "ms": round(ms, 3), "depth": depth})
+    with _lock:
+        samples = _samples.get(name)
+        if samples is None:
+            samples = _samples[name] = deque(maxlen=cfg.PERF_HISTORY)
+        samples.append(ms)
+
+@contextmanager
+def span(name):
+    if not cfg.PERF_ENABLED:
+        yield
+        return
+    depth = getattr(_local, "depth", 0)
+    _local.depth = depth + 1
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        _local.depth = depth
+        _record(name, t0, (time.perf_counter() - t0) * 1000, depth)
+
+def timed(name=None):
+    """함수 전체를 구간 하나로 잰다. 이름을 안 주면 '모듈.함수'."""
+    def decorator(fn):
+        label = name or f"{fn.__module__}.{fn.__name__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not cfg.PERF_ENABLED:
+                return fn(*args, **kwargs)
+            with span(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def bind(fn):
+    """다른 스레드에서 돌릴 함수를 지금 실행의 trace에 묶는다 (그 스레드에서 잰 구간도 이번 trace에 기록)."""
+    trace = getattr(_local, "trace", None)
+    if not cfg.PERF_ENABLED or trace is None: return fn
+    depth = getattr(_local, "depth", 0)
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        _local.trace, _local.depth = trace, depth
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _local.trace, _local.depth = None, 0
+    return wrapper
+
+def start_trace(name):
+    # 이전 실행이 st.rerun() 등으로 끝까지 못 갔으면 그 trace는 버린다
+    if not cfg.PERF_ENABLED: return
+    _local.trace = {"name": name, "time": datetime.now().isoformat(timespec="seconds"),
+                    "t0": time.perf_counter(), "spans": []}
+    _local.depth = 0
+
+def finish_trace():
+    """현재 실행의 trace를 닫고 돌려준다 (꺼져 있거나 시작하지 않았으면 None)."""
+    trace = getattr(_local, "trace", None)
+    _local.trace = None
+    if trace is None or not cfg.PERF_ENABLED: return None
+    trace["total_ms"] = round((time.perf_counter() - trace.pop("t0")) * 1000, 3)
+    trace["spans"].sort(key=lambda s: s["start_ms"])   # 끝난 순서 -> 시작 순서 (부모가 자식보다 앞)
+    _record(f"page:{trace['name']}", None, trace["total_ms"], 0)
+    if cfg.PERF_LOG_PATH:
+        line = json.dumps(trace, ensure_ascii=False)
+        with _file_lock, open(cfg.PERF_LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+    return trace
+
+def summary():
+    """구간 이름별 count / p50 / p95 / max (ms), p95 큰 순."""
+    with _lock:
+        snapshot = {name: np.array(samples) for name, samples in _samples.items()}
+    rows = [
+        {"name": name, "count": len(ms), "p50": float(np.percentile(ms, 50)),
+         "p95": float(np.percentile(ms, 95)), "max": float(ms.max())}
+        for name, ms in snapshot.items() if len(ms)
+    ]
+    return sorted(rows, key=lambda r: -r["p95"])
+
+def reset():
+    with _lock:
+        _samples.clear()
@@ -0,0 +1,162 @@
+# recommender.py
+# 추천 필터 로직 (추천 탭의 '추천 받기' 버튼과 AI 상담소 도구가 같이 사용)
+import re
+import numpy as np
+import pandas as pd
+import config as cfg
+import perf
+import utils
+from geo_index import walk_minutes, walk_radius
+
+# 검색 모드별 대상 카테고리
+MODE_CATEGORIES = {
+    "식사": cfg.OPT_CATEGORY_FOOD + ["분식/기타"],
+    "카페": cfg.OPT_CATEGORY_CAFE,
+}
+MODE_CATEGORIES["전체"] = MODE_CATEGORIES["식사"] + MODE_CATEGORIES["카페"]
+
+# 휴무 요일 비트: 월=1, 화=2, ... 일=64 (datetime.weekday() 순서). 연중무휴/빈 값 = 0
+WEEKDAYS = cfg.OPT_DAYS[:7]
+_DAY_SEP = re.compile(r"[,/·\s]+")
+
+@perf.timed()
+def filter_mask(df, kw_index, target_cats, category="전체", max_distance="차량 이동(전체)",
+                menus=(), vibes=(), match="any", price=None, features=None, weekday=None):
+    # 아래에서 &= 로 덮어쓰므로 새 배열로 받는다 (category_mask는 항상 새 배열)
+    mask = category_mask(df['카테고리'], target_cats if category == "전체" else [category])
+
+    u_lvl = cfg.DISTANCE_MAP.get(max_distance, 3)
+    if "차량" not in max_distance:
+        # 데이터 버전별로 미리 계산한 거리 단계가 있으면 재사용
+        d_lvl = features.d_lvl if features is not None else distance_levels(df)
+        mask &= d_lvl <= u_lvl
+
+    if price: mask &= category_mask(df['가격대'], [price])
+
+    # weekday(0=월)를 주면 그 요일이 휴무인 곳을 뺀다 (요일 비트 AND 한 번)
+    if weekday is not None:
+        closed = features.closed if features is not None else closed_days(df)
+        mask &= (closed & np.uint8(1 << weekday)) == 0
+
+    # 키워드는 역색인으로 행 번호를 바로 찾는다 (부분 문자열 오매칭 없음)
+    if menus: mask &= kw_index.mask('메뉴키워드', menus, match)
+    if vibes: mask &= kw_index.mask('분위기키워드', vibes, match)
+    return mask
+
+def category_mask(series, values):
+    """series 값이 values 중 하나인 행. 범주형이면 문자열 비교 없이 범주 코드 조회표로 계산한다."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        cat, values = series.array, set(values)
+        lut = np.array([c in values for c in cat.categories] + [False])   # 마지막 칸 = 코드 -1 (결측)
+        return lut[cat.codes]
+    return series.isin(values).to_numpy(copy=True)
+
+def distance_levels(df, geo=None):
+    # 거리 단계(1~3, int8). 선택지에 없거나 빈 값은 3 (차량 이동)
+    distance = df['거리']
+    if isinstance(distance.dtype, pd.CategoricalDtype):
+        cat = distance.array
+        lut = np.array([cfg.DISTANCE_MAP.get(c, 3) for c in cat.categories] + [3], dtype=np.int8)
+        levels = lut[cat.codes]
+    else:
+        levels = distance.map(cfg.DISTANCE_MAP).fillna(3).to_numpy(dtype=np.int8)
+    # [신규] 회사 위치와 좌표가 있으면 라벨 대신 실제 도보 거리로 단계를 정한다
+    if cfg.OFFICE_LOCATION and geo is not None and len(geo):
+        office = office_levels(geo)
+        located = office > 0
+        levels[located] = office[located]
+    return levels
+
+def office_levels(geo):
+    """회사(cfg.OFFICE_LOCATION)에서 걸어서 걸리는 시간 기준 거리 단계. 좌표 없는 행은 0."""
+    lat, lng = cfg.OFFICE_LOCATION
+    levels = np.zeros(geo.n_rows, dtype=np.int8)
+    levels[geo.rows] = 3
+    # 넓은 반경부터 덮어쓰면 가까운 곳이 작은 단계로 남는다
+    for level in sorted(cfg.WALK_LEVEL_MINUTES, reverse=True):
+        rows, _ = geo.within(lat, lng, walk_radius(cfg.WALK_LEVEL_MINUTES[level]))
+        levels[rows] = level
+    return levels
+
+def walk_from(geo, row, mask=None, k=None, max_minutes=None):
+    """row 위치에서 걸어서 가까운 곳의 (행 번호, 도보 분), 가까운 순. 좌표가 없으면 빈 결과."""
+    if not geo.has_location(row): return np.empty(0, dtype=np.intp), np.empty(0)
+    mask = np.ones(geo.n_rows, dtype=bool) if mask is None else mask.copy()
+    mask[row] = False   # 출발한 곳은 뺀다
+    rows, dist = geo.nearest(geo.lat[row], geo.lng[row], k or cfg.RESULT_MAX_ROWS, mask=mask,
+                             max_m=walk_radius(max_minutes or cfg.CAFE_WALK_MAX_MIN))
+    return rows, walk_minutes(dist)
+
+def parse_closed_days(text):
+    """휴무일 문자열 -> 7비트 요일 마스크 ('토,일' -> 0b1100000, '연중무휴' -> 0)."""
+    bits = 0
+    for token in _DAY_SEP.split(str(text)):
+        if token == "주말":
+            bits |= 0b1100000
+        elif token and token[0] in WEEKDAYS and (len(token) == 1 or token[1:] == "요일"):
+            bits |= 1 << WEEKDAYS.index(token[0])
+    return bits
+
+def closed_days(df):
+    # 같은 휴무일 문자열이 반복되므로 고유 문자열만 해석하고 코드로 펼친다 (uint8)
+    codes, cells = pd.factorize(df['휴무일'])
+    lut = np.array([parse_closed_days(c) for c in cells] + [0], dtype=np.uint8)
+    return lut[codes]
+
+def filter_restaurants(df, kw_index, target_cats, **conditions):
+    return df[filter_mask(df, kw_index, target_cats, **conditions)]
+
+# -----------------------------------------------------------------------------
+# [신규] 추천 점수 (한 번의 벡터 연산으로 계산 후 상위 k개만 정렬)
+# 점수 = 평점 + 리뷰 수 + 가까움 + 키워드 일치도 - 최근 방문 페널티 (각 항목 0~1, 가중치는 config)
+# -----------------------------------------------------------------------------
+class RankFeatures:
+    """데이터 버전마다 한 번만 만드는 점수 재료 배열 (집계된 맛집 프레임 행 순서)."""
+
+    def __init__(self, df, geo=None):
+        self.n_rows = len(df)
+        self.rating = df['평점'].to_numpy(dtype=np.float32) / 5.0
+        reviews = df['한줄평'].str.len().fillna(0).to_numpy(dtype=np.float32)
+        self.reviews = np.log1p(reviews) / np.log1p(max(reviews.max(initial=0), 1))
+        self.d_lvl = distance_levels(df, geo)
+        self.closeness = ((3 - self.d_lvl) / 2).astype(np.float32)   # 도보 5분 1.0 / 10분 0.5 / 차량 0.0
+        self.closed = closed_days(df)   # 휴무 요일 비트 (uint8)
+
+@perf.timed()
+def get_rank_features(df, version):
+    return utils.cached_by_version("rank_features", version, lambda: RankFeatures(df, utils.get_geo_index(df, version)))
+
+@perf.timed()
+def rank(df, features, mask, kw_index=None, menus=(), vibes=(), visit_days=None, k=None, weights=None):
+    """mask로 걸러진 후보 중 점수 상위 k개를 점수순 프레임으로 돌려준다 ('추천점수' 컬럼 추가)."""
+    w = weights or cfg.RANK_WEIGHTS
+    k = k or cfg.RANK_TOP_K
+    idx = np.flatnonzero(mask)
+
+    score = (w["rating"] * features.rating[idx]
+             + w["reviews"] * features.reviews[idx]
+             + w["distance"] * features.closeness[idx])
+
+    # 키워드 일치도: 고른 키워드 중 몇 개가 맞았는지 (역색인 행 배열로 카운트)
+    n_keywords = len(menus) + len(vibes)
+    if kw_index is not None and n_keywords:
+        hits = np.zeros(features.n_rows, dtype=np.float32)
+        for column, keywords in (('메뉴키워드', menus), ('분위기키워드', vibes)):
+            for kw in keywords:
+                hits += kw_index.mask(column, [kw])
+        score += w["keyword"] * hits[idx] / n_keywords
+
+    # 최근에 갔을수록 큰 페널티 (RECENCY_WINDOW_DAYS 지나면 0)
+    if visit_days is not None:
+        penalty = np.clip(1 - visit_days[idx] / cfg.RECENCY_WINDOW_DAYS, 0, 1)
+        score -= w["recency"] * penalty
+
+    if len(idx) > k:
+        top = np.argpartition(-score, k - 1)[:k]
+        order = top[np.argsort(-score[top], kind="stable")]
+    else:
+        order = np.argsort(-score, kind="stable")
+
+    ranked = df.iloc[idx[order]].copy()
+    ranked['추천점수'] = np.round(score[order], 3)
+    return ranked
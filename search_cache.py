@@ -0,0 +1,45 @@
+# search_cache.py
+# 웹 검색(DuckDuckGo) 결과 캐시
+# - 키: 정규화된 검색어 + 시간 구간(날씨는 1시간 단위)
+# - 프로세스 공용 저장소, 크기 제한(LRU)
+import re
+import time
+import unicodedata
+
+import config as cfg
+from ttl_cache import TTLCache
+
+_store = TTLCache(maxsize=cfg.SEARCH_CACHE_MAXSIZE, ttl=cfg.SEARCH_CACHE_BUCKET)
+_SPACES = re.compile(r"\s+")
+_PUNCT = re.compile(r"[?!.,~]+")
+
+def normalize_query(query):
+    text = unicodedata.normalize("NFKC", str(query)).casefold()
+    text = _PUNCT.sub(" ", text)
+    return _SPACES.sub(" ", text).strip()
+
+def bucket_seconds(normalized):
+    # 날씨처럼 자주 바뀌는 정보는 짧은 구간으로 나눈다
+    if any(k in normalized for k in cfg.SEARCH_WEATHER_KEYWORDS):
+        return cfg.SEARCH_CACHE_WEATHER_BUCKET
+    return cfg.SEARCH_CACHE_BUCKET
+
+def cached_search(backend, query, now=None):
+    """backend(query) 결과를 캐시한다. 같은 시간 구간 안의 같은 검색어는 다시 호출하지 않는다."""
+    normalized = normalize_query(query)
+    bucket = bucket_seconds(normalized)
+    now = time.time() if now is None else now
+    key = (normalized, int(now // bucket))
+
+    result = _store.get(key)
+    if result is None:
+        result = backend(query)   # 실패(예외)는 캐시하지 않는다
+        # 구간이 끝나는 시점까지만 보관
+        _store.set(key, result, ttl=bucket - now % bucket)
+    return result
+
+def make_cached_run(backend):
+    return lambda query: cached_search(backend, query)
+
+def get_stats():
+    return _store.stats()
@@ -0,0 +1,330 @@
+# storage.py
+# 저장소 백엔드: 구글 시트 / 로컬 SQLite 중 cfg.STORAGE_BACKEND 로 선택
+# utils는 시트 번호(cfg.WORKSHEET_NAME_LIST / _HISTORY)로만 호출하고, 실제 저장 방식은 여기서 정한다.
+# 행 위치(position)는 읽어온 프레임의 행 순서(0부터)와 같다.
+# 실행: python -m storage migrate gsheets sqlite [--sqlite-path lunch.db]  (한 번에 전체 복사)
+import argparse
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+
+import pandas as pd
+import streamlit as st
+
+import config as cfg
+
+SCHEMAS = {
+    cfg.WORKSHEET_NAME_LIST: cfg.COLUMNS,
+    cfg.WORKSHEET_NAME_HISTORY: cfg.COLUMNS_HISTORY,
+}
+
+def _to_cell(value):
+    if value is None or (isinstance(value, float) and pd.isna(value)): return ""
+    if isinstance(value, (int, float)): return value
+    return str(value)
+
+def _delete_ranges(positions):
+    # 연속된 위치를 (start, end) 구간으로 묶는다
+    ranges = []
+    for p in sorted(positions):
+        if ranges and ranges[-1][1] == p:
+            ranges[-1][1] = p + 1
+        else:
+            ranges.append([p, p + 1])
+    return ranges
+
+class StorageBackend(ABC):
+    """백엔드가 구현하는 연산. rows는 {컬럼: 값} dict 목록."""
+
+    @abstractmethod
+    def read(self, worksheet): ...
+    @abstractmethod
+    def replace(self, worksheet, df): ...             # 전체 덮어쓰기
+    @abstractmethod
+    def append(self, worksheet, rows): ...
+    @abstractmethod
+    def upsert(self, worksheet, key, row): ...        # key 컬럼 값이 같은 행 갱신, 없으면 추가
+    @abstractmethod
+    def delete_rows(self, worksheet, positions): ...
+    @abstractmethod
+    def apply_delta(self, worksheet, edited, added, deleted):
+        """edited: {위치: {컬럼: 값}}, added: rows, deleted: 위치 집합. 바뀐 칸/행 수를 돌려준다."""
+
+# -----------------------------------------------------------------------------
+# 구글 시트 (st-gsheets-connection + gspread)
+# 시트 행 번호 = 프레임 위치 + 2 (1행은 헤더)
+# -----------------------------------------------------------------------------
+def _col_letter(n):
+    letters = ""
+    while n > 0:
+        n, rem = divmod(n - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+class GSheetsBackend(StorageBackend):
+    def __init__(self, url=None):
+        self.url = url or cfg.SHEET_URL
+        self._headers = {}   # worksheet -> 시트 1행(헤더) 컬럼 순서 (프로세스당 1회 조회)
+
+    def _conn(self):
+        from streamlit_gsheets import GSheetsConnection
+        return st.connection("gsheets", type=GSheetsConnection)
+
+    def _worksheet(self, worksheet):
+        return self._conn().client._select_worksheet(spreadsheet=self.url, worksheet=worksheet)
+
+    def _header(self, ws, worksheet):
+        header = self._headers.get(worksheet)
+        if header is None:
+            header = ws.row_values(1)
+            if not header:
+                # 빈 시트면 헤더부터 기록
+                header = list(SCHEMAS[worksheet])
+                ws.append_rows([header], value_input_option="USER_ENTERED")
+            missing = [c for c in SCHEMAS[worksheet] if c not in header]
+            if missing:
+                # 나중에 추가된 컬럼(cfg.COLUMNS_ADDED)은 헤더 오른쪽에 덧붙인다
+                ws.batch_update([{"range": f"{_col_letter(len(header) + i + 1)}1", "values": [[c]]}
+                                 for i, c in enumerate(missing)], value_input_option="USER_ENTERED")
+                header = header + missing
+            self._headers[worksheet] = header
+        return header
+
+    def read(self, worksheet):
+        # 캐시는 utils에서 직접 관리하므로 커넥션 캐시는 끈다 (ttl=0)
+        return self._conn().read(spreadsheet=self.url, worksheet=worksheet, ttl=0)
+
+    def replace(self, worksheet, df):
+        try:
+            self._conn().update(spreadsheet=self.url, worksheet=worksheet, data=df)
+        finally:
+            self._headers.pop(worksheet, None)
+
+    def append(self, worksheet, rows, ws=None):
+        ws = ws or self._worksheet(worksheet)
+        header = self._header(ws, worksheet)
+        values = [[_to_cell(row.get(c, "")) for c in header] for row in rows]
+        ws.append_rows(values, value_input_option="USER_ENTERED")
+
+    def upsert(self, worksheet, key, row):
+        # 시트는 키 색인이 없으므로 키 컬럼을 읽어서 위치를 찾는다
+        df = self.read(worksheet)
+        positions = [] if df.empty else [int(p) for p in (df[key].astype(str) == str(row[key])).to_numpy().nonzero()[0]]
+        if not positions:
+            self.append(worksheet, [row])
+            return 0
+        changes = {c: v for c, v in row.items() if c != key}
+        return self.apply_delta(worksheet, {p: changes for p in positions}, [], set())
+
+    def delete_rows(self, worksheet, positions, ws=None):
+        ws = ws or self._worksheet(worksheet)
+        # 아래쪽 구간부터 지워야 위쪽 행 번호가 밀리지 않는다
+        requests = [
+            {"deleteDimension": {"range": {
+                "sheetId": ws.id, "dimension": "ROWS",
+                "startIndex": start + 1, "endIndex": end + 1,
+            }}}
+            for start, end in reversed(_delete_ranges(positions))
+        ]
+        ws.spreadsheet.batch_update({"requests": requests})
+
+    def apply_delta(self, worksheet, edited, added, deleted):
+        ws = self._worksheet(worksheet)
+        header = self._header(ws, worksheet)
+        col_pos = {c: i + 1 for i, c in enumerate(header)}
+
+        updates = []
+        for pos, changes in edited.items():
+            if pos in deleted: continue
+            for col, value in changes.items():
+                if col not in col_pos: continue
+                updates.append({"range": f"{_col_letter(col_pos[col])}{pos + 2}", "values": [[_to_cell(value)]]})
+        if updates:
+            ws.batch_update(updates, value_input_option="USER_ENTERED")
+        if added:
+            self.append(worksheet, added, ws=ws)
+        if deleted:
+            self.delete_rows(worksheet, deleted, ws=ws)
+        return len(updates) + len(added) + len(deleted)
+
+# -----------------------------------------------------------------------------
+# 로컬 SQLite: 시트마다 테이블 하나, 행 순서 = rowid 순서
+# 식당명/날짜 색인으로 키 조회와 날짜 범위 조회가 빠르다
+# -----------------------------------------------------------------------------
+SQLITE_TABLES = {
+    cfg.WORKSHEET_NAME_LIST: "restaurants",
+    cfg.WORKSHEET_NAME_HISTORY: "history",
+}
+SQLITE_INDEXES = {
+    "restaurants": ["식당명"],
+    "history": ["날짜", "식당명"],
+}
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+# OFFSET 조회는 건너뛰는 행마다 비용이 든다 (행당 rowid를 파이썬으로 읽어오는 것의 약 1/30).
+# 건너뛸 행 수의 합이 "마지막 위치까지 rowid 한 번 읽기"의 이 배수를 넘으면 한 번 읽기로 바꾼다
+_OFFSET_WALK_RATIO = 16
+
+class SQLiteBackend(StorageBackend):
+    def __init__(self, path=None):
+        self.path = path or cfg.SQLITE_PATH
+        self._local = threading.local()   # 스레드(세션)마다 커넥션 하나
+        self._init_lock = threading.Lock()
+        self._ready = False
+
+    def _db(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = self._local.db = sqlite3.connect(self.path, timeout=10)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+        if not self._ready:
+            with self._init_lock:
+                if not self._ready:
+                    self._create_tables(db)
+                    self._ready = True
+        return db
+
+    def _create_tables(self, db):
+        with db:
+            for worksheet, table in SQLITE_TABLES.items():
+                cols = ", ".join(f"{_quote(c)} {'REAL' if c == '평점' and table == 'restaurants' else 'TEXT'}"
+                                 for c in SCHEMAS[worksheet])
+                db.execute(f"CREATE TABLE IF NOT EXISTS {table} ({cols})")
+                # 예전에 만든 테이블이면 나중에 추가된 컬럼을 붙인다
+                existing = {row[1] for row in db.execute(f"PRAGMA table_info({table})")}
+                for c in SCHEMAS[worksheet]:
+                    if c not in existing: db.execute(f"ALTER TABLE {table} ADD COLUMN {_quote(c)} TEXT")
+                for col in SQLITE_INDEXES[table]:
+                    db.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{col} ON {table} ({_quote(col)})")
+
+    def _rowids(self, db, table, positions):
+        # 프레임 위치 -> rowid (범위 밖 위치는 빠짐)
+        # 위치마다 OFFSET으로 찾으면 SQLite가 앞의 p개 행을 건너뛴다 (합계 sum(positions)행).
+        # 그 합이 크면 마지막 위치까지의 rowid를 한 번에 읽는다 (max(positions)+1행)
+        positions = [p for p in positions if p >= 0]
+        if not positions: return {}
+        span = max(positions) + 1
+        if sum(positions) <= _OFFSET_WALK_RATIO * span:
+            found = {p: db.execute(f"SELECT rowid FROM {table} ORDER BY rowid LIMIT 1 OFFSET ?", (p,)).fetchone()
+                     for p in positions}
+            return {p: row[0] for p, row in found.items() if row is not None}
+        rowids = [r[0] for r in db.execute(f"SELECT rowid FROM {table} ORDER BY rowid LIMIT ?", (span,))]
+        return {p: rowids[p] for p in positions if p < len(rowids)}
+
+    def read(self, worksheet):
+        cols = SCHEMAS[worksheet]
+        sql = f"SELECT {', '.join(map(_quote, cols))} FROM {SQLITE_TABLES[worksheet]} ORDER BY rowid"
+        return pd.read_sql_query(sql, self._db())
+
+    def _insert_sql(self, worksheet):
+        cols = SCHEMAS[worksheet]
+        return (f"INSERT INTO {SQLITE_TABLES[worksheet]} ({', '.join(map(_quote, cols))}) "
+                f"VALUES ({', '.join('?' * len(cols))})")
+
+    def _insert(self, db, worksheet, rows):
+        cols = SCHEMAS[worksheet]
+        db.executemany(self._insert_sql(worksheet), ([_to_cell(row.get(c, "")) for c in cols] for row in rows))
+
+    def replace(self, worksheet, df):
+        # 행마다 dict를 만들지 않고 컬럼 단위로 변환한 뒤 튜플로 넣는다
+        frame = df.reindex(columns=SCHEMAS[worksheet]).astype(object)
+        frame = frame.where(frame.notna(), "")
+        db = self._db()
+        with db:
+            db.execute(f"DELETE FROM {SQLITE_TABLES[worksheet]}")
+            db.executemany(self._insert_sql(worksheet), frame.itertuples(index=False, name=None))
+
+    def append(self, worksheet, rows):
+        db = self._db()
+        with db:
+            self._insert(db, worksheet, rows)
+
+    def upsert(self, worksheet, key, row):
+        db, table = self._db(), SQLITE_TABLES[worksheet]
+        changes = {c: _to_cell(v) for c, v in row.items() if c != key and c in SCHEMAS[worksheet]}
+        with db:
+            if changes:
+                assignments = ", ".join(f"{_quote(c)} = ?" for c in changes)
+                cur = db.execute(f"UPDATE {table} SET {assignments} WHERE {_quote(key)} = ?",
+                                 [*changes.values(), str(row[key])])
+                updated = cur.rowcount
+            else:
+                updated = db.execute(f"SELECT COUNT(*) FROM {table} WHERE {_quote(key)} = ?", [str(row[key])]).fetchone()[0]
+            if updated == 0:
+                self._insert(db, worksheet, [row])
+        return updated
+
+    def delete_rows(self, worksheet, positions):
+        db, table = self._db(), SQLITE_TABLES[worksheet]
+        with db:
+            rowids = self._rowids(db, table, positions)
+            db.executemany(f"DELETE FROM {table} WHERE rowid = ?", [(r,) for r in rowids.values()])
+
+    def apply_delta(self, worksheet, edited, added, deleted):
+        db, table = self._db(), SQLITE_TABLES[worksheet]
+        columns = set(SCHEMAS[worksheet])
+        n_changes = 0
+        with db:   # 한 트랜잭션: 중간에 실패하면 아무것도 반영되지 않는다
+            rowid_of = self._rowids(db, table, set(edited) | set(deleted))
+            for pos, changes in edited.items():
+                changes = {c: _to_cell(v) for c, v in changes.items() if c in columns}
+                if pos in deleted or pos not in rowid_of or not changes: continue
+                assignments = ", ".join(f"{_quote(c)} = ?" for c in changes)
+                db.execute(f"UPDATE {table} SET {assignments} WHERE rowid = ?", [*changes.values(), rowid_of[pos]])
+                n_changes += len(changes)
+            if added:
+                self._insert(db, worksheet, added)
+            db.executemany(f"DELETE FROM {table} WHERE rowid = ?",
+                           [(rowid_of[p],) for p in deleted if p in rowid_of])
+        return n_changes + len(added) + len(deleted)
+
+# -----------------------------------------------------------------------------
+# 백엔드 선택 (프로세스당 하나)
+# -----------------------------------------------------------------------------
+BACKENDS = {"gsheets": GSheetsBackend, "sqlite": SQLiteBackend}
+_backend = {"name": None, "value": None}
+_backend_lock = threading.Lock()
+
+def get_backend():
+    with _backend_lock:
+        if _backend["name"] != cfg.STORAGE_BACKEND:
+            _backend["value"] = BACKENDS[cfg.STORAGE_BACKEND]()
+            _backend["name"] = cfg.STORAGE_BACKEND
+        return _backend["value"]
+
+def reset_backend():
+    with _backend_lock:
+        _backend["name"] = _backend["value"] = None
+
+def migrate(source, target):
+    """source 백엔드의 두 시트를 target 백엔드에 그대로 덮어쓴다. {시트: 행 수}를 돌려준다."""
+    copied = {}
+    for worksheet, columns in SCHEMAS.items():
+        df = source.read(worksheet)
+        df = df.reindex(columns=columns).fillna("") if not df.empty else pd.DataFrame(columns=columns)
+        target.replace(worksheet, df)
+        copied[worksheet] = len(df)
+    return copied
+
+def main():
+    parser = argparse.ArgumentParser()
+    sub = parser.add_subparsers(dest="command", required=True)
+    mig = sub.add_parser("migrate", help="한 저장소의 맛집 리스트/식사 기록을 다른 저장소로 전체 복사")
+    mig.add_argument("source", choices=list(BACKENDS))
+    mig.add_argument("target", choices=list(BACKENDS))
+    mig.add_argument("--sqlite-path", default=cfg.SQLITE_PATH)
+    mig.add_argument("--sheet-url", default=cfg.SHEET_URL)
+    args = parser.parse_args()
+
+    if args.source == args.target:
+        parser.error("source와 target이 같습니다.")
+    make = {"gsheets": lambda: GSheetsBackend(args.sheet_url), "sqlite": lambda: SQLiteBackend(args.sqlite_path)}
+    copied = migrate(make[args.source](), make[args.target]())
+    for worksheet, n_rows in copied.items():
+        print(f"{SQLITE_TABLES[worksheet]}: {n_rows}행 복사 ({args.source} -> {args.target})")
+
+if __name__ == "__main__":
+    main()
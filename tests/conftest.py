@@ -0,0 +1,45 @@
+# tests/conftest.py
+# 공용 준비물: 임시 SQLite 저장소 + 합성 데이터, 앱 화면 테스트(AppTest)
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import config as cfg
+import storage
+import utils
+from benchmarks.datagen import make_reviews
+
+APP_PATH = os.path.join(ROOT, "app.py")
+
+@pytest.fixture
+def sheets(tmp_path, monkeypatch):
+    """구글 시트 대신 임시 SQLite 파일 (맛집 200행 + 식사 기록 1행). 쓰기는 바로 저장소로 (저널 X)."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(cfg, "STORAGE_BACKEND", "sqlite")
+    monkeypatch.setattr(cfg, "SQLITE_PATH", str(tmp_path / "lunch.db"))
+    monkeypatch.setattr(cfg, "WRITE_BEHIND", False)
+    storage.reset_backend()
+    utils.invalidate_cache()
+    backend = storage.get_backend()
+    backend.replace(cfg.WORKSHEET_NAME_LIST, make_reviews(200))
+    backend.replace(cfg.WORKSHEET_NAME_HISTORY, pd.DataFrame([{
+        '날짜': '2026-10-01', '식당명': '식당000001', '카테고리': '한식', '메뉴': '국밥',
+        '작성자': '팀원', '평점': '4.0', '비고': ''}]))
+    yield backend
+    storage.reset_backend()
+    utils.invalidate_cache()
+
+@pytest.fixture
+def app(sheets, monkeypatch):
+    """가짜 LLM으로 띄운 앱 (첫 실행까지 마친 상태)."""
+    from streamlit.testing.v1 import AppTest
+    monkeypatch.setattr(cfg, "LLM_BACKEND", "fake")
+    at = AppTest.from_file(APP_PATH, default_timeout=180)
+    at.run()
+    assert not at.exception
+    return at
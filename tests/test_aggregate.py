@@ -0,0 +1,28 @@
+# tests/test_aggregate.py
+# 리뷰 집계 증분 반영: 여러 행을 한 번에 fold 해도 전체 재집계와 같아야 한다
+import pandas as pd
+
+import utils
+from benchmarks.datagen import make_reviews
+
+def test_batch_fold_matches_full_rebuild():
+    df = make_reviews(2000)
+    batch = make_reviews(300, seed=7)
+    # 절반은 처음 보는 식당 (이름순 맨 앞/사이/맨 뒤에 끼어들도록), 절반은 있던 식당
+    fresh = ["가가가식당", "힣힣힣식당"] + [f"식당{i:06d}x" for i in range(148)]
+    batch['식당명'] = [fresh[i // 2] if i % 2 else name for i, name in enumerate(df['식당명'].head(300))]
+    batch.loc[5, '식당명'] = None
+
+    base = utils.ReviewAggregate(df)
+    before = base.frame.copy(deep=True)
+    folded = base.fold(batch)
+
+    expected = utils.ReviewAggregate(pd.concat([df, batch], ignore_index=True))
+    pd.testing.assert_frame_equal(folded.frame, expected.frame)
+    assert (folded.sums == expected.sums).all() and (folded.counts == expected.counts).all()
+    # 원래 집계(캐시된 이전 버전)는 그대로
+    pd.testing.assert_frame_equal(base.frame, before)
+
+def test_fold_of_nothing_keeps_aggregate():
+    base = utils.ReviewAggregate(make_reviews(100))
+    pd.testing.assert_frame_equal(base.fold(make_reviews(10).iloc[:0]).frame, base.frame)
@@ -0,0 +1,31 @@
+# tests/test_ai_tools.py
+# AI 상담소 검색 도구: 추천 탭이 만든 공간 색인/순위 특징을 같은 데이터 버전에서 그대로 쓴다
+import pytest
+
+import ai_tools
+import recommender
+import utils
+from geo_index import GeoIndex
+
+@pytest.fixture
+def listing(sheets):
+    raw, version = utils.load_data(with_version=True)
+    df = utils.get_aggregated_reviews(raw, version)
+    return df, version, utils.get_keyword_index(df, version)
+
+def test_tools_reuse_the_recommend_tab_indexes(listing, monkeypatch):
+    df, version, kw_index = listing
+    features = recommender.get_rank_features(df, version)   # 추천 탭에서 먼저 만든 상태
+
+    def rebuilt(*args, **kwargs): raise AssertionError("같은 버전인데 색인을 다시 만듦")
+    monkeypatch.setattr(GeoIndex, "from_frame", rebuilt)
+    monkeypatch.setattr(recommender, "RankFeatures", rebuilt)
+
+    tools = {t.name: t for t in ai_tools.make_tools(df, kw_index, version)}
+    assert recommender.get_rank_features(df, version) is features
+    assert tools["search_restaurants"].invoke({"mode": "전체", "open_today": False, "limit": 3}).count("\n") == 2
+
+def test_tools_without_version_build_their_own(listing):
+    df, _, kw_index = listing
+    tools = {t.name: t for t in ai_tools.make_tools(df, kw_index)}
+    assert tools["search_restaurants"].invoke({"mode": "전체", "open_today": False, "limit": 3}).count("\n") == 2
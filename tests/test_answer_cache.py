@@ -0,0 +1,48 @@
+# tests/test_answer_cache.py
+# AI 상담소 답변 캐시: 같은 문맥의 같은 질문만 재사용하고, 비슷한 질문은 숫자/부정 표현까지 같아야 재사용
+from datetime import datetime
+
+import pytest
+
+import answer_cache
+import config as cfg
+from ttl_cache import TTLCache
+
+NOW = datetime(2026, 10, 5, 11, 30)
+
+@pytest.fixture(autouse=True)
+def store(monkeypatch):
+    monkeypatch.setattr(answer_cache, "_store", TTLCache(maxsize=cfg.ANSWER_CACHE_MAXSIZE, ttl=cfg.ANSWER_CACHE_TTL))
+    monkeypatch.setattr(answer_cache, "_current_data_key", {"value": 1})   # 데이터 버전 1을 이미 본 상태
+
+def _ask(prompt, version=1):
+    return answer_cache.make_context(version, "최근 기록", "tools", prompt, now=NOW)
+
+def _remember(prompt, answer):
+    answer_cache.store(*_ask(prompt), answer, latency=2.0)
+
+def test_fuzzy_matching_is_off_by_default():
+    assert cfg.ANSWER_CACHE_FUZZY is False
+    _remember("점심 메뉴 추천해줘", "국밥")
+    assert answer_cache.lookup(*_ask("점심 메뉴 추천해줘!")) == ("국밥", "exact")
+    assert answer_cache.lookup(*_ask("점심 메뉴 추천해 줘요")) is None
+
+def test_new_data_version_drops_answers():
+    _remember("점심 메뉴 추천해줘", "국밥")
+    assert answer_cache.lookup(*_ask("점심 메뉴 추천해줘", version=2)) is None
+
+@pytest.mark.parametrize("cached, asked", [
+    ("2명이서 갈만한 곳 추천", "3명이서 갈만한 곳 추천"),
+    ("한식 말고 점심 추천해줘", "한식 점심 추천해줘"),
+    ("매운 거 빼고 점심 추천해줘", "매운 거 점심 추천해줘"),
+])
+def test_fuzzy_match_keeps_numbers_and_negations(monkeypatch, cached, asked):
+    monkeypatch.setattr(cfg, "ANSWER_CACHE_FUZZY", True)
+    monkeypatch.setattr(cfg, "ANSWER_CACHE_SIMILARITY", 0.5)
+    _remember(cached, "저장된 답변")
+    assert answer_cache.lookup(*_ask(asked)) is None
+
+def test_fuzzy_match_reuses_reworded_question(monkeypatch):
+    monkeypatch.setattr(cfg, "ANSWER_CACHE_FUZZY", True)
+    _remember("2명이서 갈만한 곳 추천해줘", "저장된 답변")
+    assert answer_cache.lookup(*_ask("2명이서 갈만한 곳 추천해 줘요")) == ("저장된 답변", "near")
@@ -0,0 +1,74 @@
+# tests/test_journal.py
+# 쓰기 지연 저널: 계속 실패하는 작업은 보류 파일로 옮기고 뒤 작업은 계속 쓴다
+import json
+import time
+
+import pytest
+
+import config as cfg
+import journal
+
+class FakeBackend:
+    """append만 기록. rows에 '권한없음' 값이 있거나 fail_times번까지는 실패한다."""
+
+    def __init__(self, fail_times=0):
+        self.rows = []
+        self.fail_times = fail_times
+        self.calls = 0
+
+    def append(self, worksheet, rows):
+        self.calls += 1
+        if self.calls <= self.fail_times: raise ConnectionError("일시적인 오류")
+        if any(r.get("식당명") == "권한없음" for r in rows): raise PermissionError("시트 쓰기 권한 없음")
+        self.rows.extend(rows)
+
+@pytest.fixture(autouse=True)
+def fast_retry(monkeypatch):
+    monkeypatch.setattr(cfg, "JOURNAL_RETRY_BASE", 0.0)
+    monkeypatch.setattr(cfg, "JOURNAL_MAX_ATTEMPTS", 3)
+
+def make_journal(tmp_path, backend, raced=None):
+    return journal.Journal(str(tmp_path / "journal.jsonl"), lambda: backend,
+                           on_race=(raced.append if raced is not None else None))
+
+def flush_all(j, limit=20):
+    for _ in range(limit):
+        if j.flush() == 0: return
+        time.sleep(0.01)
+    raise AssertionError(f"남은 작업 {j.stats()['depth']}건")
+
+def test_poison_entry_is_dead_lettered_and_later_writes_continue(tmp_path):
+    backend, raced = FakeBackend(), []
+    j = make_journal(tmp_path, backend, raced)
+    j.submit(0, "upsert", key="식당명", row={"식당명": "권한없음"})   # FakeBackend에 없는 연산도 실패로 처리
+    j.submit(0, "append", rows=[{"식당명": "권한없음"}])
+    flush_all(j)
+    j.submit(0, "append", rows=[{"식당명": "국밥집"}])
+    flush_all(j)
+
+    assert backend.rows == [{"식당명": "국밥집"}]
+    stats = j.stats()
+    assert stats["dead"] == 2 and stats["depth"] == 0
+    assert "PermissionError" in stats["last_dead_error"]
+    dead = [json.loads(line) for line in open(j.dead_letter_path, encoding="utf-8")]
+    assert [d["op"] for d in dead] == ["upsert", "append"]
+    assert dead[1]["data"]["rows"] == [{"식당명": "권한없음"}] and "권한 없음" in dead[1]["error"]
+    assert 0 in raced   # 캐시가 보류된 작업을 빼고 다시 읽도록
+
+def test_transient_failure_is_retried_not_dead_lettered(tmp_path):
+    backend = FakeBackend(fail_times=cfg.JOURNAL_MAX_ATTEMPTS - 1)
+    j = make_journal(tmp_path, backend)
+    j.submit(0, "append", rows=[{"식당명": "국밥집"}])
+    flush_all(j)
+    assert backend.rows == [{"식당명": "국밥집"}]
+    assert j.stats()["dead"] == 0 and j.stats()["failed"] == cfg.JOURNAL_MAX_ATTEMPTS - 1
+
+def test_dead_letters_are_reported_after_restart_and_not_replayed(tmp_path):
+    backend = FakeBackend()
+    j = make_journal(tmp_path, backend)
+    j.submit(0, "append", rows=[{"식당명": "권한없음"}])
+    flush_all(j)
+
+    restarted = make_journal(tmp_path, backend)
+    assert restarted.stats()["depth"] == 0
+    assert restarted.stats()["dead"] == 1 and "PermissionError" in restarted.stats()["last_dead_error"]
@@ -0,0 +1,20 @@
+# tests/test_list_schema.py
+# 맛집 리스트 타입 스키마: 읽을 때 바꾼 타입이 다시 저장할 때 시트 값을 바꾸면 안 된다
+import config as cfg
+import utils
+from benchmarks.datagen import make_reviews
+
+LIST = cfg.WORKSHEET_NAME_LIST
+
+def test_rating_survives_load_save_load(sheets):
+    df = make_reviews(20)
+    df['평점'] = 4.2
+    sheets.replace(LIST, df)
+    utils.invalidate_cache()
+
+    loaded = utils.load_data()
+    assert (loaded['평점'] == 4.2).all()
+    utils.save_data(loaded)
+
+    assert set(sheets.read(LIST)['평점'].astype(str)) == {"4.2"}
+    assert (utils.load_data()['평점'] == 4.2).all()
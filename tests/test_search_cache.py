@@ -0,0 +1,101 @@
+# tests/test_search_cache.py
+# 웹 검색 캐시: 같은 질의는 한 번만 검색한다. 실제 DuckDuckGo 대신 호출 횟수를 세는 가짜 검색
+import pytest
+
+import config as cfg
+import search_cache
+import ttl_cache
+from ttl_cache import TTLCache
+
+HOUR = 3600
+DAY_START = 1_800_000_000 - 1_800_000_000 % (6 * HOUR)   # 일반/날씨 구간이 모두 시작되는 시각
+
+class FakeSearch:
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, query):
+        self.queries.append(query)
+        return f"결과 {len(self.queries)}: {query}"
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(ttl_cache.time, "monotonic", clock)
+    return clock
+
+@pytest.fixture
+def store(monkeypatch, clock):
+    store = TTLCache(maxsize=cfg.SEARCH_CACHE_MAXSIZE, ttl=cfg.SEARCH_CACHE_BUCKET)
+    monkeypatch.setattr(search_cache, "_store", store)
+    return store
+
+def test_normalized_queries_share_one_search(store):
+    search = FakeSearch()
+    first = search_cache.cached_search(search, "강남역 맛집?", now=DAY_START)
+    for query in ["강남역  맛집", " 강남역 맛집!! ", "강남역 맛집"]:
+        assert search_cache.cached_search(search, query, now=DAY_START + 60) == first
+    assert search.queries == ["강남역 맛집?"]
+    assert store.stats()["hit"] == 3
+
+def test_normalize_query():
+    assert search_cache.normalize_query("  오늘  날씨 어때?? ") == "오늘 날씨 어때"
+    assert search_cache.normalize_query("ＷＥＡＴＨＥＲ Seoul") == "weather seoul"
+
+def test_weather_uses_shorter_bucket(store):
+    search = FakeSearch()
+    for t in (DAY_START, DAY_START + HOUR - 1, DAY_START + HOUR):
+        search_cache.cached_search(search, "서울 날씨", now=t)
+        search_cache.cached_search(search, "서울 맛집", now=t)
+    # 날씨는 1시간 구간이 바뀌면 다시 검색, 일반 검색은 6시간 구간 안이라 한 번만
+    assert search.queries.count("서울 날씨") == 2
+    assert search.queries.count("서울 맛집") == 1
+
+def test_entry_expires_at_end_of_bucket(store, clock):
+    search = FakeSearch()
+    now = DAY_START + HOUR - 10          # 날씨 구간 끝나기 10초 전
+    search_cache.cached_search(search, "서울 날씨", now=now)
+    clock.now += 9
+    search_cache.cached_search(search, "서울 날씨", now=now + 9)
+    assert len(search.queries) == 1
+    # 구간이 끝나면 같은 키로 조회해도 만료 (오래된 날씨를 내놓지 않는다)
+    clock.now += 2
+    assert store.get(("서울 날씨", int(now // HOUR))) is None
+    assert len(store) == 0
+
+def test_least_recently_used_is_evicted(monkeypatch, clock):
+    store = TTLCache(maxsize=2, ttl=cfg.SEARCH_CACHE_BUCKET)
+    monkeypatch.setattr(search_cache, "_store", store)
+    search = FakeSearch()
+    for query in ["국밥", "파스타", "국밥", "초밥"]:   # 국밥을 다시 써서 파스타가 가장 오래 안 쓴 항목
+        search_cache.cached_search(search, query, now=DAY_START)
+    assert store.stats()["evict"] == 1
+    search_cache.cached_search(search, "국밥", now=DAY_START)
+    search_cache.cached_search(search, "파스타", now=DAY_START)
+    assert search.queries == ["국밥", "파스타", "초밥", "파스타"]
+
+def test_cache_is_shared_across_callers(store):
+    # 세션/에이전트마다 감싼 검색 도구가 달라도 같은 저장소를 쓴다
+    search = FakeSearch()
+    run_a, run_b = search_cache.make_cached_run(search), search_cache.make_cached_run(search)
+    assert run_a("역삼 점심 추천") == run_b("역삼 점심 추천!")
+    assert len(search.queries) == 1
+    assert search_cache.get_stats()["size"] == 1
+
+def test_failed_search_is_not_cached(store):
+    calls = []
+    def flaky(query):
+        calls.append(query)
+        if len(calls) == 1: raise TimeoutError("검색 실패")
+        return "결과"
+    with pytest.raises(TimeoutError):
+        search_cache.cached_search(flaky, "서울 날씨", now=DAY_START)
+    assert search_cache.cached_search(flaky, "서울 날씨", now=DAY_START) == "결과"
+    assert len(calls) == 2
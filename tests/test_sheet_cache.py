@@ -0,0 +1,27 @@
+# tests/test_sheet_cache.py
+# 시트 캐시: 행 추가는 캐시에 바로 반영되고, TTL 뒤 다시 읽어도 내용이 같으면 버전이 그대로다
+import config as cfg
+import utils
+from benchmarks.datagen import make_reviews
+
+LIST = cfg.WORKSHEET_NAME_LIST
+
+def _expire(worksheet):
+    utils._sheet_cache[worksheet]["loaded_at"] -= cfg.CACHE_TTL + 1
+
+def test_append_updates_fingerprint_like_a_full_read(sheets):
+    _, version = utils.load_data(with_version=True)
+    rows = make_reviews(3, seed=7).to_dict("records")
+    assert utils.add_data_rows(rows)
+
+    df, appended_version = utils.load_data(with_version=True)
+    assert appended_version == version + 1
+    assert len(df) == 203
+    entry = utils._sheet_cache[LIST]
+    assert entry["fingerprint"] == utils._fingerprint(entry["df"])
+
+    # 저장소에서 다시 읽어도 같은 내용이면 파생 캐시를 그대로 쓴다
+    _expire(LIST)
+    df_again, reread_version = utils.load_data(with_version=True)
+    assert reread_version == appended_version
+    assert df_again.equals(df)
@@ -0,0 +1,43 @@
+# tests/test_storage.py
+# SQLite 백엔드: 수정·삭제는 rowid가 아니라 화면의 행 위치를 기준으로 반영된다
+import pytest
+
+import config as cfg
+import storage
+from benchmarks.datagen import make_reviews
+
+LIST = cfg.WORKSHEET_NAME_LIST
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = storage.SQLiteBackend(str(tmp_path / "lunch.db"))
+    backend.replace(LIST, make_reviews(120))
+    # 앞쪽 행을 지워 rowid와 위치가 어긋나게 만든다
+    backend.delete_rows(LIST, [0, 5, 6, 7])
+    return backend
+
+# 끝쪽 몇 칸은 위치별 OFFSET 조회, 많으면 rowid 한 번 읽기로 찾는다
+@pytest.mark.parametrize("n_edits", [3, storage._OFFSET_WALK_RATIO + 10])
+def test_delta_hits_rows_by_position(backend, n_edits):
+    before = backend.read(LIST)
+    positions = list(range(len(before) - 1, len(before) - 1 - 2 * n_edits, -2))   # 끝쪽부터 한 칸 건너
+    edited = {p: {'한줄평': f"수정 {p}"} for p in positions}
+    backend.apply_delta(LIST, edited, added=[], deleted=[1, 2])
+
+    after = backend.read(LIST)
+    expected = before.copy()
+    for p in positions: expected.loc[p, '한줄평'] = f"수정 {p}"
+    expected = expected.drop(index=[1, 2]).reset_index(drop=True)
+    assert after.equals(expected)
+
+def test_out_of_range_positions_are_ignored(backend):
+    n = len(backend.read(LIST))
+    backend.apply_delta(LIST, {n + 5: {'한줄평': "없는 행"}}, added=[], deleted=[n + 1])
+    assert len(backend.read(LIST)) == n
+    assert "없는 행" not in backend.read(LIST)['한줄평'].tolist()
+
+def test_backends_must_implement_every_operation():
+    class Partial(storage.StorageBackend):
+        def read(self, worksheet): return None
+    with pytest.raises(TypeError):
+        Partial()
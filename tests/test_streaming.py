@@ -0,0 +1,81 @@
+# tests/test_streaming.py
+# AI 상담소 답변 스트리밍: 가짜 스트리밍 모델로 토큰이 도착하는 대로 화면에 붙는지 오프라인 확인
+import itertools
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+import config as cfg
+import llm_agent
+
+REPLY = "오늘은 가까운 국밥집 어떠세요?"
+
+class FakeBox:
+    """st.empty() 대신 그려진 내용을 기록한다. fail_after번째 그리기에서 예외 (중단 버튼 rerun 흉내)."""
+
+    def __init__(self, fail_after=None):
+        self.drawn = []
+        self.fail_after = fail_after
+
+    def markdown(self, text):
+        if self.fail_after is not None and len(self.drawn) >= self.fail_after:
+            raise RuntimeError("rerun requested")
+        self.drawn.append(text)
+
+def fake_llm():
+    return GenericFakeChatModel(messages=itertools.cycle([AIMessage(content=REPLY)]))
+
+def test_tokens_are_drawn_as_they_arrive():
+    box, updates = FakeBox(), []
+    handler = llm_agent.StreamHandler(box, on_update=updates.append)
+    chunks = list(fake_llm().stream("점심 추천", config={"callbacks": [handler]}))
+
+    assert len(chunks) > 1
+    assert len(box.drawn) == len(updates) > 1
+    # 받은 만큼씩 늘어나고, 마지막에는 전체 답변 + 커서
+    assert all(b.startswith(a[:-1]) for a, b in zip(box.drawn, box.drawn[1:]))
+    assert box.drawn[-1] == REPLY + "▌"
+    assert updates[-1] == REPLY
+
+def test_new_model_call_starts_a_fresh_bubble():
+    box = FakeBox()
+    handler = llm_agent.StreamHandler(box)
+    llm = fake_llm()
+    list(llm.stream("첫 질문", config={"callbacks": [handler]}))
+    list(llm.stream("도구 호출 후", config={"callbacks": [handler]}))
+    assert handler.text == REPLY
+
+def test_cancel_stops_generation_and_keeps_partial_answer():
+    # 중단 버튼을 누르면 다음 st 호출에서 예외가 나고, 핸들러가 이를 전파해 생성이 멈춘다
+    box, updates = FakeBox(fail_after=3), []
+    handler = llm_agent.StreamHandler(box, on_update=updates.append)
+    with pytest.raises(RuntimeError, match="rerun requested"):
+        list(fake_llm().stream("점심 추천", config={"callbacks": [handler]}))
+    assert len(box.drawn) == 3
+    assert updates[-1] == box.drawn[-1][:-1]
+    assert 0 < len(updates[-1]) < len(REPLY)
+
+def test_answer_streams_into_chat_bubble(app):
+    app.sidebar.radio[0].set_value("💬 AI 상담소 (New)").run()
+    app.chat_input[0].set_value("오늘 뭐 먹지?").run()
+
+    assert not app.exception and not app.error
+    assistant = [m for m in app.chat_message if m.name == "assistant"]
+    assert assistant[-1].markdown[0].value == cfg.FAKE_LLM_REPLY
+    # 답변이 끝나면 중단 버튼은 사라지고, 기록에 남는다
+    assert not [b for b in app.button if b.key == "btn_stop_answer"]
+    assert app.session_state["ai_pending"] is None
+    assert app.session_state["messages"][-1] == {"role": "assistant", "content": cfg.FAKE_LLM_REPLY}
+
+def test_cancelled_answer_is_kept_as_partial(app):
+    app.sidebar.radio[0].set_value("💬 AI 상담소 (New)").run()
+    # 중단 버튼으로 rerun 되면 직전 실행이 받은 데까지가 ai_pending에 남아 있다
+    app.session_state["ai_pending"] = "오늘은 가까운"
+    app.run()
+
+    assert not app.exception
+    last = app.session_state["messages"][-1]
+    assert last["role"] == "assistant"
+    assert last["content"].startswith("오늘은 가까운") and "답변이 중단되었습니다" in last["content"]
+    assert app.session_state["ai_pending"] is None
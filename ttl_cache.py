@@ -0,0 +1,54 @@
+# ttl_cache.py
+# 프로세스 공용 메모리 캐시: 항목별 만료 시간(TTL) + 크기 제한(LRU 축출)
+import threading
+import time
+from collections import OrderedDict
+
+class TTLCache:
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()   # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._stats = {"hit": 0, "miss": 0, "evict": 0}
+
+    def get(self, key, default=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None: del self._data[key]
+                self._stats["miss"] += 1
+                return default
+            self._data.move_to_end(key)
+            self._stats["hit"] += 1
+            return entry[1]
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._stats["evict"] += 1
+
+    def items(self):
+        # 만료되지 않은 항목 (오래 사용하지 않은 것부터)
+        now = time.monotonic()
+        with self._lock:
+            return [(k, v) for k, (exp, v) in self._data.items() if exp > now]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats, size=len(self._data), maxsize=self.maxsize)
+        total = stats["hit"] + stats["miss"]
+        stats["hit_rate"] = stats["hit"] / total if total else 0.0
+        return stats
@@ -1,37 +1,317 @@
 # utils.py
 import streamlit as st
 import pandas as pd
+import numpy as np
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 from datetime import datetime
-from streamlit_gsheets import GSheetsConnection
 import config as cfg  # config.py 임포트
+import perf
+import storage
+import journal
+from keyword_index import KeywordIndex, normalize_token
+from geo_index import GeoIndex
+from name_index import NameIndex
+from visit_index import VisitIndex
 
-def load_data():
+# -----------------------------------------------------------------------------
+# 데이터 캐시 (프로세스 공용: 모든 세션이 같은 캐시를 공유)
+# - 키: 워크시트 + 데이터 버전
+# - 저장(save_data / save_history / add_history_row) 시 즉시 무효화
+# -----------------------------------------------------------------------------
+_cache_lock = threading.Lock()
+_sheet_locks = {}      # worksheet -> Lock (같은 시트를 동시에 두 번 읽지 않도록)
+_sheet_cache = {}      # worksheet -> {"version", "loaded_at", "fingerprint", "df"}
+_data_versions = {}    # worksheet -> int
+_cache_stats = {"hit": 0, "miss": 0, "invalidate": 0}
+
+def _get_sheet_lock(worksheet):
+    with _cache_lock:
+        return _sheet_locks.setdefault(worksheet, threading.Lock())
+
+def _fingerprint(df):
+    # 행 해시의 합(2^64 나머지)이라 행을 뒤에 붙일 때는 새 행 해시만 더하면 된다
+    if df.empty: return 0
+    return int(pd.util.hash_pandas_object(df, index=False).sum())
+
+def _extend_fingerprint(fingerprint, appended_df):
+    return (fingerprint + _fingerprint(appended_df)) % 2**64
+
+def _cached_read(worksheet, loader):
+    with _get_sheet_lock(worksheet):
+        entry = _sheet_cache.get(worksheet)
+        if entry is not None and time.monotonic() - entry["loaded_at"] < cfg.CACHE_TTL:
+            with _cache_lock: _cache_stats["hit"] += 1
+            return entry["df"].copy(), entry["version"]
+
+        with _cache_lock: _cache_stats["miss"] += 1
+        df = loader()
+        fingerprint = _fingerprint(df)
+        with _cache_lock:
+            # TTL 만료 후 다시 읽었는데 내용이 같으면 버전을 유지 (파생 캐시 재사용)
+            if entry is not None and entry["fingerprint"] != fingerprint:
+                _data_versions[worksheet] = _data_versions.get(worksheet, 0) + 1
+            _sheet_cache[worksheet] = {
+                "version": _data_versions.get(worksheet, 0),
+                "loaded_at": time.monotonic(),
+                "fingerprint": fingerprint,
+                "df": df,
+            }
+            version = _sheet_cache[worksheet]["version"]
+        return df.copy(), version
+
+def invalidate_cache(worksheet=None):
+    with _cache_lock:
+        targets = [worksheet] if worksheet is not None else list(_sheet_cache) + list(_data_versions)
+        for ws in set(targets):
+            _sheet_cache.pop(ws, None)
+            _data_versions[ws] = _data_versions.get(ws, 0) + 1
+        _cache_stats["invalidate"] += 1
+
+def get_data_version(worksheet):
+    with _cache_lock:
+        return _data_versions.get(worksheet, 0)
+
+# [신규] 데이터 버전별 파생 데이터 캐시 (인덱스 등). 이름마다 최신 버전 하나만 유지
+_derived_cache = {}    # name -> (version, value)
+
+def cached_by_version(name, version, builder):
+    with _cache_lock:
+        entry = _derived_cache.get(name)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    value = builder()
+    with _cache_lock:
+        _derived_cache[name] = (version, value)
+    return value
+
+def get_cache_stats():
+    with _cache_lock:
+        stats = dict(_cache_stats)
+    total = stats["hit"] + stats["miss"]
+    stats["hit_rate"] = stats["hit"] / total if total else 0.0
+    return stats
+
+@perf.timed()
+def _read_worksheet(worksheet):
+    # 실제 저장소(구글 시트 / SQLite)는 cfg.STORAGE_BACKEND 로 선택 (storage.py)
+    df = storage.get_backend().read(worksheet)
+    # 아직 저장소에 안 쓴 저널 작업을 덮어씌워 방금 저장한 내용이 바로 보이게 한다
+    if cfg.WRITE_BEHIND: df = get_journal().overlay(worksheet, df)
+    return df
+
+# -----------------------------------------------------------------------------
+# [신규] 쓰기 지연 저장 (cfg.WRITE_BEHIND): 로컬 저널에 기록하고 바로 돌아감,
+# 실제 저장소 쓰기는 백그라운드 스레드가 묶어서 재시도와 함께 처리 (journal.py)
+# -----------------------------------------------------------------------------
+_journal = {"value": None}
+_journal_lock = threading.Lock()
+
+def get_journal():
+    with _journal_lock:
+        if _journal["value"] is None:
+            _journal["value"] = journal.Journal(cfg.JOURNAL_PATH, storage.get_backend, on_race=invalidate_cache,
+                                               dead_letter_path=cfg.JOURNAL_DEAD_LETTER_PATH)
+        return _journal["value"]
+
+def get_journal_stats():
+    return get_journal().stats() if cfg.WRITE_BEHIND else None
+
+def _write(worksheet, op, **data):
+    # 저널 모드면 기록만 하고, 아니면 저장소에 바로 쓴다 (실패 시 예외)
+    if cfg.WRITE_BEHIND:
+        get_journal().submit(worksheet, op, **data)
+    else:
+        journal.apply_op(storage.get_backend(), worksheet, op, data)
+
+def _replace(worksheet, df):
+    # 전체 덮어쓰기: 저널에는 컬럼 + 값 목록으로 (행마다 dict를 만들면 느림), 바로 쓸 때는 프레임 그대로
+    if cfg.WRITE_BEHIND:
+        get_journal().submit(worksheet, "replace", columns=list(df.columns), values=df.to_numpy().tolist())
+    else:
+        storage.get_backend().replace(worksheet, df)
+
+# -----------------------------------------------------------------------------
+# 행 추가 전용 쓰기 (append) + 짧은 시간 내 클릭 묶어서 한 번에 쓰기
+# -----------------------------------------------------------------------------
+@perf.timed()
+def _append_rows(worksheet, rows):
+    _write(worksheet, "append", rows=rows)
+
+class _AppendBatcher:
+    """window초 안에 들어온 행들을 모아 append 한 번으로 기록한다.
+
+    처음 들어온 요청이 대표로 기다렸다가 쓰고, 나머지는 결과만 기다린다.
+    """
+
+    def __init__(self, worksheet, window):
+        self.worksheet = worksheet
+        self.window = window
+        self._lock = threading.Lock()
+        self._batch = None
+
+    def submit(self, rows):
+        if cfg.WRITE_BEHIND:
+            # 저널이 백그라운드에서 묶어 쓰므로 기다릴 필요 없음
+            _append_rows(self.worksheet, rows)
+            _apply_appended(self.worksheet, rows)
+            return True
+        with self._lock:
+            batch = self._batch
+            is_leader = batch is None
+            if is_leader:
+                batch = self._batch = {"rows": [], "error": None, "done": threading.Event()}
+            batch["rows"].extend(rows)
+
+        if is_leader:
+            if self.window > 0: time.sleep(self.window)
+            with self._lock:
+                self._batch = None
+            try:
+                _append_rows(self.worksheet, batch["rows"])
+            except Exception as e:
+                batch["error"] = e
+                invalidate_cache(self.worksheet)
+            else:
+                _apply_appended(self.worksheet, batch["rows"])
+            finally:
+                batch["done"].set()
+        else:
+            batch["done"].wait()
+
+        if batch["error"] is not None:
+            raise batch["error"]
+        return True
+
+_history_batcher = _AppendBatcher(cfg.WORKSHEET_NAME_HISTORY, cfg.APPEND_BATCH_WINDOW)
+_list_batcher = _AppendBatcher(cfg.WORKSHEET_NAME_LIST, cfg.APPEND_BATCH_WINDOW)
+
+# -----------------------------------------------------------------------------
+# [신규] append 성공 시 시트를 다시 읽지 않고 캐시에 바로 반영 (증분 갱신)
+# - 캐시된 프레임 뒤에 새 행을 붙이고 버전을 올린다
+# - 등록된 파생 데이터(fold)는 전체 재계산 없이 새 행만 접어 넣는다
+# -----------------------------------------------------------------------------
+_derived_folds = {}    # worksheet -> [(name, fold(value, new_df) -> value)]
+
+def register_fold(worksheet, name, fold):
+    _derived_folds.setdefault(worksheet, []).append((name, fold))
+
+def _concat_rows(df, new_df):
+    """df 뒤에 new_df 행을 붙인다. new_df는 df의 dtype에 맞추고, 범주형은 범주를 합쳐 범주형을 유지한다."""
+    df, new_df = df.copy(deep=False), new_df.copy(deep=False)
+    for c in new_df.columns:
+        if c not in df.columns: continue
+        dtype = df[c].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            values = new_df[c].astype(object)
+            extra = pd.Index(values.dropna().unique()).difference(dtype.categories)
+            if len(extra): df[c] = df[c].cat.add_categories(extra)
+            new_df[c] = pd.Categorical(values, dtype=df[c].dtype)
+        elif new_df[c].dtype != dtype:
+            try: new_df[c] = new_df[c].astype(dtype)
+            except (TypeError, ValueError): pass
+    return pd.concat([df, new_df], ignore_index=True)
+
+@perf.timed()
+def _apply_appended(worksheet, rows):
     try:
-        conn = st.connection("gsheets", type=GSheetsConnection)
-        # worksheet 인자 추가 (기본값: 첫번째 시트)
-        df = conn.read(spreadsheet=cfg.SHEET_URL, worksheet=cfg.WORKSHEET_NAME_LIST, ttl=0)
-        
-        if df.empty or len(df.columns) < len(cfg.COLUMNS): 
-            return pd.DataFrame(columns=cfg.COLUMNS)
-        
-        missing_cols = set(cfg.COLUMNS) - set(df.columns)
-        for c in missing_cols: df[c] = ""
-        
-        df = df[cfg.COLUMNS].fillna("")
-        df['평점'] = pd.to_numeric(df['평점'], errors='coerce').fillna(0.0)
-        df = df.astype({c: str for c in df.columns if c != '평점'})
-        return df
-    except Exception as e:
-        st.error(f"데이터 로드 오류: {e}")
-        return pd.DataFrame(columns=cfg.COLUMNS)
+        with _get_sheet_lock(worksheet):
+            with _cache_lock:
+                entry = _sheet_cache.get(worksheet)
+                old_version = _data_versions.get(worksheet, 0)
+                new_version = old_version + 1
+                _data_versions[worksheet] = new_version
+                if entry is None or entry["version"] != old_version:
+                    _sheet_cache.pop(worksheet, None)
+                    return
 
-def save_data(df):
+            new_df = _NORMALIZERS[worksheet](pd.DataFrame(rows))
+            df = _concat_rows(entry["df"], new_df)
+            fingerprint = _extend_fingerprint(entry["fingerprint"], df.iloc[len(entry["df"]):])
+            with _cache_lock:
+                # loaded_at은 그대로 둔다: TTL이 지나면 시트 원본으로 다시 맞춰짐
+                _sheet_cache[worksheet] = dict(entry, version=new_version, fingerprint=fingerprint, df=df)
+
+        for name, fold in _derived_folds.get(worksheet, []):
+            with _cache_lock:
+                derived = _derived_cache.get(name)
+            if derived is not None and derived[0] == old_version:
+                value = fold(derived[1], new_df)
+                with _cache_lock:
+                    _derived_cache[name] = (new_version, value)
+    except Exception:
+        invalidate_cache(worksheet)
+
+# -----------------------------------------------------------------------------
+# [신규] 맛집 리스트 타입 스키마 (cfg.LIST_CATEGORIES)
+# 선택지 컬럼은 범주형(칸마다 str 객체 대신 정수 코드), 평점은 float64
+# -----------------------------------------------------------------------------
+_LIST_DTYPES = {c: pd.CategoricalDtype([""] + opts) for c, opts in cfg.LIST_CATEGORIES.items()}
+_schema_issues = {}    # worksheet -> 마지막으로 읽을 때 나온 잘못된 칸 프레임
+
+def _issue_frame(bad, column, values):
+    pos = np.flatnonzero(bad)
+    # 시트 행 번호 = 위치 + 2 (1행은 헤더)
+    return pd.DataFrame({"행": pos + 2, "컬럼": column, "값": values.to_numpy()[pos]})
+
+def _coerce_list_frame(df):
+    """스키마 타입으로 변환한 프레임과, 선택지/숫자가 아닌 칸 목록(행, 컬럼, 값)을 돌려준다."""
+    missing_cols = set(cfg.COLUMNS) - set(df.columns)
+    for c in missing_cols: df[c] = ""
+
+    df = df[cfg.COLUMNS].fillna("").reset_index(drop=True)
+    issues = []
+    rating = pd.to_numeric(df['평점'], errors='coerce')
+    bad = rating.isna() & (df['평점'].astype(str) != "")
+    if bad.any(): issues.append(_issue_frame(bad, '평점', df['평점']))
+    df['평점'] = rating.fillna(0.0).astype(cfg.LIST_RATING_DTYPE)
+    df = df.astype({c: str for c in df.columns if c != '평점' and c not in _LIST_DTYPES})
+
+    for col, dtype in _LIST_DTYPES.items():
+        # 고유값만 범주와 맞춰 보고(조회표), 행 전체는 정수 코드 배열 연산 한 번으로 변환
+        codes, uniques = pd.factorize(df[col].to_numpy())
+        uniques = pd.Index([str(u) for u in uniques], dtype=object)
+        lut = dtype.categories.get_indexer(uniques)
+        unknown = lut < 0
+        if unknown.any():
+            issues.append(_issue_frame(unknown[codes], col, df[col]))
+            extra = pd.Index(pd.unique(uniques[unknown]))
+            lut[unknown] = len(dtype.categories) + extra.get_indexer(uniques[unknown])
+            dtype = pd.CategoricalDtype(list(dtype.categories) + list(extra))
+        df[col] = pd.Categorical.from_codes(lut[codes], dtype=dtype)
+
+    issues = pd.concat(issues, ignore_index=True) if issues else pd.DataFrame(columns=["행", "컬럼", "값"])
+    return df, issues
+
+def _normalize_list_frame(df):
+    return _coerce_list_frame(df)[0]
+
+def get_schema_issues(worksheet=cfg.WORKSHEET_NAME_LIST):
+    with _cache_lock:
+        return _schema_issues.get(worksheet)
+
+@perf.timed()
+def _load_data_uncached():
+    df = _read_worksheet(cfg.WORKSHEET_NAME_LIST)
+
+    if df.empty or len(df.columns) < len(cfg.COLUMNS) - len(cfg.COLUMNS_ADDED):
+        df = pd.DataFrame(columns=cfg.COLUMNS)
+    df, issues = _coerce_list_frame(df)
+    with _cache_lock:
+        _schema_issues[cfg.WORKSHEET_NAME_LIST] = issues
+    return df
+
+@perf.timed()
+def load_data(with_version=False):
+    # with_version=True 이면 (df, 데이터 버전)을 함께 돌려준다 (파생 캐시 키로 사용)
     try:
-        conn = st.connection("gsheets", type=GSheetsConnection)
-        conn.update(spreadsheet=cfg.SHEET_URL, data=df)
+        df, version = _cached_read(cfg.WORKSHEET_NAME_LIST, _load_data_uncached)
     except Exception as e:
-        st.error(f"저장 실패: {e}")
+        st.error(f"데이터 로드 오류: {e}")
+        df, version = pd.DataFrame(columns=cfg.COLUMNS), None
+    return (df, version) if with_version else df
 
 def extract_url(text):
     if not isinstance(text, str): return ""
@@ -39,7 +319,15 @@ def extract_url(text):
     if match: return match.group(1)
     return text
 
-def get_unique_values(df, column, defaults=[]):
+@perf.timed()
+def get_unique_values(df, column, defaults=[], index=None, within=None):
+    # 키워드 색인이 있으면 문자열을 다시 쪼개지 않고 색인(펼친 식당-토큰 표)에서 바로 꺼낸다
+    # within=(컬럼, 값들): 그 조건의 식당만 (예: 모드별 카테고리). 색인을 만든 프레임 전체면 메모된 결과 재사용
+    if index is not None and column in index:
+        row_labels = None if df.index.equals(index.row_labels) else df.index
+        return index.options(column, defaults, row_labels=row_labels, within=within)
+    if within is not None:
+        df = df[df[within[0]].isin(within[1])]
     if column in df.columns:
         existing = set()
         for item in df[column].unique():
@@ -48,67 +336,298 @@ def get_unique_values(df, column, defaults=[]):
         return sorted(list(existing.union(defaults)))
     return sorted(defaults)
 
+# [신규] 추천 탭 키워드 역색인 (집계된 맛집 데이터 기준, 데이터 버전당 1회 생성)
+@perf.timed()
+def get_keyword_index(df, version):
+    return cached_by_version("keyword_index", version, lambda: KeywordIndex(df))
+
+# [신규] 좌표 공간 색인 (집계된 맛집 데이터 기준, 데이터 버전당 1회 생성)
+@perf.timed()
+def get_geo_index(df, version):
+    return cached_by_version("geo_index", version, lambda: GeoIndex.from_frame(df))
+
+# [신규] 식당명 2-gram 색인 (등록/가져오기 중복 경고, 맛집 리스트 원본 기준, 데이터 버전당 1회 생성)
+@perf.timed()
+def get_name_index(df, version):
+    return cached_by_version("name_index", version, lambda: NameIndex(df['식당명']))
+
+# [신규] 시트 전체 중복 의심 묶음 (데이터 버전당 1회 계산)
+@perf.timed()
+def get_duplicate_groups(df, version):
+    return cached_by_version("duplicate_groups", version, lambda: get_name_index(df, version).duplicate_groups())
+
+def with_count(label, counts):
+    # 선택지 표시용: "국밥 (12)" (counts = KeywordIndex.counts 결과, 없는 키워드는 이름만)
+    n = counts.get(normalize_token(label))
+    return f"{label} ({n})" if n else label
+
+# -----------------------------------------------------------------------------
+# 리뷰 집계 (식당명 기준)
+# groupby + lambda 대신 그룹 코드/bincount/offset 배열로 한 번에 계산한다.
+# 결과는 기존 groupby 버전과 동일 (식당명 정렬, 'first'/'mean'/list)
+# -----------------------------------------------------------------------------
+AGG_FIRST_COLS = ['카테고리', '메뉴키워드', '분위기키워드', '가격대', '거리', '최대수용인원', '전화번호', '네이버지도URL', '휴무일', '좌표']
+AGG_LIST_COLS = ['한줄평', '작성자']
+
+def _split_by_offsets(flat, offsets):
+    return [flat[a:b].tolist() for a, b in zip(offsets[:-1], offsets[1:])]
+
+class ReviewAggregate:
+    """식당별 집계 결과(frame)와 평점 합계/개수를 함께 들고 있어 새 리뷰를 증분 반영할 수 있다."""
+
+    def __init__(self, df):
+        # NaN 식당명은 groupby처럼 제외
+        df = df[df['식당명'].notna()]
+        codes, _ = pd.factorize(df['식당명'], sort=True)
+        n_groups = int(codes.max()) + 1 if len(codes) else 0
+
+        counts = np.bincount(codes, minlength=n_groups)
+        order = np.argsort(codes, kind="stable")          # 그룹 내 원래 순서 유지
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+        # load_data가 빈 값을 ''로 채우므로 'first' = 그룹의 첫 행
+        first_idx = order[offsets[:-1]]
+
+        ratings = df['평점'].to_numpy(dtype=float)
+        valid = ~np.isnan(ratings)
+        self.sums = np.bincount(codes, weights=np.where(valid, ratings, 0.0), minlength=n_groups)
+        self.counts = np.bincount(codes, weights=valid, minlength=n_groups)
+
+        frame = df[['식당명'] + AGG_FIRST_COLS].iloc[first_idx].reset_index(drop=True)
+        frame['평점'] = self._means()
+        for c in AGG_LIST_COLS:
+            frame[c] = _split_by_offsets(df[c].to_numpy()[order], offsets)
+        self.frame = frame
+
+    def _means(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.round(self.sums / self.counts, 1)
+
+    def fold(self, new_rows):
+        """새 리뷰 행들을 전체 재그룹 없이 반영한 새 ReviewAggregate를 돌려준다.
+        새 행만 따로 집계한 뒤, 있던 식당은 합계/리스트에 더하고 처음 보는 식당은 한 번에 이름순 자리로 끼워 넣는다."""
+        part = ReviewAggregate(new_rows)
+        frame, sums, counts = self.frame.copy(deep=False), self.sums.copy(), self.counts.copy()
+        names, new_names = frame['식당명'].to_numpy(), part.frame['식당명'].to_numpy()
+        pos = np.searchsorted(names, new_names)
+        seen = pos < len(names)
+        seen[seen] = names[pos[seen]] == new_names[seen]
+
+        # 있던 식당: 합계/개수 더하고 리뷰 리스트 이어 붙이기 (원래 리스트는 건드리지 않음)
+        sums[pos[seen]] += part.sums[seen]
+        counts[pos[seen]] += part.counts[seen]
+        for c in AGG_LIST_COLS:
+            values = frame[c].to_numpy(dtype=object, copy=True)
+            for p, extra in zip(pos[seen], part.frame[c].to_numpy()[seen]):
+                values[p] = values[p] + extra
+            frame[c] = values
+
+        # 처음 보는 식당: 뒤에 한 번 붙이고(범주형 유지) 이름순 자리로 한 번에 재배열
+        if not seen.all():
+            n_old, at = len(frame), pos[~seen]
+            frame = _concat_rows(frame, part.frame[~seen].reset_index(drop=True))
+            order = np.insert(np.arange(n_old), at, n_old + np.arange(len(at)))
+            frame = frame.iloc[order].reset_index(drop=True)
+            sums, counts = np.insert(sums, at, part.sums[~seen]), np.insert(counts, at, part.counts[~seen])
+
+        agg = ReviewAggregate.__new__(ReviewAggregate)
+        agg.frame, agg.sums, agg.counts = frame, sums, counts
+        frame['평점'] = agg._means()
+        return agg
+
+@perf.timed()
 def aggregate_reviews(df):
     if df.empty: return df
-    grouped = df.groupby('식당명').agg({
-        '카테고리': 'first', '메뉴키워드': 'first', '분위기키워드': 'first',
-        '가격대': 'first', '거리': 'first', '최대수용인원': 'first',
-        '전화번호': 'first', '네이버지도URL': 'first', '휴무일': 'first',
-        '평점': 'mean', '한줄평': lambda x: list(x), '작성자': lambda x: list(x)
-    }).reset_index()
-    grouped['평점'] = grouped['평점'].round(1)
-    return grouped
+    return ReviewAggregate(df).frame
+
+# [신규] 데이터 버전별 집계 캐시. 등록 팝업으로 추가된 리뷰는 fold로 증분 반영된다
+@perf.timed()
+def get_aggregated_reviews(raw_df, version):
+    if raw_df.empty: return raw_df
+    return cached_by_version("aggregate", version, lambda: ReviewAggregate(raw_df)).frame
+
+register_fold(cfg.WORKSHEET_NAME_LIST, "aggregate", lambda agg, new_df: agg.fold(new_df))
 
 # [신규] 식사 기록 로드
-def load_history():
+def _normalize_history_frame(df):
+    # 필수 컬럼 보장
+    missing_cols = set(cfg.COLUMNS_HISTORY) - set(df.columns)
+    for c in missing_cols: df[c] = ""
+    return df[cfg.COLUMNS_HISTORY].fillna("")
+
+@perf.timed()
+def _load_history_uncached():
+    df = _read_worksheet(cfg.WORKSHEET_NAME_HISTORY)
+
+    if df.empty: return pd.DataFrame(columns=cfg.COLUMNS_HISTORY)
+    return _normalize_history_frame(df)
+
+_NORMALIZERS = {
+    cfg.WORKSHEET_NAME_LIST: _normalize_list_frame,
+    cfg.WORKSHEET_NAME_HISTORY: _normalize_history_frame,
+}
+
+@perf.timed()
+def load_history(with_version=False):
     try:
-        conn = st.connection("gsheets", type=GSheetsConnection)
-        df = conn.read(spreadsheet=cfg.SHEET_URL, worksheet=cfg.WORKSHEET_NAME_HISTORY, ttl=0)
-        
-        if df.empty: return pd.DataFrame(columns=cfg.COLUMNS_HISTORY)
-        
-        # 필수 컬럼 보장
-        missing_cols = set(cfg.COLUMNS_HISTORY) - set(df.columns)
-        for c in missing_cols: df[c] = ""
-        return df[cfg.COLUMNS_HISTORY].fillna("")
-    except Exception:
-        st.error(f"히스토리 로드 실패: {e}") 
-        return pd.DataFrame(columns=cfg.COLUMNS_HISTORY)
-# 2. 맛집 리스트 저장 (기존 함수 수정)
+        df, version = _cached_read(cfg.WORKSHEET_NAME_HISTORY, _load_history_uncached)
+    except Exception as e:
+        st.error(f"히스토리 로드 실패: {e}")
+        df, version = pd.DataFrame(columns=cfg.COLUMNS_HISTORY), None
+    return (df, version) if with_version else df
+
+# [신규] 맛집 리스트 + 식사 기록 동시 로드 (둘 다 필요한 화면에서 시트 왕복 두 번을 겹친다)
+# - 시트별로 cfg.LOAD_TIMEOUT 초까지만 기다리고, 실패/시간 초과한 시트만 빈 프레임 + 버전 None
+# - 시간 초과된 읽기는 백그라운드에서 계속되어 끝나면 캐시를 채운다 (다음 실행에서 사용)
+_load_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="sheet-load")
+
+_PARALLEL_LOADS = [
+    (cfg.WORKSHEET_NAME_LIST, _load_data_uncached, cfg.COLUMNS, "데이터 로드 오류"),
+    (cfg.WORKSHEET_NAME_HISTORY, _load_history_uncached, cfg.COLUMNS_HISTORY, "히스토리 로드 실패"),
+]
+
+@perf.timed()
+def load_data_and_history(timeout=None):
+    """(raw_df, list_version, history_df, history_version)"""
+    timeout = cfg.LOAD_TIMEOUT if timeout is None else timeout
+    futures = [_load_pool.submit(perf.bind(_cached_read), ws, loader) for ws, loader, _, _ in _PARALLEL_LOADS]
+    deadline = time.monotonic() + timeout
+    results = []
+    for future, (_, _, columns, label) in zip(futures, _PARALLEL_LOADS):
+        try:
+            df, version = future.result(timeout=max(deadline - time.monotonic(), 0))
+        except FutureTimeout:
+            st.error(f"{label}: {timeout}초 안에 응답이 없습니다.")
+            df, version = pd.DataFrame(columns=columns), None
+        except Exception as e:
+            st.error(f"{label}: {e}")
+            df, version = pd.DataFrame(columns=columns), None
+        results += [df, version]
+    return tuple(results)
+
+# [신규] 식당별 방문 색인 (식사 기록 버전별, 기록 추가 시 새 행만 반영)
+@perf.timed()
+def get_visit_index(history_df, version):
+    return cached_by_version("visit_index", version, lambda: VisitIndex(history_df))
+
+register_fold(cfg.WORKSHEET_NAME_HISTORY, "visit_index", lambda index, new_df: index.fold(new_df))
+
+# 2. 맛집 리스트 저장
+@perf.timed()
 def save_data(df):
     try:
-        conn = st.connection("gsheets", type=GSheetsConnection)
-        conn.update(spreadsheet=cfg.SHEET_URL, worksheet=cfg.WORKSHEET_NAME_LIST, data=df)
+        _replace(cfg.WORKSHEET_NAME_LIST, df)
     except Exception as e:
         st.error(f"저장 실패: {e}")
+    finally:
+        invalidate_cache(cfg.WORKSHEET_NAME_LIST)
 
+@perf.timed()
 def add_history_row(new_row_dict):
-    # 1. 데이터 로드
-    df = load_history()
-    
-    # 2. 데이터 병합
-    new_df = pd.DataFrame([new_row_dict])
-    updated_df = pd.concat([df, new_df], ignore_index=True)
-    
-    # 3. 데이터 타입 문자열로 통일 (오류 방지 최후의 보루)
-    updated_df = updated_df.astype(str)
-
-    # 4. 저장 (숫자 인덱스 사용)
-    conn = st.connection("gsheets", type=GSheetsConnection)
-    conn.update(
-        spreadsheet=cfg.SHEET_URL, 
-        worksheet=cfg.WORKSHEET_NAME_HISTORY, # 여기서 숫자 1이 들어감
-        data=updated_df
-    )
-    
-    # 5. 캐시 삭제
-    st.cache_data.clear()
-    return True
-    
+    # 시트 전체를 다시 쓰지 않고 한 행만 뒤에 붙인다 (동시 클릭 시 덮어쓰기 방지)
+    try:
+        return _history_batcher.submit([new_row_dict])
+    except Exception as e:
+        st.error(f"히스토리 저장 실패: {e}")
+        return False
+
+# [신규] 맛집 한 곳 추가 (등록 팝업용)
+@perf.timed()
+def add_data_row(new_row_dict):
+    try:
+        return _list_batcher.submit([new_row_dict])
+    except Exception as e:
+        st.error(f"저장 실패: {e}")
+        return False
+
+# [신규] 파일 가져오기: 검사를 통과한 행들을 append 한 번으로 저장 (행마다 읽기/저장 왕복 X)
+@perf.timed()
+def add_data_rows(rows):
+    try:
+        return _list_batcher.submit(rows)
+    except Exception as e:
+        st.error(f"저장 실패: {e}")
+        return False
+
+@perf.timed()
+def add_history_rows(rows):
+    try:
+        return _history_batcher.submit(rows)
+    except Exception as e:
+        st.error(f"히스토리 저장 실패: {e}")
+        return False
+
+# [신규] 식당 정보(리뷰 외 컬럼) 갱신: 같은 식당명의 모든 리뷰 행에 반영, 없으면 새 행 추가
+@perf.timed()
+def upsert_restaurant(info):
+    row = {c: info[c] for c in ['식당명'] + AGG_FIRST_COLS if c in info}
+    try:
+        _write(cfg.WORKSHEET_NAME_LIST, "upsert", key='식당명', row=row)
+        return True
+    except Exception as e:
+        st.error(f"저장 실패: {e}")
+        return False
+    finally:
+        invalidate_cache(cfg.WORKSHEET_NAME_LIST)
+
+@perf.timed()
 def save_history(df):
     try:
-        conn = st.connection("gsheets", type=GSheetsConnection)
         # 식사 기록 시트(WORKSHEET_NAME_HISTORY)에 덮어쓰기
-        conn.update(spreadsheet=cfg.SHEET_URL, worksheet=cfg.WORKSHEET_NAME_HISTORY, data=df)
+        _replace(cfg.WORKSHEET_NAME_HISTORY, df)
     except Exception as e:
-        st.error(f"히스토리 저장 실패: {e}")
\ No newline at end of file
+        st.error(f"히스토리 저장 실패: {e}")
+    finally:
+        invalidate_cache(cfg.WORKSHEET_NAME_HISTORY)
+
+# -----------------------------------------------------------------------------
+# [신규] data_editor 변경분(delta)만 저장소에 반영
+# - edited_rows: 바뀐 칸만 갱신 / added_rows: 행 추가 / deleted_rows: 행 삭제
+# 행 위치 = 편집기 행 위치 (구글 시트는 batch_update/append/deleteDimension 각 1회, SQLite는 트랜잭션 1회)
+# -----------------------------------------------------------------------------
+@perf.timed()
+def _apply_editor_delta(worksheet, editor_state):
+    edited = {int(k): v for k, v in editor_state.get("edited_rows", {}).items()}
+    added = [r for r in editor_state.get("added_rows", []) if r]
+    deleted = {int(p) for p in editor_state.get("deleted_rows", [])}
+    if not (edited or added or deleted): return 0
+    _write(worksheet, "delta", edited=edited, added=added, deleted=sorted(deleted))
+    return len(edited) + len(added) + len(deleted)
+
+def _save_delta(worksheet, edited_df, editor_state, base_version, full_save):
+    if cfg.EDITOR_SAVE_MODE != "delta" or not editor_state:
+        return full_save(edited_df)
+    # 편집기를 그린 뒤 시트가 바뀌었으면 행 위치를 믿을 수 없으므로 전체 저장
+    if base_version is not None and base_version != get_data_version(worksheet):
+        return full_save(edited_df)
+    try:
+        _apply_editor_delta(worksheet, editor_state)
+    except Exception:
+        # 일부만 반영됐을 수 있으니 편집 결과 전체로 덮어써서 맞춘다
+        return full_save(edited_df)
+    finally:
+        invalidate_cache(worksheet)
+
+# [신규] 중복 식당명 병합: names 중 하나인 행의 식당명을 모두 target으로 (맛집 리스트 + 식사 기록, 바뀐 칸만 저장)
+@perf.timed()
+def merge_restaurants(names, target):
+    merged = 0
+    for worksheet, load, full_save in ((cfg.WORKSHEET_NAME_LIST, load_data, save_data),
+                                       (cfg.WORKSHEET_NAME_HISTORY, load_history, save_history)):
+        df, version = load(with_version=True)
+        if '식당명' not in df.columns: continue
+        rows = np.flatnonzero(df['식당명'].isin(names).to_numpy())
+        if not len(rows): continue
+        renamed = df.copy()
+        renamed.iloc[rows, renamed.columns.get_loc('식당명')] = target
+        edits = {"edited_rows": {int(r): {'식당명': target} for r in rows}, "added_rows": [], "deleted_rows": []}
+        _save_delta(worksheet, renamed, edits, version, full_save)
+        merged += len(rows)
+    return merged
+
+@perf.timed()
+def save_data_delta(edited_df, editor_state, base_version=None):
+    return _save_delta(cfg.WORKSHEET_NAME_LIST, edited_df, editor_state, base_version, save_data)
+
+@perf.timed()
+def save_history_delta(edited_df, editor_state, base_version=None):
+    return _save_delta(cfg.WORKSHEET_NAME_HISTORY, edited_df, editor_state, base_version, save_history)
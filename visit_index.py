@@ -0,0 +1,74 @@
+# visit_index.py
+# 방문 색인: 식당명 -> 방문 날짜 목록(정렬된 일 단위 정수)
+# 식사 기록 버전마다 한 번만 만들고, 식사 기록이 추가되면 fold()로 새 행만 반영한다.
+# 조회는 dict 조회 + 이분 탐색이라 식사 기록 길이와 상관없이 빠르다.
+from bisect import bisect_left, bisect_right, insort
+import numpy as np
+import pandas as pd
+
+def _today(today=None):
+    return pd.Timestamp(today or pd.Timestamp.now().normalize()).toordinal()
+
+class VisitIndex:
+    def __init__(self, history_df=None):
+        self._visits = {}   # 식당명 -> 방문일 정수 리스트 (정렬됨)
+        self._days = []     # 전체 기록의 방문일 (정렬됨, 최근 기록 조회용)
+        self._rows = []     # _days와 같은 순서의 (날짜, 식당명, 메뉴)
+        if history_df is not None and not history_df.empty:
+            self._add(history_df)
+
+    def _add(self, history_df):
+        dates = pd.to_datetime(history_df['날짜'], errors='coerce')
+        for ts, name, date, menu in zip(dates, history_df['식당명'], history_df['날짜'], history_df['메뉴']):
+            if pd.isna(ts) or not name: continue
+            day = ts.toordinal()
+            insort(self._visits.setdefault(name, []), day)
+            pos = bisect_right(self._days, day)
+            self._days.insert(pos, day)
+            self._rows.insert(pos, (date, name, menu))
+
+    def fold(self, new_rows):
+        """새 식사 기록 행들을 반영한 새 VisitIndex를 돌려준다 (기존 색인은 그대로)."""
+        index = VisitIndex.__new__(VisitIndex)
+        touched = set(new_rows['식당명'])
+        index._visits = {name: list(days) if name in touched else days for name, days in self._visits.items()}
+        index._days, index._rows = list(self._days), list(self._rows)
+        index._add(new_rows)
+        return index
+
+    def last_visit(self, name):
+        days = self._visits.get(name)
+        return pd.Timestamp.fromordinal(days[-1]) if days else None
+
+    def days_since(self, name, today=None):
+        days = self._visits.get(name)
+        return _today(today) - days[-1] if days else None
+
+    def count(self, name, days, today=None):
+        # 최근 days일(오늘 포함) 동안의 방문 횟수
+        visits = self._visits.get(name)
+        if not visits: return 0
+        end = _today(today)
+        return bisect_right(visits, end) - bisect_left(visits, end - days + 1)
+
+    def days_since_array(self, names, today=None):
+        # names 순서대로 마지막 방문 후 지난 일수 (방문 기록 없으면 inf)
+        # 방문한 식당 수만큼만 돌고, 위치는 get_indexer로 한 번에 찾는다
+        result = np.full(len(names), np.inf, dtype=np.float32)
+        if not self._visits: return result
+        end = _today(today)
+        pos = pd.Index(names).get_indexer(list(self._visits))
+        elapsed = np.array([end - days[-1] for days in self._visits.values()], dtype=np.float32)
+        found = pos >= 0
+        result[pos[found]] = elapsed[found]
+        return result
+
+    def recent(self, days=7, limit=None, today=None):
+        """최근 days일 동안의 (날짜, 식당명, 메뉴) 기록, 오래된 것부터."""
+        end = _today(today)
+        lo, hi = bisect_left(self._days, end - days + 1), bisect_right(self._days, end)
+        if limit is not None: lo = max(lo, hi - limit)
+        return self._rows[lo:hi]
+
+    def __contains__(self, name):
+        return name in self._visits